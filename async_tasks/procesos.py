@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, TimeoutError as FuturoTimeout
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import numpy as np
+from logic.clustering import agrupar_puntos
+
+# Alineación de cada array dentro del bloque de memoria compartida
+ALINEACION = 64
+
+# Cada cuánto (s) se consulta el token de cancelación mientras se espera al proceso
+INTERVALO_CANCELACION = 0.05
+
+# (offset en bytes, forma, dtype) de cada array copiado al bloque
+Descriptor = Tuple[int, Tuple[int, ...], str]
+
+
+def _a_memoria_compartida(arrays: List[np.ndarray]) -> Tuple[shared_memory.SharedMemory, List[Descriptor]]:
+    """Copia los arrays, uno tras otro, a un único bloque de memoria compartida nuevo."""
+    descriptores, offset = [], 0
+    for a in arrays:
+        descriptores.append((offset, a.shape, a.dtype.str))
+        offset += -(-a.nbytes // ALINEACION) * ALINEACION
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for a, (inicio, forma, dtype) in zip(arrays, descriptores):
+        np.ndarray(forma, dtype=dtype, buffer=shm.buf, offset=inicio)[...] = a
+    return shm, descriptores
+
+
+def _calentar() -> None:
+    # Inicializador de cada proceso: importa el clustering y ejecuta un agrupamiento mínimo
+    # para que la primera extracción real no pague imports ni la primera pasada de NumPy
+    puntos = np.random.default_rng(0).integers(0, 256, size=(256, 3), dtype=np.uint8)
+    agrupar_puntos(puntos, None, 4)
+
+
+def _nada() -> int:
+    return os.getpid()
+
+
+def _agrupar_en_proceso(nombre: str, descriptores: List[Descriptor], n_colors, engine: str,
+                        n_jobs: Optional[int], color_space: str) -> List[Tuple[int, int, int]]:
+    shm = shared_memory.SharedMemory(name=nombre)
+    try:
+        # Vistas sobre el bloque, sin copiar: los píxeles nunca pasan por pickle
+        arrays = [np.ndarray(forma, dtype=dtype, buffer=shm.buf, offset=inicio)
+                  for inicio, forma, dtype in descriptores]
+        puntos = arrays[0]
+        pesos = arrays[1] if len(arrays) > 1 else None
+        colores = agrupar_puntos(puntos, pesos, n_colors, engine, n_jobs=n_jobs, color_space=color_space)
+        del arrays, puntos, pesos
+        return colores
+    finally:
+        shm.close()
+
+
+class BackendProcesos:
+    """
+    Pool persistente de procesos para la etapa de agrupamiento (k-means y demás motores), de
+    modo que el cálculo no compite por el GIL con el hilo de la UI.
+
+    Los procesos se arrancan y calientan al crear el backend y se reutilizan entre trabajos.
+    Los puntos (y pesos) se entregan en un bloque de multiprocessing.shared_memory; al proceso
+    solo viajan el nombre del bloque y los descriptores de los arrays, y de vuelta la paleta.
+    """
+
+    def __init__(self, max_procesos: Optional[int] = None):
+        self.max_procesos = max_procesos or max(1, min(2, (os.cpu_count() or 1) - 1))
+        # 'spawn': hacer fork de un proceso con hilos de Qt no es seguro
+        contexto = multiprocessing.get_context('spawn')
+        self._pool = ProcessPoolExecutor(max_workers=self.max_procesos, mp_context=contexto,
+                                         initializer=_calentar)
+        # Arrancar ya todos los procesos, en segundo plano, en lugar de en el primer trabajo
+        self._arranque = [self._pool.submit(_nada) for _ in range(self.max_procesos)]
+
+    def esperar_arranque(self) -> None:
+        """Bloquea hasta que todos los procesos están arrancados y calientes."""
+        for futuro in self._arranque:
+            futuro.result()
+
+    def agrupar(self, puntos: np.ndarray, pesos: Optional[np.ndarray], n_colors=5, engine: str = 'numpy',
+                n_jobs: Optional[int] = None, executor: Optional[Executor] = None, color_space: str = 'rgb',
+                token=None) -> List[Tuple[int, int, int]]:
+        """
+        Como logic.clustering.agrupar_puntos (sirve de `agrupador` en
+        extraer_colores_dominantes_archivo), pero en un proceso del pool; `executor` no puede
+        cruzar al proceso y se ignora. Bloquea al hilo que llama (un trabajo del Planificador)
+        consultando `token` mientras espera; si se cancela, un trabajo que aún no ha empezado
+        se retira y uno en curso se deja terminar y se ignora.
+        """
+        if token is not None:
+            token.comprobar()
+        arrays = [np.ascontiguousarray(puntos)]
+        if pesos is not None:
+            arrays.append(np.ascontiguousarray(pesos))
+        shm, descriptores = _a_memoria_compartida(arrays)
+        try:
+            futuro = self._pool.submit(_agrupar_en_proceso, shm.name, descriptores, n_colors, engine, n_jobs,
+                                       color_space)
+            while True:
+                try:
+                    return futuro.result(timeout=INTERVALO_CANCELACION)
+                except FuturoTimeout:
+                    if token is not None:
+                        try:
+                            token.comprobar()
+                        except BaseException:
+                            futuro.cancel()
+                            raise
+        finally:
+            # unlink solo retira el nombre: un proceso que aún tenga el bloque abierto lo conserva
+            # mapeado hasta cerrarlo
+            shm.close()
+            shm.unlink()
+
+    def cerrar(self, esperar: bool = True) -> None:
+        self._pool.shutdown(wait=esperar, cancel_futures=True)
@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Prioridades de los trabajos: menor valor se ejecuta antes
+PRIORIDAD_ALTA = 0
+PRIORIDAD_NORMAL = 10
+PRIORIDAD_BAJA = 20
+
+
+class Cancelado(Exception):
+    """Lanzada por TokenCancelacion.comprobar() cuando el trabajo se ha cancelado."""
+
+
+class TokenCancelacion:
+    """
+    Cancelación cooperativa: el planificador marca el token y el trabajo lo consulta con
+    comprobar() en sus bucles costosos (iteraciones de k-means, franjas de la imagen...).
+    """
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self) -> None:
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+    def comprobar(self) -> None:
+        if self._evento.is_set():
+            raise Cancelado()
+
+
+@dataclass
+class Trabajo:
+    """Trabajo enviado al planificador; `futuro` recibe el resultado o la excepción."""
+    funcion: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    prioridad: int
+    clave: Optional[str]
+    critico: bool
+    token: TokenCancelacion = field(default_factory=TokenCancelacion)
+    futuro: Future = field(default_factory=Future)
+    t_envio: float = field(default_factory=time.perf_counter)
+    t_inicio: Optional[float] = None
+
+    def cancelar(self) -> None:
+        self.token.cancelar()
+        self.futuro.cancel()
+
+
+class Planificador:
+    """
+    Pool acotado de hilos con cola de prioridades para los trabajos de la aplicación.
+
+    - `prioridad`: los trabajos en cola se ejecutan por prioridad y, a igualdad, por orden de
+      llegada.
+    - `clave`: un trabajo nuevo con la misma clave sustituye al anterior; si este seguía en
+      cola se descarta y si ya se estaba ejecutando se cancela su token.
+    - `critico`: trabajos que no deben interrumpirse (p. ej. exportaciones); cerrar() los
+      espera en lugar de cancelarlos.
+
+    La función del trabajo recibe el token de cancelación como argumento `token`.
+    """
+
+    def __init__(self, max_hilos: Optional[int] = None, nombre: str = 'divergesia'):
+        self.max_hilos = max_hilos or min(4, os.cpu_count() or 1)
+        self.nombre = nombre
+        self._cond = threading.Condition()
+        self._cola: List[tuple] = []
+        self._orden = itertools.count()
+        self._hilos: List[threading.Thread] = []
+        self._ocupados = 0
+        self._por_clave: Dict[str, Trabajo] = {}
+        self._en_ejecucion: List[Trabajo] = []
+        self._cerrado = False
+        self._completados = 0
+        self._cancelados = 0
+        self._fallidos = 0
+        self._iniciados = 0
+        self._finalizados = 0
+        self._espera_total = 0.0
+        self._ejecucion_total = 0.0
+        self._espera_max = 0.0
+
+    def enviar(self, funcion: Callable[..., Any], *args, prioridad: int = PRIORIDAD_NORMAL,
+               clave: Optional[str] = None, critico: bool = False, **kwargs) -> Trabajo:
+        trabajo = Trabajo(funcion=funcion, args=args, kwargs=kwargs, prioridad=prioridad, clave=clave, critico=critico)
+        with self._cond:
+            if self._cerrado:
+                raise RuntimeError("El planificador está cerrado")
+            if clave is not None:
+                anterior = self._por_clave.get(clave)
+                if anterior is not None and not anterior.critico:
+                    self._cancelar_trabajo(anterior)
+                self._por_clave[clave] = trabajo
+            heapq.heappush(self._cola, (prioridad, next(self._orden), trabajo))
+            # Un hilo nuevo solo si todos los existentes están ocupados
+            if self._ocupados + len(self._cola) > len(self._hilos) and len(self._hilos) < self.max_hilos:
+                hilo = threading.Thread(target=self._bucle, name=f"{self.nombre}-{len(self._hilos)}", daemon=True)
+                self._hilos.append(hilo)
+                hilo.start()
+            self._cond.notify()
+        return trabajo
+
+    def _cancelar_trabajo(self, trabajo: Trabajo) -> None:
+        # Con el lock tomado. Si sigue en cola, el hilo lo descartará al sacarlo
+        if not trabajo.token.cancelado and not trabajo.futuro.done():
+            self._cancelados += 1
+        trabajo.cancelar()
+
+    def cancelar(self, clave: str) -> None:
+        """Cancela el último trabajo enviado con esa clave, esté en cola o en ejecución."""
+        with self._cond:
+            trabajo = self._por_clave.get(clave)
+            if trabajo is not None:
+                self._cancelar_trabajo(trabajo)
+
+    def _bucle(self) -> None:
+        while True:
+            with self._cond:
+                while not self._cola and not self._cerrado:
+                    self._cond.wait()
+                if not self._cola:
+                    return
+                _, _, trabajo = heapq.heappop(self._cola)
+                if trabajo.token.cancelado or not trabajo.futuro.set_running_or_notify_cancel():
+                    self._liberar_clave(trabajo)
+                    self._cond.notify_all()
+                    continue
+                self._ocupados += 1
+                self._en_ejecucion.append(trabajo)
+                trabajo.t_inicio = time.perf_counter()
+                self._iniciados += 1
+                espera = trabajo.t_inicio - trabajo.t_envio
+                self._espera_total += espera
+                self._espera_max = max(self._espera_max, espera)
+            try:
+                resultado = trabajo.funcion(*trabajo.args, token=trabajo.token, **trabajo.kwargs)
+            except Cancelado as e:
+                trabajo.futuro.set_exception(e)
+                estado = 'cancelado'
+            except BaseException as e:
+                traceback.print_exc()
+                trabajo.futuro.set_exception(e)
+                estado = 'fallido'
+            else:
+                trabajo.futuro.set_result(resultado)
+                estado = 'completado'
+            with self._cond:
+                self._ocupados -= 1
+                self._en_ejecucion.remove(trabajo)
+                self._ejecucion_total += time.perf_counter() - trabajo.t_inicio
+                self._finalizados += 1
+                if estado == 'completado':
+                    self._completados += 1
+                elif estado == 'fallido':
+                    self._fallidos += 1
+                elif not trabajo.token.cancelado:
+                    # Cancelado lanzado por un token ajeno: contarlo igualmente
+                    self._cancelados += 1
+                self._liberar_clave(trabajo)
+                self._cond.notify_all()
+
+    def _liberar_clave(self, trabajo: Trabajo) -> None:
+        if trabajo.clave is not None and self._por_clave.get(trabajo.clave) is trabajo:
+            del self._por_clave[trabajo.clave]
+
+    def cerrar(self, esperar: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Deja de aceptar trabajos, cancela los no críticos (en cola y en ejecución) y, con
+        `esperar`, espera a que terminen los críticos y los hilos. Devuelve False si vence
+        el timeout con trabajos todavía en marcha.
+        """
+        with self._cond:
+            self._cerrado = True
+            for _, _, trabajo in self._cola:
+                if not trabajo.critico:
+                    self._cancelar_trabajo(trabajo)
+            for trabajo in self._en_ejecucion:
+                if not trabajo.critico:
+                    self._cancelar_trabajo(trabajo)
+            self._cond.notify_all()
+        if not esperar:
+            return True
+        limite = None if timeout is None else time.perf_counter() + timeout
+        for hilo in list(self._hilos):
+            hilo.join(None if limite is None else max(0.0, limite - time.perf_counter()))
+        return not any(h.is_alive() for h in self._hilos)
+
+    def metricas(self) -> Dict[str, float]:
+        """
+        Profundidad de cola, trabajos en curso, contadores y latencias en ms: espera (desde
+        enviar() hasta que un hilo lo empieza) y ejecución.
+        """
+        with self._cond:
+            return {
+                'en_cola': sum(1 for _, _, t in self._cola if not t.token.cancelado),
+                'en_ejecucion': self._ocupados,
+                'hilos': len(self._hilos),
+                'completados': self._completados,
+                'cancelados': self._cancelados,
+                'fallidos': self._fallidos,
+                'espera_media_ms': 1000.0 * self._espera_total / max(self._iniciados, 1),
+                'espera_max_ms': 1000.0 * self._espera_max,
+                'ejecucion_media_ms': 1000.0 * self._ejecucion_total / max(self._finalizados, 1),
+            }
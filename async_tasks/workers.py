@@ -1,34 +1,106 @@
 
 
-from PySide6.QtCore import QThread, Signal
-from PIL import Image
+import time
+from typing import Optional
+from PySide6.QtCore import QMutex, QMutexLocker, QObject, QThread, QWaitCondition, Signal
+from PySide6.QtGui import QImage
 from data.models import Paleta
 import data.project_io as pio
+from data.cache import obtener_cache
 import traceback
-from logic.clustering import extraer_colores_dominantes
+import numpy as np
+from logic.carga import cargar_imagen
+from logic.clustering import extraer_colores_dominantes, extraer_colores_dominantes_archivo
+from logic.preview import VistaPrevia
+from async_tasks.scheduler import Cancelado
 
 
-class ClusteringWorker(QThread):
-   
+def _a_qimage(rgb: np.ndarray) -> QImage:
+    h, w = rgb.shape[:2]
+    # copy(): el QImage no debe apuntar al buffer de NumPy, que se libera al salir
+    return QImage(rgb.tobytes(), w, h, 3 * w, QImage.Format_RGB888).copy()
+
+
+class CargaWorker(QObject):
+    """
+    Decodifica la imagen seleccionada fuera del hilo de la UI (trabajo del Planificador) y
+    entrega el ImagenCargada junto con la miniatura ya convertida a QImage.
+    """
+
+    # ImagenCargada, miniatura para mostrar y ms desde la selección del archivo
+    cargada = Signal(object, QImage, float)
+    error = Signal(str)
+
+    def __init__(self, image_path: str, t_seleccion: Optional[float] = None):
+        super().__init__()
+        self.image_path = image_path
+        self.t_seleccion = t_seleccion if t_seleccion is not None else time.perf_counter()
+
+    def run(self, token=None):
+        try:
+            imagen = cargar_imagen(self.image_path, token=token)
+            qimg = _a_qimage(np.asarray(imagen.miniatura))
+            self.cargada.emit(imagen, qimg, (time.perf_counter() - self.t_seleccion) * 1000.0)
+        except Cancelado:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            self.error.emit(f"No se pudo cargar la imagen: {e}")
+
+
+class ClusteringWorker(QObject):
+    """Extracción de la paleta; se ejecuta como trabajo del Planificador (run recibe el token)."""
+
     # Emite la lista de colores (tuplas RGB) y un token identificador para validar resultados asincrónicos
     resultado = Signal(list, str)
     error = Signal(str)
 
-    def __init__(self, image_path: str, n_colors: int = 5):
+    def __init__(self, image_path: str, n_colors=5, max_size: int = 200,
+                 engine: str = 'numpy', sampler: str = 'stratified', color_space: str = 'rgb', cache=None,
+                 procesos=None, imagen=None):
         super().__init__()
         self.image_path = image_path
-        self.n_colors = n_colors
+        self.n_colors = n_colors  # entero o 'auto'
+        self.max_size = max_size
+        self.engine = engine
+        self.sampler = sampler
+        self.color_space = color_space
+        # Caché de extracciones; por defecto la compartida en el directorio de usuario
+        self.cache = cache if cache is not None else obtener_cache()
+        # BackendProcesos opcional: el agrupamiento se ejecuta fuera del proceso de la UI
+        self.procesos = procesos
+        # ImagenCargada opcional: se agrupa su proxy de análisis en lugar de decodificar otra vez
+        self.imagen = imagen
 
-    def run(self):
+    def run(self, token=None):
         try:
-            # Abrir imagen con PIL
-            img = Image.open(self.image_path)
-            # Extraer colores dominantes usando la lógica definida
-            colores = extraer_colores_dominantes(img, n_colors=self.n_colors)
+            params = dict(n_colors=self.n_colors, max_size=self.max_size, engine=self.engine, sampler=self.sampler,
+                          color_space=self.color_space)
+            # Consultar la caché antes de decodificar la imagen
+            clave = self.cache.clave(self.image_path, **params)
+            colores = self.cache.obtener(clave)
+            if colores is None:
+                # Extraer colores dominantes decodificando la imagen reducida por franjas
+                agrupador = self.procesos.agrupar if self.procesos is not None else None
+                if self.imagen is not None and self.sampler != 'reservoir':
+                    colores = extraer_colores_dominantes(self.imagen.analisis, token=token, agrupador=agrupador,
+                                                         **params)
+                else:
+                    # 'reservoir' muestrea el flujo a resolución completa: necesita el archivo
+                    colores = extraer_colores_dominantes_archivo(self.image_path, token=token,
+                                                                 agrupador=agrupador, **params)
+                try:
+                    self.cache.guardar(clave, colores)
+                except OSError:
+                    # Un fallo de la caché no debe impedir mostrar la paleta
+                    traceback.print_exc()
             # Generar token: combina ruta y número de colores para evitar resultados desfasados
-            token = f"{self.image_path}:{self.n_colors}"
+            token_resultado = f"{self.image_path}:{self.n_colors}"
             # Emitir resultado
-            self.resultado.emit(colores, token)
+            self.resultado.emit(colores, token_resultado)
+        except Cancelado:
+            # Sustituida por una extracción más reciente o cierre de la ventana: no hay nada que emitir
+            raise
         except Exception as e:
             # Log de excepción para depuración
             traceback.print_exc()
@@ -36,8 +108,9 @@ class ClusteringWorker(QThread):
             self.error.emit(f"Error en clustering: {e}")
 
 
-class ExportWorker(QThread):
-   
+class ExportWorker(QObject):
+    """Exportación de una paleta; se envía al Planificador como trabajo crítico (no se cancela)."""
+
     # Emite la ruta de salida en caso de éxito
     finished = Signal(str)
     error = Signal(str)
@@ -48,7 +121,7 @@ class ExportWorker(QThread):
         self.path = path
         self.formato = formato.lower()
 
-    def run(self):
+    def run(self, token=None):
         try:
             if self.formato == 'json':
                 # Exportar JSON usando project_io
@@ -92,3 +165,89 @@ class ExportWorker(QThread):
                 f.write("}\n")
         except Exception:
             raise
+
+
+class PreviewWorker(QThread):
+    """
+    Hilo de larga duración que recolorea la vista previa de la imagen cargada.
+
+    Solo se guarda la última petición pendiente: si llega un valor nuevo del deslizador
+    antes de empezar a renderizar, la anterior se descarta, y si llega mientras se
+    renderiza, ese frame ya obsoleto no se emite. Así el hilo de la UI nunca se bloquea y
+    la vista previa no se queda atrás encadenando frames viejos.
+    """
+
+    # Imagen, número de petición, latencia (ms desde la petición hasta el frame) y si es calidad completa
+    frame_listo = Signal(QImage, int, float, bool)
+    error = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._mutex = QMutex()
+        self._hay_trabajo = QWaitCondition()
+        self._imagen_nueva = None
+        self._vista = None
+        self._pendiente = None
+        self._secuencia = 0
+        self._detener = False
+        # Frames descartados por obsoletos (peticiones sustituidas o renders ya superados)
+        self.descartados = 0
+
+    def set_imagen(self, img) -> None:
+        """Nueva imagen de origen; el proxy se calcula en el hilo del worker."""
+        with QMutexLocker(self._mutex):
+            self._imagen_nueva = img
+            # Un frame en curso de la imagen anterior ya no debe mostrarse
+            self._secuencia += 1
+            self._hay_trabajo.wakeOne()
+
+    def solicitar(self, hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float,
+                  completa: bool = False) -> int:
+        """Pide un frame con el ajuste dado y devuelve su número de secuencia."""
+        with QMutexLocker(self._mutex):
+            self._secuencia += 1
+            if self._pendiente is not None:
+                self.descartados += 1
+            self._pendiente = (self._secuencia, hue_shift_deg, sat_offset_pct, val_offset_pct,
+                               completa, time.perf_counter())
+            self._hay_trabajo.wakeOne()
+            return self._secuencia
+
+    def detener(self) -> None:
+        """Termina el bucle tras el frame en curso y espera al hilo (sin terminate())."""
+        with QMutexLocker(self._mutex):
+            self._detener = True
+            self._hay_trabajo.wakeOne()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while not self._detener and self._pendiente is None and self._imagen_nueva is None:
+                self._hay_trabajo.wait(self._mutex)
+            if self._detener:
+                self._mutex.unlock()
+                return
+            imagen, self._imagen_nueva = self._imagen_nueva, None
+            peticion, self._pendiente = self._pendiente, None
+            self._mutex.unlock()
+            try:
+                if imagen is not None:
+                    self._vista = VistaPrevia(imagen)
+                # Sin imagen cargada todavía no hay nada que previsualizar
+                if peticion is None or self._vista is None:
+                    continue
+                secuencia, hue, sat, val, completa, t0 = peticion
+                render = self._vista.render_completa if completa else self._vista.render_proxy
+                rgb = render(hue, sat, val)
+                with QMutexLocker(self._mutex):
+                    obsoleto = secuencia != self._secuencia
+                    if obsoleto:
+                        self.descartados += 1
+                if obsoleto:
+                    continue
+                qimg = _a_qimage(rgb)
+                self.frame_listo.emit(qimg, secuencia, (time.perf_counter() - t0) * 1000.0, completa)
+            except Exception as e:
+                traceback.print_exc()
+                self.error.emit(f"Error en vista previa: {e}")
@@ -0,0 +1,151 @@
+"""
+Extracción de paletas por lotes, sin interfaz gráfica (no importa PySide6).
+
+Uso:
+  python batch.py fotos/ catalogo/ --salida paletas.jsonl
+  python batch.py --lista rutas.txt --coleccion paletas.json -n auto --procesos 8
+
+Los directorios se recorren recursivamente. Con --salida cada resultado se añade como una
+línea JSON en cuanto termina; con --coleccion las paletas nuevas se añaden a un archivo de
+pendientes (<coleccion>.pendientes.jsonl) y al final se incorporan a la colección (formato
+de guardar_coleccion_paletas), que se reescribe una sola vez. En ambos casos, volver a lanzar
+el mismo comando salta las imágenes ya procesadas, también las que quedaron en pendientes.
+Sin ninguna de las dos, las líneas JSON se escriben en la salida estándar. Al terminar se
+muestra el rendimiento en stderr.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from data.models import Paleta
+from data.project_io import EscritorColeccion, iterar_coleccion_paletas
+from logic.clustering import N_COLORES_AUTO
+from logic.lote import InformeLote, leer_lista, listar_imagenes, procesar_lote, rutas_procesadas_jsonl
+
+# Imágenes entre volcados a disco del archivo de pendientes (--coleccion)
+GUARDAR_CADA = 100
+
+SUFIJO_PENDIENTES = '.pendientes.jsonl'
+
+
+def _n_colores(valor: str):
+    return valor if valor == N_COLORES_AUTO else int(valor)
+
+
+def _argumentos(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extrae paletas de colores de muchas imágenes en paralelo.")
+    parser.add_argument('entradas', nargs='*', help="Imágenes o directorios (se recorren recursivamente)")
+    parser.add_argument('--lista', help="Archivo de texto con una ruta de imagen por línea")
+    salida = parser.add_mutually_exclusive_group()
+    salida.add_argument('--salida', help="Archivo JSON Lines donde se añaden los resultados")
+    salida.add_argument('--coleccion', help="Colección de paletas JSON que se crea o amplía")
+    parser.add_argument('-n', '--n-colors', type=_n_colores, default=5, help="Número de colores o 'auto'")
+    parser.add_argument('--max-size', type=int, default=200)
+    parser.add_argument('--engine', default='numpy')
+    parser.add_argument('--mode', default='sample', choices=('sample', 'histogram'))
+    parser.add_argument('--sampler', default='stratified')
+    parser.add_argument('--color-space', default='rgb')
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument('--guardar-cada', type=int, default=GUARDAR_CADA)
+    args = parser.parse_args(argv)
+    if not args.entradas and not args.lista:
+        parser.error("indica al menos una imagen, un directorio o --lista")
+    return args
+
+
+def _leer_pendientes(path: str) -> Iterator[Dict]:
+    """Paletas (diccionarios de Paleta.to_dict) del archivo de pendientes, una por línea."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for linea in f:
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                # Línea cortada por una interrupción: esa imagen se volverá a procesar
+                continue
+
+
+def _abrir_para_anadir(path: str):
+    archivo = open(path, 'a', encoding='utf-8')
+    if archivo.tell() > 0:
+        # Si la ejecución anterior se cortó a mitad de línea, empezar en una nueva
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                archivo.write('\n')
+    return archivo
+
+
+def _guardar_coleccion(path: str, pendientes: str) -> None:
+    # Colección anterior + pendientes, leídas y escritas por partes; EscritorColeccion escribe
+    # en un temporal y solo sustituye `path` al terminar, así que se puede leer mientras tanto
+    if os.path.exists(path) and not os.path.exists(pendientes):
+        return
+    with EscritorColeccion(path) as escritor:
+        if os.path.exists(path):
+            for paleta in iterar_coleccion_paletas(path):
+                escritor.escribir(paleta)
+        for data in _leer_pendientes(pendientes):
+            escritor.escribir_dict(data)
+    if os.path.exists(pendientes):
+        os.remove(pendientes)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _argumentos(argv)
+    rutas = listar_imagenes(args.entradas)
+    if args.lista:
+        rutas = (r for fuente in (rutas, leer_lista(args.lista)) for r in fuente)
+
+    omitir = set()
+    pendientes = args.coleccion + SUFIJO_PENDIENTES if args.coleccion else None
+    if args.salida:
+        omitir = rutas_procesadas_jsonl(args.salida)
+    elif args.coleccion:
+        if os.path.exists(args.coleccion):
+            omitir = {p.origen_imagen_path for p in iterar_coleccion_paletas(args.coleccion)}
+        omitir.update(d.get('origen_imagen_path') for d in _leer_pendientes(pendientes))
+
+    informe = InformeLote()
+    opciones = dict(n_colors=args.n_colors, max_size=args.max_size, engine=args.engine, mode=args.mode,
+                    sampler=args.sampler, color_space=args.color_space)
+    archivo = None
+    try:
+        if args.salida:
+            archivo = _abrir_para_anadir(args.salida)
+        elif args.coleccion:
+            archivo = _abrir_para_anadir(pendientes)
+        else:
+            archivo = sys.stdout
+        nuevas = 0
+        for registro in procesar_lote(rutas, n_procesos=args.procesos, omitir=omitir, informe=informe, **opciones):
+            if 'error' in registro:
+                print(f"Error en {registro['path']}: {registro['error']}", file=sys.stderr)
+            if not args.coleccion:
+                archivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+                archivo.flush()
+            elif 'colores' in registro:
+                paleta = Paleta(nombre=os.path.basename(registro['path']),
+                                colores=[tuple(c) for c in registro['colores']],
+                                origen_imagen_path=registro['path'],
+                                parametros={'extraccion': opciones})
+                archivo.write(json.dumps(paleta.to_dict(), ensure_ascii=False) + '\n')
+                nuevas += 1
+                if nuevas % args.guardar_cada == 0:
+                    archivo.flush()
+    except KeyboardInterrupt:
+        print("Interrumpido: se conserva lo procesado hasta ahora", file=sys.stderr)
+    finally:
+        if archivo is not None and archivo is not sys.stdout:
+            archivo.close()
+        if args.coleccion:
+            _guardar_coleccion(args.coleccion, pendientes)
+        print(informe.resumen(), file=sys.stderr)
+    return 1 if informe.errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Paletas por fotograma de un GIF animado de 300 fotogramas (320x240): extracción independiente
+de cada fotograma con extraer_colores_dominantes frente a paletas_fotogramas (arranque en
+caliente y fotogramas sin cambios omitidos). Además del tiempo se mide la estabilidad del
+orden: distancia RGB media entre el color i de un fotograma y el color i del siguiente.
+
+Uso: python benchmarks/bench_animacion.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from logic.animacion import paletas_fotogramas
+from logic.clustering import extraer_colores_dominantes
+
+N_FOTOGRAMAS = 300
+N_COLORES = 5
+
+
+def _crear_gif(path: str) -> None:
+    # Fondo en degradado cuyo tono deriva despacio, un disco que se mueve y tramos casi quietos
+    h, w = 240, 320
+    y, x = np.mgrid[0:h, 0:w]
+    fotogramas = []
+    for i in range(N_FOTOGRAMAS):
+        t = (i // 3) * 3 if (i // 50) % 2 else i  # en los tramos impares, solo cambia cada 3 fotogramas
+        fase = 2 * np.pi * t / N_FOTOGRAMAS
+        arr = np.empty((h, w, 3), dtype=np.float64)
+        arr[..., 0] = 128 + 100 * np.sin(fase) * x / w
+        arr[..., 1] = 60 + 120 * y / h
+        arr[..., 2] = 128 + 100 * np.cos(fase) * (1 - x / w)
+        cx, cy = w * (0.2 + 0.6 * t / N_FOTOGRAMAS), h / 2
+        arr[(x - cx) ** 2 + (y - cy) ** 2 < 40 ** 2] = (240, 200, 30)
+        # Un contador en la esquina: ningún fotograma es idéntico al anterior (el GIF no los fusiona)
+        for bit in range(9):
+            arr[:4, 4 * bit:4 * bit + 4] = 255 * ((i >> bit) & 1)
+        fotogramas.append(Image.fromarray(arr.clip(0, 255).astype(np.uint8)))
+    fotogramas[0].save(path, save_all=True, append_images=fotogramas[1:], duration=40, loop=0)
+
+
+def _estabilidad(paletas) -> float:
+    saltos = [np.abs(np.asarray(a, float) - np.asarray(b, float)).sum(axis=1).mean()
+              for a, b in zip(paletas, paletas[1:])]
+    return float(np.mean(saltos))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "animacion.gif")
+        _crear_gif(path)
+
+        t0 = time.perf_counter()
+        with Image.open(path) as img:
+            independientes = [extraer_colores_dominantes(f, N_COLORES) for f in ImageSequence.Iterator(img)]
+        t_independiente = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        secuencia = [colores for _, colores, _ in paletas_fotogramas(path, N_COLORES)]
+        t_secuencia = time.perf_counter() - t0
+
+    print(f"{len(secuencia)} fotogramas: independiente {t_independiente:.2f} s, "
+          f"secuencia {t_secuencia:.2f} s ({t_independiente / t_secuencia:.1f}x)")
+    print(f"Salto medio del color i entre fotogramas: independiente {_estabilidad(independientes):.1f}, "
+          f"secuencia {_estabilidad(secuencia):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Arranque en frío de la interfaz: tiempo de `import ui.main_window` según `python -X importtime`
+(acumulado, con los módulos más caros) y tiempo hasta el primer frame de MainWindow en modo
+offscreen, medido desde el lanzamiento del proceso. Se compara el arranque actual (módulos
+pesados diferidos y precargados tras el primer frame) con el anterior, simulado importando
+MODULOS_DIFERIDOS antes de construir la ventana.
+
+Uso: python benchmarks/bench_arranque.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Se ejecuta en un proceso nuevo: marca de tiempo (reloj de pared) del primer evento de pintado
+# de la ventana y del final de la precarga en segundo plano
+CODIGO_PRIMER_FRAME = """
+import os, sys, time
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+anticipado = sys.argv[1] == '1'
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+import ui.main_window as mw
+if anticipado:
+    import importlib
+    for nombre in mw.MODULOS_DIFERIDOS:
+        importlib.import_module(nombre)
+
+class Filtro(QObject):
+    t_frame = None
+    def eventFilter(self, obj, evento):
+        if evento.type() == QEvent.Paint and Filtro.t_frame is None:
+            Filtro.t_frame = time.time()
+        return False
+
+app = QApplication([])
+filtro = Filtro()
+app.installEventFilter(filtro)
+ventana = mw.MainWindow()
+ventana.show()
+while Filtro.t_frame is None:
+    app.processEvents()
+while 'async_tasks.workers' not in sys.modules or ventana.planificador.metricas()['en_ejecucion']:
+    app.processEvents()
+    time.sleep(0.001)
+print(Filtro.t_frame, time.time())
+ventana.close()
+"""
+
+
+def tiempos_importacion(modulo: str = 'ui.main_window'):
+    """(ms acumulados de `modulo`, lista de (ms, nombre) de sus importaciones directas)."""
+    resultado = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                               cwd=RAIZ, capture_output=True, text=True, check=True)
+    total, candidatos = None, []
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        # Los hijos se listan antes que su padre, con un nivel más de sangría
+        if not nombre.startswith('  '):
+            if nombre.strip() == modulo:
+                total = int(acumulado) / 1000.0
+                break
+            candidatos = []
+        elif not nombre.startswith('    '):
+            candidatos.append((int(acumulado) / 1000.0, nombre.strip()))
+    return total, sorted(candidatos, reverse=True)
+
+
+def primer_frame(anticipado: bool = False):
+    """(ms hasta el primer frame, ms hasta terminar la precarga), desde el lanzamiento del proceso."""
+    entorno = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    t0 = time.time()
+    resultado = subprocess.run([sys.executable, '-c', CODIGO_PRIMER_FRAME, '1' if anticipado else '0'],
+                               cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True)
+    t_frame, t_precarga = map(float, resultado.stdout.split()[-2:])
+    return 1000.0 * (t_frame - t0), 1000.0 * (t_precarga - t0)
+
+
+def _mejor(fn, repeticiones: int = 5):
+    resultados = [fn() for _ in range(repeticiones)]
+    return tuple(min(r[i] for r in resultados) for i in range(2))
+
+
+def main():
+    # Primera ejecución descartada: compila los .pyc
+    tiempos_importacion()
+    total, hijos = min((tiempos_importacion() for _ in range(5)), key=lambda r: r[0])
+    print(f"import ui.main_window: {total:.0f} ms acumulados")
+    for ms, nombre in hijos[:6]:
+        print(f"  {nombre}: {ms:.1f} ms")
+    antes = _mejor(lambda: primer_frame(anticipado=True))
+    despues = _mejor(lambda: primer_frame(anticipado=False))
+    print(f"Primer frame (offscreen): {antes[0]:.0f} -> {despues[0]:.0f} ms desde el lanzamiento")
+    print(f"Módulos pesados disponibles: {antes[1]:.0f} -> {despues[1]:.0f} ms desde el lanzamiento")
+
+
+if __name__ == '__main__':
+    main()
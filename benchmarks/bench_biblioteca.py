@@ -0,0 +1,64 @@
+"""
+Biblioteca SQLite (data/biblioteca.py) con 100 000 paletas de 5 colores: inserción en
+lotes por transacción frente a una transacción por paleta (sobre una muestra), y consultas
+por imagen de origen + tono dominante con los índices frente a la misma consulta
+recorriendo la tabla (NOT INDEXED).
+
+Uso: python benchmarks/bench_biblioteca.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from data.biblioteca import TONOS_CALIDOS, BibliotecaPaletas
+from data.models import Paleta
+
+N_PALETAS = 100_000
+N_COLORES = 5
+N_IMAGENES = 1000
+N_SIN_LOTES = 2000
+
+
+def _paletas(n, rng):
+    rgb = rng.integers(0, 256, size=(n, N_COLORES, 3), dtype=np.uint8)
+    return [Paleta(nombre=f"Paleta {i}", colores=rgb[i], origen_imagen_path=f"img/{i % N_IMAGENES}.png")
+            for i in range(n)]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    paletas = _paletas(N_PALETAS, rng)
+    with tempfile.TemporaryDirectory() as d:
+        with BibliotecaPaletas(os.path.join(d, "sin_lotes.sqlite")) as biblioteca:
+            t0 = time.perf_counter()
+            for paleta in paletas[:N_SIN_LOTES]:
+                biblioteca.agregar([paleta])
+            t_sin_lotes = (time.perf_counter() - t0) / N_SIN_LOTES * N_PALETAS
+
+        with BibliotecaPaletas(os.path.join(d, "biblioteca.sqlite")) as biblioteca:
+            t0 = time.perf_counter()
+            biblioteca.agregar(paletas)
+            t_lotes = time.perf_counter() - t0
+            print(f"Insertar {N_PALETAS} paletas: en lotes {t_lotes:.1f} s, "
+                  f"una transacción por paleta ~{t_sin_lotes:.0f} s (estimado con {N_SIN_LOTES})")
+
+            imagenes = [f"img/{i}.png" for i in rng.integers(0, N_IMAGENES, size=200)]
+            sql, _ = biblioteca._consulta('id', origen_imagen_path='', tonos=TONOS_CALIDOS)
+            for nombre, consulta in (("con índices", sql), ("sin índices", sql.replace("FROM paletas", "FROM paletas NOT INDEXED"))):
+                t0 = time.perf_counter()
+                n = sum(len(biblioteca._conexion.execute(consulta, [imagen, *TONOS_CALIDOS]).fetchall()) for imagen in imagenes)
+                t = (time.perf_counter() - t0) / len(imagenes)
+                print(f"Paletas cálidas de una imagen ({nombre}): {t * 1000:.2f} ms ({n / len(imagenes):.0f} resultados)")
+            t0 = time.perf_counter()
+            for imagen in imagenes:
+                biblioteca.buscar(origen_imagen_path=imagen, tonos=TONOS_CALIDOS)
+            print(f"buscar() con las Paleta construidas: {(time.perf_counter() - t0) / len(imagenes) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Tiempo desde la selección del archivo hasta los primeros píxeles y hasta la primera paleta
+(n_colors='auto'), con el flujo anterior (Image.open + convert('RGBA') a resolución completa
+para mostrar y una segunda decodificación por ruta para la extracción) y con la carga única
+de logic.carga (miniatura y proxy de análisis de una sola decodificación). Si PySide6 está
+instalado, los primeros píxeles incluyen la conversión a QImage/QPixmap y el escalado a la
+etiqueta de 300 px, como en MainWindow.
+
+Uso: python benchmarks/bench_carga.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from logic.carga import cargar_imagen
+from logic.clustering import extraer_colores_dominantes, extraer_colores_dominantes_archivo
+
+
+try:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PIL.ImageQt import ImageQt
+    from PySide6.QtCore import QSize, Qt
+    from PySide6.QtGui import QImage, QPixmap
+    from PySide6.QtWidgets import QApplication
+except ImportError:
+    QApplication = None
+
+
+def _mostrar(qimg) -> None:
+    if QApplication is not None:
+        QPixmap.fromImage(qimg).scaled(QSize(300, 300), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def _antes(path: str):
+    t0 = time.perf_counter()
+    with Image.open(path) as img:
+        rgba = img.convert('RGBA')
+    if QApplication is not None:
+        _mostrar(QImage(ImageQt(rgba)))
+    t_pixeles = time.perf_counter() - t0
+    extraer_colores_dominantes_archivo(path, n_colors='auto')
+    return t_pixeles, time.perf_counter() - t0
+
+
+def _despues(path: str):
+    t0 = time.perf_counter()
+    imagen = cargar_imagen(path)
+    rgb = np.asarray(imagen.miniatura)
+    if QApplication is not None:
+        h, w = rgb.shape[:2]
+        _mostrar(QImage(rgb.tobytes(), w, h, 3 * w, QImage.Format_RGB888).copy())
+    t_pixeles = time.perf_counter() - t0
+    extraer_colores_dominantes(imagen.analisis, n_colors='auto')
+    return t_pixeles, time.perf_counter() - t0
+
+
+def _mejor(fn, path: str, repeticiones: int = 3):
+    resultados = [fn(path) for _ in range(repeticiones)]
+    return min(r[0] for r in resultados), min(r[1] for r in resultados)
+
+
+def main():
+    if QApplication is not None:
+        app = QApplication.instance() or QApplication([])
+    rng = np.random.default_rng(0)
+    # Imagen suave (gradiente + ruido) de 24 MP: comprime como una foto real
+    h, w = 4000, 6000
+    y, x = np.mgrid[0:h, 0:w]
+    arr = np.stack([x * 255 // w, y * 255 // h, (x + y) * 255 // (w + h)], axis=-1).astype(np.int16)
+    arr = np.clip(arr + rng.integers(-12, 13, size=arr.shape), 0, 255).astype(np.uint8)
+    with tempfile.TemporaryDirectory() as d:
+        for nombre, opciones in (('foto.jpg', {'quality': 90}), ('foto.png', {}), ('foto.bmp', {})):
+            path = os.path.join(d, nombre)
+            Image.fromarray(arr).save(path, **opciones)
+            antes = _mejor(_antes, path)
+            despues = _mejor(_despues, path)
+            print(f"{nombre} ({w}x{h}): primeros píxeles {antes[0] * 1000:.0f} -> {despues[0] * 1000:.0f} ms, "
+                  f"primera paleta {antes[1] * 1000:.0f} -> {despues[1] * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Operaciones masivas sobre una biblioteca de 200 000 paletas de 5 colores (1M colores): ajuste
+HSV y filtrado por tipo de armonía con un bucle sobre List[Paleta] (with_hsv_shift) frente a
+PaletteCollection (ajustar_hsv y filtrar sobre los arrays).
+
+Uso: python benchmarks/bench_coleccion.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from data.coleccion import PaletteCollection
+from data.models import Paleta
+
+N_PALETAS = 200_000
+N_COLORES = 5
+ARMONIAS = ('', 'complementario', 'analogos', 'triadas')
+
+
+def _mejor(fn, repeticiones: int = 3):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = fn()
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos), resultado
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(N_PALETAS * N_COLORES, 3), dtype=np.uint8)
+    coleccion = PaletteCollection(rgb, np.arange(0, rgb.shape[0] + 1, N_COLORES), [f"Paleta {i}" for i in range(N_PALETAS)],
+                                  armonia_tipo=[ARMONIAS[i % len(ARMONIAS)] for i in range(N_PALETAS)])
+    paletas = coleccion.to_paletas()
+
+    t_lista, ajustadas = _mejor(lambda: [p.with_hsv_shift(30, 10, -5) for p in paletas], repeticiones=1)
+    t_coleccion, ajustada = _mejor(lambda: coleccion.ajustar_hsv(30, 10, -5))
+    assert all(np.array_equal(a.rgb, b) for a, b in zip(ajustadas[:1000], (ajustada.colores(i) for i in range(1000))))
+    print(f"Ajuste HSV de {rgb.shape[0]} colores: lista {t_lista:.2f} s, colección {t_coleccion * 1000:.0f} ms "
+          f"({t_lista / t_coleccion:.0f}x)")
+
+    t_lista, _ = _mejor(lambda: [p for p in paletas if p.armonia_tipo == 'triadas'])
+    t_coleccion, _ = _mejor(lambda: coleccion.filtrar(coleccion.columna('armonia_tipo') == 'triadas'))
+    print(f"Filtrado por armonía: lista {t_lista * 1000:.0f} ms, colección {t_coleccion * 1000:.0f} ms")
+
+    t_corte, _ = _mejor(lambda: coleccion[50_000:150_000])
+    print(f"Corte de 100 000 paletas (sin copias): {t_corte * 1e6:.0f} µs")
+
+
+if __name__ == '__main__':
+    main()
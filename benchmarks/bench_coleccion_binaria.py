@@ -0,0 +1,76 @@
+"""
+Colección de 1 000 000 de paletas de 5 colores en el formato binario (data/coleccion_binaria.py)
+frente a la colección JSON compacta: tiempo de abrir el archivo y latencia de acceso aleatorio
+a una paleta (colores solos y Paleta completa). Con el JSON, abrir es cargarlo entero
+(cargar_coleccion_columnar) y el acceso es sobre la colección ya cargada. Los tiempos son con
+el archivo en la caché del sistema.
+
+Uso: python benchmarks/bench_coleccion_binaria.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from data.coleccion import PaletteCollection
+from data.coleccion_binaria import ColeccionBinaria, guardar_coleccion_binaria, json_a_binaria
+from data.project_io import cargar_coleccion_columnar, guardar_coleccion_paletas_incremental
+
+N_PALETAS = 1_000_000
+N_COLORES = 5
+N_ACCESOS = 10_000
+
+
+def _latencias(fn, indices):
+    tiempos = np.empty(len(indices))
+    for k, i in enumerate(indices):
+        t0 = time.perf_counter()
+        fn(i)
+        tiempos[k] = time.perf_counter() - t0
+    return np.median(tiempos) * 1e6, np.percentile(tiempos, 99) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(N_PALETAS * N_COLORES, 3), dtype=np.uint8)
+    coleccion = PaletteCollection(rgb, np.arange(0, rgb.shape[0] + 1, N_COLORES),
+                                  [f"Paleta {i}" for i in range(N_PALETAS)],
+                                  origen_imagen_path=[f"img/{i}.png" for i in range(N_PALETAS)])
+    indices = rng.integers(0, N_PALETAS, size=N_ACCESOS)
+    with tempfile.TemporaryDirectory() as d:
+        path_json, path_binaria = os.path.join(d, "coleccion.json"), os.path.join(d, "coleccion.bin")
+        t0 = time.perf_counter()
+        guardar_coleccion_binaria(coleccion, path_binaria)
+        print(f"Guardar binario: {time.perf_counter() - t0:.1f} s")
+        guardar_coleccion_paletas_incremental(coleccion, path_json, compacto=True)
+        t0 = time.perf_counter()
+        json_a_binaria(path_json, path_binaria)
+        print(f"Convertir JSON -> binario: {time.perf_counter() - t0:.1f} s")
+        print(f"Tamaño: JSON compacto {os.path.getsize(path_json) / 2 ** 20:.0f} MB, "
+              f"binario {os.path.getsize(path_binaria) / 2 ** 20:.0f} MB")
+
+        t0 = time.perf_counter()
+        cargada = cargar_coleccion_columnar(path_json)
+        t_json = time.perf_counter() - t0
+        tiempos = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            binaria = ColeccionBinaria(path_binaria)
+            tiempos.append(time.perf_counter() - t0)
+        print(f"Abrir: JSON {t_json:.1f} s, binario {np.median(tiempos) * 1e6:.0f} µs")
+
+        assert all(binaria.paleta(i) == cargada.paleta(i) for i in indices[:1000])
+        for nombre, fn_json, fn_binaria in (("colores", cargada.colores, binaria.colores),
+                                             ("Paleta", cargada.paleta, binaria.paleta)):
+            mediana_json, p99_json = _latencias(fn_json, indices)
+            mediana, p99 = _latencias(fn_binaria, indices)
+            print(f"Acceso aleatorio ({nombre}): JSON cargado {mediana_json:.1f} µs (p99 {p99_json:.1f}), "
+                  f"binario {mediana:.1f} µs (p99 {p99:.1f})")
+
+
+if __name__ == '__main__':
+    main()
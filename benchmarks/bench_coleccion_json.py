@@ -0,0 +1,73 @@
+"""
+Guardar y leer una colección JSON de 200 000 paletas de 5 colores con las funciones de
+siempre (lista completa en memoria + json.dump/json.load) frente a las incrementales
+(EscritorColeccion e iterar_coleccion_paletas, en formato indentado y compacto). Se mide el
+tiempo, el tamaño del archivo y el pico de memoria (tracemalloc, en una pasada aparte porque
+ralentiza la ejecución). La lectura incremental solo cuenta las paletas, sin retenerlas.
+
+Uso: python benchmarks/bench_coleccion_json.py
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from data.models import Paleta
+from data.project_io import (
+    cargar_coleccion_paletas, guardar_coleccion_paletas, guardar_coleccion_paletas_incremental,
+    iterar_coleccion_paletas
+)
+
+N_PALETAS = 200_000
+N_COLORES = 5
+
+
+def _paletas():
+    # Generador: las paletas se crean a medida que se escriben
+    rng = np.random.default_rng(0)
+    for i in range(N_PALETAS):
+        yield Paleta(nombre=f"Paleta {i}", colores=rng.integers(0, 256, size=(N_COLORES, 3)),
+                     origen_imagen_path=f"img/{i}.png")
+
+
+def _medir(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    fn()
+    segundos = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico / 2 ** 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        antes, indentado, compacto = (os.path.join(d, n) for n in ("antes.json", "indentado.json", "compacto.json"))
+        casos = [
+            ("guardar (lista + json.dump)", lambda: guardar_coleccion_paletas(list(_paletas()), antes)),
+            ("guardar incremental", lambda: guardar_coleccion_paletas_incremental(_paletas(), indentado)),
+            ("guardar incremental compacto",
+             lambda: guardar_coleccion_paletas_incremental(_paletas(), compacto, compacto=True)),
+            ("cargar (json.load)", lambda: cargar_coleccion_paletas(antes)),
+            ("iterar", lambda: sum(1 for _ in iterar_coleccion_paletas(indentado))),
+            ("iterar compacto", lambda: sum(1 for _ in iterar_coleccion_paletas(compacto))),
+        ]
+        for nombre, fn in casos:
+            segundos, pico = _medir(fn)
+            print(f"{nombre}: {segundos:.2f} s, pico {pico:.1f} MB")
+        tamanos = [os.path.getsize(p) / 2 ** 20 for p in (antes, indentado, compacto)]
+        print(f"Tamaño: {tamanos[0]:.0f} MB (indentado, idéntico: {open(antes).read() == open(indentado).read()}), "
+              f"{tamanos[2]:.0f} MB compacto")
+
+
+if __name__ == '__main__':
+    main()
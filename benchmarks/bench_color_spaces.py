@@ -0,0 +1,40 @@
+"""
+Rendimiento de las conversiones sRGB -> OKLab / CIELAB (y vuelta) en MB/s de entrada
+uint8, sobre 10 M píxeles aleatorios y un solo hilo.
+
+Uso: python benchmarks/bench_color_spaces.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from logic.color_spaces import a_rgb, desde_rgb
+
+
+def _mejor_tiempo(fn, repeticiones: int = 3) -> float:
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main():
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(10_000_000, 3), dtype=np.uint8)
+    mb = pixels.nbytes / 1e6
+    print(f"{'espacio':>8} {'ida MB/s':>9} {'vuelta MB/s':>12}")
+    for espacio in ('oklab', 'lab'):
+        valores = desde_rgb(pixels, espacio)
+        t_ida = _mejor_tiempo(lambda: desde_rgb(pixels, espacio))
+        t_vuelta = _mejor_tiempo(lambda: a_rgb(valores, espacio))
+        print(f"{espacio:>8} {mb / t_ida:9.0f} {mb / t_vuelta:12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Ajuste HSV de N colores: adjust_color_hsv color a color (API por tuplas, como antes de
+vectorizar) frente a adjust_hsv_array sobre el array (N, 3), para N = 1e2, 1e4 y 1e6.
+
+Uso: python benchmarks/bench_color_utils.py
+"""
+import colorsys
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from logic.color_utils import adjust_hsv_array
+
+
+def _ajuste_colorsys(color, hue, sat, val):
+    # Bucle por tuplas con colorsys, equivalente a la implementación anterior
+    h, s, v = colorsys.rgb_to_hsv(*(c / 255.0 for c in color))
+    if s == 0.0:
+        return color
+    h = (h + hue / 360.0) % 1.0
+    s = max(0.0, min(s + sat / 100.0, 1.0))
+    v = max(0.0, min(v + val / 100.0, 1.0))
+    return tuple(max(0, min(int(round(c * 255)), 255)) for c in colorsys.hsv_to_rgb(h, s, v))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'N':>9} {'tuplas ms':>11} {'array ms':>10} {'x':>7}")
+    for n in (100, 10_000, 1_000_000):
+        colores = rng.integers(0, 256, size=(n, 3), dtype=np.uint8)
+        tuplas = [tuple(c) for c in colores.tolist()]
+        t0 = time.perf_counter()
+        [_ajuste_colorsys(c, 30.0, 10.0, -5.0) for c in tuplas]
+        t_tuplas = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        adjust_hsv_array(colores, 30.0, 10.0, -5.0)
+        t_array = time.perf_counter() - t0
+        print(f"{n:>9} {t_tuplas * 1000:11.2f} {t_array * 1000:10.2f} {t_tuplas / t_array:7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Modo histograma frente al muestreo de 10k píxeles en extraer_colores_dominantes, usando
+todos los píxeles de la imagen (resize_for_speed=False) a distintas resoluciones.
+
+Uso: python benchmarks/bench_histograma.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from logic.clustering import extraer_colores_dominantes, histograma_cuantizado
+
+
+def _imagen(lado: int) -> Image.Image:
+    # Degradados con ruido: muchos colores distintos, como una foto
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, lado)
+    arr = np.stack([
+        np.broadcast_to(x[None, :], (lado, lado)),
+        np.broadcast_to(x[::-1, None], (lado, lado)),
+        rng.normal(128, 10, size=(lado, lado)),
+    ], axis=-1)
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+def main():
+    print(f"{'lado':>6} {'bins':>7} {'sample ms':>10} {'histogram ms':>13}")
+    for lado in (200, 500, 1000, 2000):
+        img = _imagen(lado)
+        bins = histograma_cuantizado(np.asarray(img).reshape(-1, 3), bits=5)[0].shape[0]
+        t0 = time.perf_counter()
+        extraer_colores_dominantes(img, n_colors=8, resize_for_speed=False, mode='sample')
+        t_sample = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        extraer_colores_dominantes(img, n_colors=8, resize_for_speed=False, mode='histogram')
+        t_hist = time.perf_counter() - t0
+        print(f"{lado:>6} {bins:>7} {t_sample * 1000:10.1f} {t_hist * 1000:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compara la extracción clásica (convert('RGB') + LANCZOS a resolución completa) con la
+ruta por franjas/draft de logic.decoding sobre una imagen sintética grande.
+
+Uso: python benchmarks/bench_imagen_grande.py [--megapixels 100]
+Cada medición se ejecuta en un subproceso para aislar el pico de memoria (VmHWM en Linux,
+ru_maxrss en otros sistemas; en Linux ru_maxrss se hereda del padre a través de fork/exec).
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _generar(path: str, lado: int) -> None:
+    import numpy as np
+    from PIL import Image
+    # Degradado con ruido, generado por franjas para no duplicar memoria en el padre
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, lado, dtype=np.float32)
+    arr = np.empty((lado, lado, 3), dtype=np.uint8)
+    for y0 in range(0, lado, 1024):
+        y1 = min(y0 + 1024, lado)
+        ys = np.linspace(y0, y1 - 1, y1 - y0, dtype=np.float32)[:, None] * (255.0 / lado)
+        ruido = rng.integers(0, 16, size=(y1 - y0, lado), dtype=np.uint8)
+        arr[y0:y1, :, 0] = x[None, :]
+        arr[y0:y1, :, 1] = ys
+        arr[y0:y1, :, 2] = ruido * 8
+    Image.MAX_IMAGE_PIXELS = None
+    Image.fromarray(arr).save(path)
+
+
+def _pico_rss_kb() -> int:
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmHWM:'):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _medir(modo: str, path: str) -> None:
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = None
+    from logic.clustering import extraer_colores_dominantes, extraer_colores_dominantes_archivo
+    t0 = time.perf_counter()
+    if modo == 'clasico':
+        colores = extraer_colores_dominantes(Image.open(path), n_colors=5)
+    else:
+        colores = extraer_colores_dominantes_archivo(path, n_colors=5)
+    dt = time.perf_counter() - t0
+    rss_kb = _pico_rss_kb()
+    print(f"{dt:.3f} {rss_kb} {colores}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--megapixels', type=float, default=100.0)
+    parser.add_argument('--medir', nargs=2, metavar=('MODO', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.medir:
+        _medir(*args.medir)
+        return
+    lado = int((args.megapixels * 1e6) ** 0.5)
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ('jpg', 'tif'):
+            path = os.path.join(tmp, f"sintetica.{ext}")
+            _generar(path, lado)
+            print(f"{ext.upper()} {lado}x{lado} ({os.path.getsize(path) / 1e6:.0f} MB en disco)")
+            for modo in ('clasico', 'franjas'):
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--medir', modo, path],
+                    capture_output=True, text=True, check=True,
+                ).stdout.split(' ', 2)
+                print(f"  {modo:<8} {float(out[0]):7.2f} s   pico RSS {int(out[1]) / 1024:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compara el motor k-means NumPy (logic.kmeans) con scikit-learn: tiempo de importación en
+un proceso limpio y tiempo de ajuste sobre 10k muestras de color con k = 5..16.
+
+Uso: python benchmarks/bench_kmeans.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def _tiempo_import(modulo: str, repeticiones: int = 5) -> float:
+    codigo = f"import time; t = time.perf_counter(); import {modulo}; print(time.perf_counter() - t)"
+    tiempos = []
+    for _ in range(repeticiones):
+        out = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True, cwd=RAIZ)
+        tiempos.append(float(out.stdout))
+    return min(tiempos)
+
+
+def _muestras(n: int = 10000, seed: int = 0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    centros = rng.uniform(0, 255, size=(12, 3))
+    return np.clip(centros[rng.integers(0, 12, n)] + rng.normal(0, 20, size=(n, 3)), 0, 255)
+
+
+def main():
+    print("Importación (mejor de 5, proceso limpio):")
+    print(f"  logic.kmeans         {_tiempo_import('logic.kmeans') * 1000:7.1f} ms")
+    print(f"  logic.clustering     {_tiempo_import('logic.clustering') * 1000:7.1f} ms")
+    print(f"  sklearn.cluster      {_tiempo_import('sklearn.cluster') * 1000:7.1f} ms")
+
+    from logic.kmeans import kmeans
+    from sklearn.cluster import KMeans
+    X = _muestras()
+    print("\nAjuste sobre 10k muestras, n_init=10 (mejor de 3):")
+    print(f"  {'k':>3} {'numpy ms':>10} {'sklearn ms':>11} {'inercia np/sk':>14}")
+    for k in (5, 8, 12, 16):
+        t_np = t_sk = float('inf')
+        for _ in range(3):
+            t0 = time.perf_counter()
+            res = kmeans(X, n_clusters=k, random_state=42, n_init=10)
+            t_np = min(t_np, time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            ref = KMeans(n_clusters=k, random_state=42, n_init=10).fit(X)
+            t_sk = min(t_sk, time.perf_counter() - t0)
+        print(f"  {k:>3} {t_np * 1000:10.1f} {t_sk * 1000:11.1f} {res.inercia / ref.inertia_:14.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Escalado de los reinicios n_init=10 de logic.kmeans con 1, 2, 4 y 8 workers, en un pool
+de hilos (n_jobs) y en un ProcessPoolExecutor, verificando que el resultado no cambia.
+
+Uso: python benchmarks/bench_kmeans_paralelo.py
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from logic.kmeans import kmeans
+
+
+def _muestras(n: int = 10000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centros = rng.uniform(0, 255, size=(12, 3))
+    return np.clip(centros[rng.integers(0, 12, n)] + rng.normal(0, 20, size=(n, 3)), 0, 255)
+
+
+def _mejor_de(n, fn):
+    mejor = float('inf')
+    for _ in range(n):
+        t0 = time.perf_counter()
+        res = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, res
+
+
+def main():
+    X = _muestras()
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    for k in (8, 16):
+        t_serie, ref = _mejor_de(3, lambda: kmeans(X, n_clusters=k))
+        print(f"\nk={k}  serie {t_serie * 1000:.1f} ms")
+        print(f"  {'workers':>7} {'hilos ms':>9} {'x':>5} {'procesos ms':>12} {'x':>5}")
+        for workers in (1, 2, 4, 8):
+            t_hilos, res_h = _mejor_de(3, lambda: kmeans(X, n_clusters=k, n_jobs=workers))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Calentar el pool para no medir el arranque de procesos
+                kmeans(X, n_clusters=k, executor=pool)
+                t_proc, res_p = _mejor_de(3, lambda: kmeans(X, n_clusters=k, executor=pool))
+            assert np.array_equal(res_h.centros, ref.centros) and np.array_equal(res_p.centros, ref.centros)
+            print(f"  {workers:>7} {t_hilos * 1000:9.1f} {t_serie / t_hilos:5.2f} "
+                  f"{t_proc * 1000:12.1f} {t_serie / t_proc:5.2f}")
+
+
+if __name__ == '__main__':
+    main()
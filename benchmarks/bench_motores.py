@@ -0,0 +1,53 @@
+"""
+Compara los motores del registro (logic/motores.py) sobre un corpus de imágenes generadas:
+tiempo de extracción y error medio de reconstrucción (distancia RGB de cada píxel a su color
+de la paleta), para elegir el motor por defecto según el tipo de trabajo.
+
+Uso: python benchmarks/bench_motores.py [n_colors] [mode]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from logic.clustering import comparar_motores
+
+
+def _corpus(lado: int = 800):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, lado)
+    degradado = np.stack([
+        np.broadcast_to(x[None, :], (lado, lado)),
+        np.broadcast_to(x[::-1, None], (lado, lado)),
+        rng.normal(128, 10, size=(lado, lado)),
+    ], axis=-1)
+    # Pocas manchas planas de color con ruido, como una ilustración
+    base = rng.integers(0, 256, size=(8, 3))
+    manchas = base[(np.arange(lado)[:, None] // (lado // 4)) * 2 + (np.arange(lado)[None, :] // (lado // 2))]
+    manchas = manchas + rng.normal(0, 6, size=manchas.shape)
+    # "Foto": mezcla suave de varios centros de color
+    yy, xx = np.mgrid[0:lado, 0:lado] / lado
+    foto = np.stack([
+        127 + 100 * np.sin(3 * xx + yy),
+        127 + 100 * np.cos(2 * yy - xx),
+        127 + 80 * np.sin(5 * xx * yy),
+    ], axis=-1) + rng.normal(0, 12, size=(lado, lado, 3))
+    ruido = rng.integers(0, 256, size=(lado, lado, 3))
+    for nombre, arr in (('degradado', degradado), ('manchas', manchas), ('foto', foto), ('ruido', ruido)):
+        yield nombre, Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+def main():
+    n_colors = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    mode = sys.argv[2] if len(sys.argv) > 2 else 'sample'
+    print(f"{'imagen':>10} {'motor':>17} {'ms':>8} {'error medio':>12}")
+    for nombre, img in _corpus():
+        for m in comparar_motores(img, n_colors=n_colors, mode=mode):
+            print(f"{nombre:>10} {m.motor:>17} {m.segundos * 1000:8.1f} {m.error_medio:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Coste de n_colors='auto' (barrido k = 2..16 con arranque en caliente) frente a una extracción
+con k fijo, en modo muestra e histograma.
+
+Uso: python benchmarks/bench_n_colores_auto.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from logic.clustering import extraer_colores_dominantes, seleccionar_n_colores
+
+
+def _imagen(lado: int = 800) -> Image.Image:
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:lado, 0:lado] / lado
+    arr = np.stack([
+        127 + 100 * np.sin(3 * xx + yy),
+        127 + 100 * np.cos(2 * yy - xx),
+        127 + 80 * np.sin(5 * xx * yy),
+    ], axis=-1) + rng.normal(0, 12, size=(lado, lado, 3))
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+def _mejor_tiempo(fn, repeticiones: int = 3) -> float:
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main():
+    img = _imagen()
+    print(f"{'modo':>10} {'k=5 ms':>8} {'auto ms':>8} {'ratio':>6} {'k elegido':>10}")
+    for mode in ('sample', 'histogram'):
+        t_fijo = _mejor_tiempo(lambda: extraer_colores_dominantes(img, n_colors=5, mode=mode))
+        t_auto = _mejor_tiempo(lambda: seleccionar_n_colores(img, mode=mode))
+        k = seleccionar_n_colores(img, mode=mode).n_colors
+        print(f"{mode:>10} {t_fijo * 1000:8.1f} {t_auto * 1000:8.1f} {t_auto / t_fijo:6.2f} {k:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Coste de una colección de 100 000 paletas de 5 colores: tiempo de cargar_coleccion_paletas
+(json.load + Paleta.from_dict) y memoria retenida por las paletas cargadas (tracemalloc,
+en bytes por paleta, sin contar el JSON ya descartado).
+
+Uso: python benchmarks/bench_paletas.py
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from data.models import Paleta
+from data.project_io import cargar_coleccion_paletas, guardar_coleccion_paletas
+
+N_PALETAS = 100_000
+N_COLORES = 5
+
+
+def _coleccion(path: str) -> None:
+    rng = np.random.default_rng(0)
+    colores = rng.integers(0, 256, size=(N_PALETAS, N_COLORES, 3)).tolist()
+    paletas = [Paleta(nombre=f"Paleta {i}", colores=[tuple(c) for c in cs], origen_imagen_path=f"img/{i}.png")
+               for i, cs in enumerate(colores)]
+    guardar_coleccion_paletas(paletas, path)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "coleccion.json")
+        _coleccion(path)
+        tiempos = []
+        for _ in range(3):
+            gc.collect()
+            t0 = time.perf_counter()
+            paletas = cargar_coleccion_paletas(path)
+            tiempos.append(time.perf_counter() - t0)
+            del paletas
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        paletas = cargar_coleccion_paletas(path)
+        gc.collect()
+        retenido = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+        # Memoria propia de cada paleta: sin el nombre ni la ruta de origen, que son iguales en ambos formatos
+        cadenas = sum(sys.getsizeof(p.nombre) + sys.getsizeof(p.origen_imagen_path) for p in paletas)
+    print(f"{N_PALETAS} paletas de {N_COLORES} colores: carga {min(tiempos):.2f} s, "
+          f"{retenido / N_PALETAS:.0f} bytes por paleta ({(retenido - cadenas) / N_PALETAS:.0f} sin cadenas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Backend de procesos para el agrupamiento: arranque del pool, sobrecoste por trabajo con los
+procesos ya calientes (trabajo mínimo en proceso frente a en el hilo) y tiempo de una
+extracción típica (10 000 puntos, k=5) en cada backend.
+
+Uso: python benchmarks/bench_procesos.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from async_tasks.procesos import BackendProcesos
+from logic.clustering import MAX_MUESTRAS, agrupar_puntos
+
+
+def _mediana_ms(fn, repeticiones: int = 30) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+    return 1000.0 * float(np.median(tiempos))
+
+
+def main():
+    t0 = time.perf_counter()
+    backend = BackendProcesos()
+    backend.esperar_arranque()
+    print(f"Arranque y calentamiento de {backend.max_procesos} proceso(s): "
+          f"{1000.0 * (time.perf_counter() - t0):.0f} ms")
+    rng = np.random.default_rng(0)
+    try:
+        minimo = rng.integers(0, 256, size=(64, 3), dtype=np.uint8)
+        t_hilo = _mediana_ms(lambda: agrupar_puntos(minimo, None, 2))
+        t_proceso = _mediana_ms(lambda: backend.agrupar(minimo, None, 2))
+        print(f"Trabajo mínimo (64 puntos, k=2): hilo {t_hilo:.2f} ms, proceso {t_proceso:.2f} ms "
+              f"-> sobrecoste {t_proceso - t_hilo:.2f} ms")
+        muestra = rng.integers(0, 256, size=(MAX_MUESTRAS, 3), dtype=np.uint8)
+        t_hilo = _mediana_ms(lambda: agrupar_puntos(muestra, None, 5), repeticiones=5)
+        t_proceso = _mediana_ms(lambda: backend.agrupar(muestra, None, 5), repeticiones=5)
+        print(f"Extracción típica ({MAX_MUESTRAS} puntos, k=5): hilo {t_hilo:.1f} ms, proceso {t_proceso:.1f} ms")
+    finally:
+        backend.cerrar()
+
+
+if __name__ == '__main__':
+    main()
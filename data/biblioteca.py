@@ -0,0 +1,217 @@
+import json
+import sqlite3
+from typing import Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from data.models import Paleta
+from logic.color_spaces import rgb_a_lab
+from logic.color_utils import rgb_to_hsv_array
+
+# Intervalos de tono (de 360 / N_TONOS grados) para el tono dominante de cada paleta: el
+# intervalo 0 es el rojo, [-15, 15) grados
+N_TONOS = 12
+TONOS_CALIDOS = (11, 0, 1, 2)   # rojos, naranjas y amarillos: [-45, 75) grados
+TONOS_FRIOS = (5, 6, 7, 8)      # verdes azulados a azules: [135, 255) grados
+
+# Croma (saturación * valor HSV) por debajo de la cual un color no cuenta para el tono
+# dominante: grises, blancos y colores casi negros
+UMBRAL_CROMA = 0.1
+
+# Paletas por transacción en agregar(): una transacción por paleta multiplica las
+# escrituras del diario; lotes grandes acotan la memoria de cada executemany
+TAMANO_LOTE = 10_000
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS paletas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    colores BLOB NOT NULL,
+    origen_imagen_path TEXT NOT NULL,
+    armonia_tipo TEXT NOT NULL,
+    parametros TEXT,
+    archivo_guardado TEXT,
+    tono_dominante INTEGER,
+    luminosidad REAL
+);
+CREATE INDEX IF NOT EXISTS idx_paletas_nombre ON paletas (nombre);
+CREATE INDEX IF NOT EXISTS idx_paletas_armonia ON paletas (armonia_tipo, tono_dominante);
+CREATE INDEX IF NOT EXISTS idx_paletas_origen ON paletas (origen_imagen_path, tono_dominante, luminosidad);
+CREATE INDEX IF NOT EXISTS idx_paletas_tono ON paletas (tono_dominante, luminosidad);
+"""
+
+_COLUMNAS = ('nombre', 'colores', 'origen_imagen_path', 'armonia_tipo', 'parametros', 'archivo_guardado')
+
+def caracteristicas_paletas(rgb: np.ndarray, offsets: np.ndarray,
+                            pesos: Optional[np.ndarray] = None) -> Tuple[List[Optional[int]], np.ndarray]:
+    """
+    Tono dominante y luminosidad media de muchas paletas a la vez, a partir de sus colores en
+    un array (M, 3) y los offsets (n + 1,) de cada paleta (como en PaletteCollection).
+
+    El tono dominante es el intervalo de tono (0 .. N_TONOS - 1) con más peso, contando cada
+    color por su peso en la paleta (`pesos`, o todos iguales) y su croma; es None si la
+    paleta no tiene colores cromáticos. La luminosidad es la media ponderada de L* (CIELAB,
+    0-100); NaN en las paletas vacías.
+    """
+    rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n_paletas = offsets.shape[0] - 1
+    n_colores = np.diff(offsets)
+    indice = np.repeat(np.arange(n_paletas), n_colores)
+    if pesos is None:
+        with np.errstate(divide='ignore'):
+            pesos = np.repeat(1.0 / n_colores, n_colores)
+    hsv = rgb_to_hsv_array(rgb)
+    croma = hsv[:, 1] * hsv[:, 2]
+    intervalo = np.floor(hsv[:, 0] * N_TONOS + 0.5).astype(np.int64) % N_TONOS
+    peso_tono = np.where(croma >= UMBRAL_CROMA, pesos * croma, 0.0)
+    por_tono = np.bincount(indice * N_TONOS + intervalo, weights=peso_tono,
+                           minlength=n_paletas * N_TONOS).reshape(n_paletas, N_TONOS)
+    tono = por_tono.argmax(axis=1)
+    tonos = [int(t) if cromatica else None for t, cromatica in zip(tono.tolist(), (por_tono.max(axis=1) > 0).tolist())]
+    luminosidad = rgb_a_lab(rgb, dtype=np.float64)[:, 0] if rgb.shape[0] else np.zeros(0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        luminosidad = np.bincount(indice, weights=pesos * luminosidad, minlength=n_paletas) \
+            / np.bincount(indice, weights=pesos, minlength=n_paletas)
+    return tonos, luminosidad
+
+def _filas(paletas: Sequence[Paleta]) -> List[Tuple]:
+    n_colores = [len(p._rgb) for p in paletas]
+    offsets = np.concatenate([[0], np.cumsum(n_colores, dtype=np.int64)])
+    rgb = np.concatenate([p._rgb for p in paletas]) if paletas else np.empty((0, 3), dtype=np.uint8)
+    # Pesos de la extracción si los hay (y están alineados con los colores); si no, iguales
+    pesos = np.concatenate([np.asarray(p.pesos, dtype=np.float64) if p.pesos is not None and len(p.pesos) == n
+                            else np.full(n, 1.0 / max(n, 1)) for p, n in zip(paletas, n_colores)]) if paletas else None
+    tonos, luminosidad = caracteristicas_paletas(rgb, offsets, pesos)
+    return [
+        (p.nombre, p._rgb.tobytes(), p.origen_imagen_path, p.armonia_tipo,
+         json.dumps(p._parametros, ensure_ascii=False) if p._parametros else None, p.archivo_guardado,
+         tono, None if np.isnan(l) else l)
+        for p, tono, l in zip(paletas, tonos, luminosidad.tolist())
+    ]
+
+def _paleta(fila: Tuple) -> Paleta:
+    nombre, colores, origen_imagen_path, armonia_tipo, parametros, archivo_guardado = fila
+    return Paleta.from_dict({
+        'nombre': nombre,
+        'colores': np.frombuffer(colores, dtype=np.uint8).reshape(-1, 3),  # from_dict lo copia
+        'origen_imagen_path': origen_imagen_path,
+        'armonia_tipo': armonia_tipo,
+        'parametros': json.loads(parametros) if parametros else None,
+        'archivo_guardado': archivo_guardado,
+    })
+
+class BibliotecaPaletas:
+    """
+    Biblioteca local de paletas en SQLite. Además de los campos de cada Paleta guarda su tono
+    dominante y su luminosidad media (ver caracteristicas_paletas), calculados al insertar,
+    con índices para buscar por nombre, armonía, imagen de origen y tono sin recorrer la
+    tabla. Usa el modo WAL, así que las lecturas no esperan a las escrituras.
+
+        with BibliotecaPaletas(path) as biblioteca:
+            biblioteca.agregar(paletas)
+            calidas = biblioteca.buscar(origen_imagen_path=imagen, tonos=TONOS_CALIDOS)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conexion = sqlite3.connect(path)
+        self._conexion.execute('PRAGMA journal_mode=WAL')
+        # Con WAL, NORMAL no sincroniza en cada commit y sigue sin corromper la base
+        self._conexion.execute('PRAGMA synchronous=NORMAL')
+        self._conexion.executescript(_ESQUEMA)
+
+    def agregar(self, paletas: Iterable[Paleta], tamano_lote: int = TAMANO_LOTE) -> List[int]:
+        """Inserta las paletas en transacciones de `tamano_lote`. Devuelve sus ids, en orden."""
+        ids = []
+        lote = []
+        for paleta in paletas:
+            lote.append(paleta)
+            if len(lote) == tamano_lote:
+                ids.extend(self._insertar(lote))
+                lote = []
+        if lote:
+            ids.extend(self._insertar(lote))
+        return ids
+
+    def _insertar(self, lote: List[Paleta]) -> range:
+        filas = _filas(lote)
+        with self._conexion:
+            # Los ids los asigna SQLite (AUTOINCREMENT: nunca reutiliza los de paletas
+            # eliminadas). Con el bloqueo de escritura tomado desde BEGIN IMMEDIATE, los del lote
+            # son consecutivos y el último es el que queda en sqlite_sequence
+            self._conexion.execute('BEGIN IMMEDIATE')
+            self._conexion.executemany(
+                'INSERT INTO paletas (nombre, colores, origen_imagen_path, armonia_tipo, parametros, '
+                'archivo_guardado, tono_dominante, luminosidad) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', filas)
+            ultimo_id = self._conexion.execute("SELECT seq FROM sqlite_sequence WHERE name = 'paletas'").fetchone()[0]
+        return range(ultimo_id - len(lote) + 1, ultimo_id + 1)
+
+    def obtener(self, id_paleta: int) -> Paleta:
+        fila = self._conexion.execute(f"SELECT {', '.join(_COLUMNAS)} FROM paletas WHERE id = ?",
+                                      (id_paleta,)).fetchone()
+        if fila is None:
+            raise KeyError(f"No hay ninguna paleta con id {id_paleta}")
+        return _paleta(fila)
+
+    def eliminar(self, ids: Iterable[int]) -> int:
+        """Elimina las paletas con esos ids. Devuelve cuántas se han eliminado."""
+        with self._conexion:
+            cursor = self._conexion.executemany('DELETE FROM paletas WHERE id = ?', ((i,) for i in ids))
+        return cursor.rowcount
+
+    def _consulta(self, columnas: str, nombre: Optional[str] = None, armonia_tipo: Optional[str] = None,
+                  origen_imagen_path: Optional[str] = None, tonos: Optional[Iterable[int]] = None,
+                  luminosidad_min: Optional[float] = None, luminosidad_max: Optional[float] = None,
+                  limite: Optional[int] = None, ordenar: bool = False) -> Tuple[str, List]:
+        condiciones, parametros = [], []
+        for columna, valor in (('nombre', nombre), ('armonia_tipo', armonia_tipo),
+                               ('origen_imagen_path', origen_imagen_path)):
+            if valor is not None:
+                condiciones.append(f'{columna} = ?')
+                parametros.append(valor)
+        if tonos is not None:
+            tonos = [int(t) for t in tonos]
+            condiciones.append(f"tono_dominante IN ({', '.join('?' * len(tonos))})")
+            parametros.extend(tonos)
+        if luminosidad_min is not None:
+            condiciones.append('luminosidad >= ?')
+            parametros.append(luminosidad_min)
+        if luminosidad_max is not None:
+            condiciones.append('luminosidad <= ?')
+            parametros.append(luminosidad_max)
+        sql = f"SELECT {columnas} FROM paletas"
+        if condiciones:
+            sql += ' WHERE ' + ' AND '.join(condiciones)
+        if ordenar:
+            # Puede obligar a recorrer la tabla por id en lugar de usar el índice del filtro
+            sql += ' ORDER BY id'
+        if limite is not None:
+            sql += ' LIMIT ?'
+            parametros.append(limite)
+        return sql, parametros
+
+    def buscar(self, **filtros) -> List[Paleta]:
+        """
+        Paletas que cumplen todos los filtros dados: nombre, armonia_tipo y
+        origen_imagen_path exactos, tonos (intervalos de tono dominante, p. ej.
+        TONOS_CALIDOS), luminosidad_min / luminosidad_max (L*, 0-100) y limite.
+
+        Salen en el orden del índice que use SQLite; con ordenar=True, en orden de inserción
+        (por id), lo que con un límite puede costar recorrer la tabla.
+        """
+        return [_paleta(fila) for fila in self._conexion.execute(*self._consulta(', '.join(_COLUMNAS), **filtros))]
+
+    def buscar_ids(self, **filtros) -> List[int]:
+        """Ids de las paletas que cumplen los filtros de buscar(), sin leer sus colores."""
+        return [fila[0] for fila in self._conexion.execute(*self._consulta('id', **filtros))]
+
+    def __len__(self) -> int:
+        return self._conexion.execute('SELECT COUNT(*) FROM paletas').fetchone()[0]
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+
+    def __enter__(self) -> 'BibliotecaPaletas':
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        self.cerrar()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Archivos hasta este tamaño se hashean completos; los mayores, por bloques repartidos
+HASH_COMPLETO_MAX_BYTES = 16 * 1024 * 1024
+HASH_BLOQUE_BYTES = 64 * 1024
+HASH_N_BLOQUES = 64
+
+# Límite por defecto del directorio de caché
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def directorio_cache_usuario() -> str:
+    """Directorio de caché del usuario según la plataforma (sobrescribible con DIVERGESIA_CACHE_DIR)."""
+    override = os.environ.get('DIVERGESIA_CACHE_DIR')
+    if override:
+        return override
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+        return os.path.join(base, 'Divergesia', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Caches/Divergesia')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'divergesia')
+
+
+def hash_contenido(path: str) -> str:
+    """
+    Hash rápido (BLAKE2b) del contenido del archivo. Los archivos grandes se resumen con su
+    tamaño y HASH_N_BLOQUES bloques equiespaciados, para que abrir un TIFF de cientos de MB
+    ya analizado no obligue a leerlo entero. Como un cambio fuera de esos bloques no
+    alteraría el resumen, en ellos la clave incluye además el inodo y la fecha de
+    modificación: editar el archivo invalida la entrada aunque conserve el tamaño.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    estado = os.stat(path)
+    tamano = estado.st_size
+    h.update(str(tamano).encode('ascii'))
+    with open(path, 'rb') as f:
+        if tamano <= HASH_COMPLETO_MAX_BYTES:
+            for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(bloque)
+        else:
+            h.update(f"{estado.st_ino}:{estado.st_mtime_ns}".encode('ascii'))
+            paso = (tamano - HASH_BLOQUE_BYTES) // (HASH_N_BLOQUES - 1)
+            for i in range(HASH_N_BLOQUES):
+                f.seek(i * paso)
+                h.update(f.read(HASH_BLOQUE_BYTES))
+    return h.hexdigest()
+
+
+class CacheExtracciones:
+    """
+    Caché persistente de resultados de extracción, direccionada por contenido.
+
+    Cada entrada es un JSON en `directorio`; la fecha de modificación hace de marca de
+    último uso, de modo que al superar `max_bytes` se eliminan primero las entradas
+    usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, directorio: Optional[str] = None, max_bytes: int = CACHE_MAX_BYTES):
+        self.directorio = directorio or os.path.join(directorio_cache_usuario(), 'extracciones')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def clave(self, path: str, **params) -> str:
+        """Clave a partir del hash del archivo y de los parámetros de extracción."""
+        params_txt = json.dumps(params, sort_keys=True, default=str)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(hash_contenido(path).encode('ascii'))
+        h.update(params_txt.encode('utf-8'))
+        return h.hexdigest()
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def obtener(self, clave: str) -> Optional[List[Tuple[int, int, int]]]:
+        """Devuelve los colores guardados para la clave, o None si no están en caché."""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            colores = [tuple(int(ch) for ch in c) for c in data['colores']]
+            # Marcar como usada recientemente
+            os.utime(ruta, None)
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return colores
+
+    def guardar(self, clave: str, colores: List[Tuple[int, int, int]]) -> None:
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self._ruta(clave)
+        tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'colores': [list(c) for c in colores]}, f)
+        # Escritura atómica para que un lector concurrente nunca vea un JSON a medias
+        os.replace(tmp, ruta)
+        self._expulsar()
+
+    def _entradas(self) -> List[Tuple[float, int, str]]:
+        entradas = []
+        try:
+            with os.scandir(self.directorio) as it:
+                for e in it:
+                    if e.name.endswith('.json'):
+                        st = e.stat()
+                        entradas.append((st.st_mtime, st.st_size, e.path))
+        except FileNotFoundError:
+            pass
+        return entradas
+
+    def _expulsar(self) -> None:
+        entradas = self._entradas()
+        total = sum(tam for _, tam, _ in entradas)
+        if total <= self.max_bytes:
+            return
+        # Más antiguas primero
+        for _, tam, ruta in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tam
+            with self._lock:
+                self._evictions += 1
+
+    def limpiar(self) -> None:
+        for _, _, ruta in self._entradas():
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores de la sesión (hits, misses, evictions) y ocupación actual del directorio."""
+        entradas = self._entradas()
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entradas': len(entradas),
+                'bytes': sum(tam for _, tam, _ in entradas),
+            }
+
+
+_cache_por_defecto: Optional[CacheExtracciones] = None
+
+
+def obtener_cache() -> CacheExtracciones:
+    """Instancia compartida de la caché en el directorio de usuario."""
+    global _cache_por_defecto
+    if _cache_por_defecto is None:
+        _cache_por_defecto = CacheExtracciones()
+    return _cache_por_defecto
@@ -0,0 +1,228 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+import numpy as np
+from data.models import Paleta, _array_colores
+from logic.color_utils import Offset, adjust_hsv_array
+
+# Colores por bloque en los ajustes masivos: los temporales float64 de la conversión HSV caben
+# en caché y son varias veces más pequeños que con el array completo
+COLORES_POR_BLOQUE = 16384
+
+# Columnas de metadatos (una entrada por paleta), en el orden de los campos de Paleta
+COLUMNAS = ('nombre', 'origen_imagen_path', 'armonia_tipo', 'parametros', 'archivo_guardado')
+
+
+def _columna(valores: Iterable) -> np.ndarray:
+    # Array de objetos 1D (np.array de una lista de dicts o listas intentaría crear más ejes)
+    valores = list(valores)
+    columna = np.empty(len(valores), dtype=object)
+    columna[:] = valores
+    return columna
+
+
+class PaletteCollection:
+    """
+    Colección de paletas en formato columnar: los colores de todas las paletas en un único
+    array uint8 (M, 3) y un array de desplazamientos (estilo CSR) con el que los colores de
+    la paleta i son rgb[offsets[i]:offsets[i + 1]]; los metadatos van en columnas (arrays de
+    objetos con una entrada por paleta).
+
+    Las operaciones masivas (ajuste HSV, medias, filtrado) trabajan sobre los arrays sin
+    crear objetos por paleta; las Paleta se construyen solo al pedirlas, como vistas de su
+    tramo. Cortar con un slice de paso 1 no copia colores ni metadatos. Ningún método
+    modifica los arrays: las operaciones devuelven colecciones nuevas.
+    """
+
+    def __init__(self, rgb: np.ndarray, offsets: np.ndarray, nombre: Iterable[str],
+                 origen_imagen_path: Optional[Iterable[str]] = None, armonia_tipo: Optional[Iterable[str]] = None,
+                 parametros: Optional[Iterable[Optional[Dict]]] = None,
+                 archivo_guardado: Optional[Iterable[Optional[str]]] = None):
+        self._rgb = _array_colores(rgb)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        n = self._offsets.shape[0] - 1
+        if self._offsets.ndim != 1 or n < 0 or self._offsets[0] < 0 or self._offsets[-1] > self._rgb.shape[0] \
+                or (np.diff(self._offsets) < 0).any():
+            raise ValueError("offsets debe ser creciente, con n_paletas + 1 entradas dentro del array de colores")
+        self._nombre = _columna(nombre)
+        self._origen_imagen_path = _columna([""] * n if origen_imagen_path is None else origen_imagen_path)
+        self._armonia_tipo = _columna([""] * n if armonia_tipo is None else armonia_tipo)
+        self._parametros = _columna([None] * n if parametros is None else parametros)
+        self._archivo_guardado = _columna([None] * n if archivo_guardado is None else archivo_guardado)
+        for columna in COLUMNAS:
+            if getattr(self, '_' + columna).shape[0] != n:
+                raise ValueError(f"La columna {columna} debe tener {n} valores")
+
+    @classmethod
+    def _desde_arrays(cls, rgb: np.ndarray, offsets: np.ndarray, columnas: Dict[str, np.ndarray]) -> 'PaletteCollection':
+        # Sin validar ni copiar: para vistas y resultados de operaciones sobre arrays ya válidos
+        coleccion = cls.__new__(cls)
+        coleccion._rgb = rgb
+        coleccion._offsets = offsets
+        for columna in COLUMNAS:
+            setattr(coleccion, '_' + columna, columnas[columna])
+        return coleccion
+
+    def _columnas(self, indice=slice(None)) -> Dict[str, np.ndarray]:
+        return {columna: getattr(self, '_' + columna)[indice] for columna in COLUMNAS}
+
+    @classmethod
+    def from_paletas(cls, paletas: Iterable[Paleta]) -> 'PaletteCollection':
+        """Colección con los colores y metadatos de las paletas (los colores se copian a un solo array)."""
+        paletas = list(paletas)
+        n_colores = [len(p.rgb) for p in paletas]
+        rgb = np.concatenate([p.rgb for p in paletas]) if paletas else np.empty((0, 3), dtype=np.uint8)
+        return cls._desde_arrays(rgb, np.concatenate([[0], np.cumsum(n_colores, dtype=np.int64)]), {
+            'nombre': _columna(p.nombre for p in paletas),
+            'origen_imagen_path': _columna(p.origen_imagen_path for p in paletas),
+            'armonia_tipo': _columna(p.armonia_tipo for p in paletas),
+            'parametros': _columna(p._parametros for p in paletas),
+            'archivo_guardado': _columna(p.archivo_guardado for p in paletas),
+        })
+
+    @classmethod
+    def from_dicts(cls, datos: Iterable[Dict]) -> 'PaletteCollection':
+        """Colección a partir de diccionarios como los de Paleta.to_dict, sin crear objetos Paleta."""
+        datos = list(datos)
+        listas = [d.get('colores', []) for d in datos]
+        rgb = _array_colores([c for colores in listas for c in colores], exigir_tuplas=False)
+        offsets = np.concatenate([[0], np.cumsum([len(colores) for colores in listas], dtype=np.int64)])
+        return cls._desde_arrays(rgb, offsets, {
+            'nombre': _columna(d.get('nombre', '') for d in datos),
+            'origen_imagen_path': _columna(d.get('origen_imagen_path', '') for d in datos),
+            'armonia_tipo': _columna(d.get('armonia_tipo', '') for d in datos),
+            'parametros': _columna(d.get('parametros') or None for d in datos),
+            'archivo_guardado': _columna(d.get('archivo_guardado') for d in datos),
+        })
+
+    def __len__(self) -> int:
+        return self._offsets.shape[0] - 1
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """Colores de todas las paletas, en orden, como array uint8 (M, 3) de solo lectura."""
+        vista = self._rgb[self._offsets[0]:self._offsets[-1]]
+        vista.flags.writeable = False
+        return vista
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Desplazamientos (n + 1,) de cada paleta dentro de `rgb`."""
+        return self._offsets - self._offsets[0]
+
+    @property
+    def n_colores(self) -> np.ndarray:
+        """Número de colores de cada paleta."""
+        return np.diff(self._offsets)
+
+    @property
+    def indice_paleta(self) -> np.ndarray:
+        """Índice de la paleta a la que pertenece cada color de `rgb`."""
+        return np.repeat(np.arange(len(self)), self.n_colores)
+
+    def columna(self, nombre: str) -> np.ndarray:
+        """Columna de metadatos (nombre, origen_imagen_path, armonia_tipo, parametros o archivo_guardado)."""
+        if nombre not in COLUMNAS:
+            raise ValueError(f"Columna no soportada: {nombre}")
+        return getattr(self, '_' + nombre)
+
+    def colores(self, i: int) -> np.ndarray:
+        """Colores de la paleta i (vista de solo lectura)."""
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Índice de paleta fuera de rango: {i}")
+        i %= len(self)
+        vista = self._rgb[self._offsets[i]:self._offsets[i + 1]]
+        vista.flags.writeable = False
+        return vista
+
+    def paleta(self, i: int) -> Paleta:
+        """
+        Paleta i, construida al pedirla. Sus colores son una vista del array de la colección y
+        su diccionario de parámetros una copia, así que modificarla no altera la colección.
+        """
+        rgb = self.colores(i)
+        i %= len(self)
+        paleta = Paleta.__new__(Paleta)
+        paleta._rgb = rgb
+        for columna in COLUMNAS:
+            setattr(paleta, '_parametros' if columna == 'parametros' else columna, getattr(self, '_' + columna)[i])
+        if paleta._parametros is not None:
+            paleta._parametros = dict(paleta._parametros)
+        return paleta
+
+    def __getitem__(self, indice: Union[int, slice, np.ndarray, List[int]]) -> Union[Paleta, 'PaletteCollection']:
+        if isinstance(indice, (int, np.integer)):
+            return self.paleta(int(indice))
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self))
+            if paso == 1:
+                # Vista: el array de colores y las columnas se comparten, solo se recortan los límites
+                fin = max(fin, inicio)
+                return self._desde_arrays(self._rgb, self._offsets[inicio:fin + 1], self._columnas(slice(inicio, fin)))
+            indice = np.arange(inicio, fin, paso)
+        return self.seleccionar(indice)
+
+    def __iter__(self) -> Iterator[Paleta]:
+        for i in range(len(self)):
+            yield self.paleta(i)
+
+    def to_paletas(self) -> List[Paleta]:
+        return list(self)
+
+    def to_dicts(self) -> List[Dict]:
+        return [p.to_dict() for p in self]
+
+    def seleccionar(self, indices: Union[np.ndarray, List[int]]) -> 'PaletteCollection':
+        """Colección con las paletas de `indices` (enteros o máscara booleana), en ese orden. Copia los colores."""
+        indices = np.arange(len(self))[np.asarray(indices)] if len(self) else np.zeros(0, dtype=np.intp)
+        inicios, fines = self._offsets[:-1][indices], self._offsets[1:][indices]
+        n_colores = fines - inicios
+        offsets = np.concatenate([[0], np.cumsum(n_colores, dtype=np.int64)])
+        # Posición en self._rgb de cada color seleccionado: inicio de su paleta + posición dentro de ella
+        posiciones = np.repeat(inicios - offsets[:-1], n_colores) + np.arange(offsets[-1])
+        return self._desde_arrays(self._rgb[posiciones], offsets, self._columnas(indices))
+
+    def filtrar(self, criterio: Union[np.ndarray, Callable[['PaletteCollection'], np.ndarray]]) -> 'PaletteCollection':
+        """
+        Paletas que cumplen `criterio`: una máscara booleana (n,) o una función que la calcula
+        a partir de la colección (p. ej. lambda c: c.columna('armonia_tipo') == 'triadas').
+        """
+        mascara = criterio(self) if callable(criterio) else criterio
+        mascara = np.asarray(mascara, dtype=bool)
+        if mascara.shape != (len(self),):
+            raise ValueError(f"La máscara debe tener shape ({len(self)},), got {mascara.shape}")
+        return self.seleccionar(mascara)
+
+    def medias(self) -> np.ndarray:
+        """Color medio (float64) de cada paleta; NaN en las paletas sin colores."""
+        # Sumas por tramo como diferencias de la suma acumulada (válido también para tramos vacíos)
+        rgb, offsets = self.rgb, self.offsets
+        acumulada = np.zeros((rgb.shape[0] + 1, 3), dtype=np.int64)
+        np.cumsum(rgb, axis=0, out=acumulada[1:])
+        sumas = acumulada[offsets[1:]] - acumulada[offsets[:-1]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sumas / self.n_colores[:, None]
+
+    def ajustar_hsv(self, hue_shift_deg: Offset = 0.0, sat_offset_pct: Offset = 0.0,
+                    val_offset_pct: Offset = 0.0) -> 'PaletteCollection':
+        """
+        Nueva colección con el ajuste de adjust_palette_hsv aplicado a todos los colores en
+        bloque (idéntico color a color). Los desplazamientos pueden ser escalares o arrays (n,)
+        con un valor por paleta. Los metadatos se comparten con esta colección.
+        """
+        rgb = self.rgb
+        desplazamientos = []
+        for d in (hue_shift_deg, sat_offset_pct, val_offset_pct):
+            if np.ndim(d):
+                d = np.asarray(d, dtype=np.float64)
+                if d.shape != (len(self),):
+                    raise ValueError(f"Los desplazamientos por paleta deben tener shape ({len(self)},), got {d.shape}")
+                # Un valor por color, para ajustar todos los colores en la misma llamada
+                d = np.repeat(d, self.n_colores)
+            desplazamientos.append(d)
+        ajustados = np.empty_like(rgb)
+        for i in range(0, rgb.shape[0], COLORES_POR_BLOQUE):
+            bloque = slice(i, i + COLORES_POR_BLOQUE)
+            ajustados[bloque] = adjust_hsv_array(rgb[bloque], *(d[bloque] if np.ndim(d) else d for d in desplazamientos))
+        return self._desde_arrays(ajustados, self.offsets, self._columnas())
+
+    def __repr__(self) -> str:
+        return f"PaletteCollection({len(self)} paletas, {self._offsets[-1] - self._offsets[0]} colores)"
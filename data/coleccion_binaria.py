@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from data.models import Paleta, _array_colores
+from data.coleccion import COLUMNAS, PaletteCollection, _columna
+from data.project_io import EscritorColeccion, _iterar_elementos
+
+# Formato binario de colecciones de paletas (little-endian):
+#
+#   cabecera (64 bytes)  magia, versión, n_paletas, n_colores y posición de cada sección
+#   colores              uint8 (n_colores, 3): los colores de todas las paletas, en orden
+#   offsets              int64 (n_paletas + 1): la paleta i ocupa colores[offsets[i]:offsets[i + 1]]
+#   índice metadatos     int64 (n_paletas + 1): tramo de cada paleta en la sección de metadatos
+#   metadatos            un objeto JSON compacto (UTF-8) por paleta, con todos sus campos salvo los colores
+#
+# Las secciones de enteros empiezan en múltiplos de 8 bytes. Abrir el archivo solo lee la
+# cabecera y mapea el resto (np.memmap): el sistema carga del disco las páginas que se usan.
+MAGIA = b'DIVPAL\r\n'
+VERSION = 1
+_CABECERA = struct.Struct('<8sI4xQQQQQQ')  # magia, versión, n_paletas, n_colores, 4 posiciones
+
+def _alinear(pos: int) -> int:
+    return -(-pos // 8) * 8
+
+_CODIFICADOR = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def _registro(data: Dict) -> Tuple[np.ndarray, bytes]:
+    # 'colores' se queda en los metadatos como null, en su posición, para que la conversión
+    # de vuelta a JSON conserve el orden de las claves
+    rgb = _array_colores(data.get('colores', []), exigir_tuplas=False)
+    metadatos = dict(data)
+    if 'colores' in metadatos:
+        metadatos['colores'] = None
+    return rgb, _CODIFICADOR.encode(metadatos).encode('utf-8')
+
+def _metadatos(nombre: str, origen_imagen_path: str, armonia_tipo: str, parametros: Optional[Dict],
+               archivo_guardado: Optional[str]) -> bytes:
+    # Los mismos campos y en el mismo orden que Paleta.to_dict, sin pasar los colores a listas
+    return _CODIFICADOR.encode({
+        'nombre': nombre, 'colores': None, 'origen_imagen_path': origen_imagen_path, 'armonia_tipo': armonia_tipo,
+        'parametros': parametros or {}, 'archivo_guardado': archivo_guardado,
+    }).encode('utf-8')
+
+def _registros(paletas: Iterable[Paleta]) -> Iterator[Tuple[np.ndarray, bytes]]:
+    if isinstance(paletas, PaletteCollection):
+        # Directamente de los arrays y columnas, sin construir una Paleta por elemento
+        rgb, offsets = paletas.rgb, paletas.offsets.tolist()
+        for i, campos in enumerate(zip(*(paletas.columna(columna) for columna in COLUMNAS))):
+            yield rgb[offsets[i]:offsets[i + 1]], _metadatos(*campos)
+    else:
+        for p in paletas:
+            yield p._rgb, _metadatos(p.nombre, p.origen_imagen_path, p.armonia_tipo, p._parametros, p.archivo_guardado)
+
+def _escribir(registros: Iterable[Tuple[np.ndarray, bytes]], path: str) -> int:
+    """
+    Escribe los registros (colores, metadatos) de uno en uno: los colores van directamente al
+    archivo y los metadatos a un temporal que se copia al final, así que la memoria solo
+    depende de los dos índices (16 bytes por paleta).
+
+    Todo se escribe en path + '.tmp', que sustituye a `path` solo cuando está completo: el
+    archivo anterior no se trunca mientras pueda estar mapeado (una ColeccionBinaria abierta,
+    o los propios registros si se reescribe una colección sobre sí misma).
+    """
+    temporal = path + '.tmp'
+    try:
+        n_paletas = _escribir_archivo(registros, temporal)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    os.replace(temporal, path)
+    return n_paletas
+
+def _escribir_archivo(registros: Iterable[Tuple[np.ndarray, bytes]], path: str) -> int:
+    offsets, indice_metadatos = [0], [0]
+    with open(path, 'wb') as f, tempfile.TemporaryFile() as metadatos:
+        f.write(bytes(_CABECERA.size))
+        for rgb, texto in registros:
+            f.write(rgb.tobytes())
+            metadatos.write(texto)
+            offsets.append(offsets[-1] + rgb.shape[0])
+            indice_metadatos.append(indice_metadatos[-1] + len(texto))
+        n_paletas, n_colores = len(offsets) - 1, offsets[-1]
+        pos_offsets = _alinear(_CABECERA.size + 3 * n_colores)
+        pos_indice = pos_offsets + 8 * (n_paletas + 1)
+        pos_metadatos = pos_indice + 8 * (n_paletas + 1)
+        f.write(bytes(pos_offsets - f.tell()))
+        f.write(np.asarray(offsets, dtype='<i8').tobytes())
+        f.write(np.asarray(indice_metadatos, dtype='<i8').tobytes())
+        metadatos.seek(0)
+        shutil.copyfileobj(metadatos, f)
+        f.seek(0)
+        f.write(_CABECERA.pack(MAGIA, VERSION, n_paletas, n_colores, _CABECERA.size, pos_offsets,
+                               pos_indice, pos_metadatos))
+    return n_paletas
+
+def guardar_coleccion_binaria(paletas: Iterable[Paleta], path: str) -> int:
+    """
+    Guarda las paletas (una lista, un generador o una PaletteCollection) en el formato
+    binario, consumiéndolas de una en una. Devuelve el número de paletas escritas.
+    """
+    return _escribir(_registros(paletas), path)
+
+def json_a_binaria(path_json: str, path_binaria: str) -> int:
+    """
+    Convierte una colección JSON (formato de guardar_coleccion_paletas) al formato binario
+    sin cargarla entera. Los campos de cada paleta se conservan tal cual, así que
+    binaria_a_json devuelve el mismo contenido.
+    """
+    return _escribir((_registro(data) for data in _iterar_elementos(path_json)), path_binaria)
+
+def binaria_a_json(path_binaria: str, path_json: str, compacto: bool = False) -> int:
+    """
+    Convierte un archivo binario a una colección JSON. Para colecciones guardadas por la
+    aplicación el resultado es idéntico byte a byte al de guardar_coleccion_paletas (o al
+    formato compacto de EscritorColeccion).
+    """
+    coleccion = ColeccionBinaria(path_binaria)
+    with EscritorColeccion(path_json, compacto=compacto) as escritor:
+        for i in range(len(coleccion)):
+            escritor.escribir_dict(coleccion.to_dict(i))
+    return escritor.n_paletas
+
+class ColeccionBinaria:
+    """
+    Colección de paletas en el formato binario, abierta con np.memmap. Abrirla cuesta lo
+    mismo con cien paletas que con un millón (se lee la cabecera y se mapea el archivo), y
+    acceder a la paleta i lee solo sus dos entradas de cada índice, sus colores y sus
+    metadatos. Es de solo lectura: para modificarla, convertirla (to_coleccion, to_dict) y
+    guardarla de nuevo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            cabecera = f.read(_CABECERA.size)
+        if len(cabecera) < _CABECERA.size or cabecera[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"El archivo no es una colección binaria de paletas: {path}")
+        _, version, n_paletas, n_colores, pos_colores, pos_offsets, pos_indice, pos_metadatos = \
+            _CABECERA.unpack(cabecera)
+        if version != VERSION:
+            raise ValueError(f"Versión de colección binaria no soportada: {version}")
+        # Vistas ndarray del mapa: el mismo búfer, pero cortarlas no pasa por la subclase memmap
+        mapa = np.asarray(np.memmap(path, dtype=np.uint8, mode='r'))
+        if mapa.shape[0] < pos_metadatos:
+            raise ValueError(f"Colección binaria incompleta: {path}")
+        self._rgb = mapa[pos_colores:pos_colores + 3 * n_colores].reshape(n_colores, 3)
+        self._offsets = mapa[pos_offsets:pos_offsets + 8 * (n_paletas + 1)].view('<i8')
+        self._indice_metadatos = mapa[pos_indice:pos_indice + 8 * (n_paletas + 1)].view('<i8')
+        self._metadatos = mapa[pos_metadatos:]
+        if self._metadatos.shape[0] < self._indice_metadatos[-1]:
+            raise ValueError(f"Colección binaria incompleta: {path}")
+
+    def __len__(self) -> int:
+        return self._offsets.shape[0] - 1
+
+    def _comprobar_indice(self, i: int) -> int:
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Índice de paleta fuera de rango: {i}")
+        return i % len(self)
+
+    def colores(self, i: int) -> np.ndarray:
+        """Colores de la paleta i: vista uint8 (N, 3) de solo lectura sobre el archivo mapeado."""
+        i = self._comprobar_indice(i)
+        return self._rgb[self._offsets[i]:self._offsets[i + 1]]
+
+    def _leer_metadatos(self, i: int) -> Dict:
+        return json.loads(self._metadatos[self._indice_metadatos[i]:self._indice_metadatos[i + 1]].tobytes())
+
+    def metadatos(self, i: int) -> Dict:
+        """Campos de la paleta i (nombre, origen_imagen_path, ...), sin los colores."""
+        metadatos = self._leer_metadatos(self._comprobar_indice(i))
+        metadatos.pop('colores', None)
+        return metadatos
+
+    def to_dict(self, i: int) -> Dict:
+        """Diccionario de la paleta i tal como estaba en la colección JSON (o como Paleta.to_dict)."""
+        i = self._comprobar_indice(i)
+        data = self._leer_metadatos(i)
+        if 'colores' in data:
+            data['colores'] = self.colores(i).tolist()
+        return data
+
+    def paleta(self, i: int) -> Paleta:
+        """Paleta i, con sus colores copiados (no depende del archivo una vez creada)."""
+        i = self._comprobar_indice(i)
+        data = self._leer_metadatos(i)
+        data['colores'] = self.colores(i)  # from_dict copia el array (astype)
+        return Paleta.from_dict(data)
+
+    def __getitem__(self, i: int) -> Paleta:
+        return self.paleta(i)
+
+    def __iter__(self) -> Iterator[Paleta]:
+        for i in range(len(self)):
+            yield self.paleta(i)
+
+    def to_coleccion(self) -> PaletteCollection:
+        """
+        PaletteCollection con los colores y offsets mapeados (sin copiarlos) y los metadatos
+        de todas las paletas decodificados, lo que sí recorre la sección de metadatos entera.
+        """
+        datos = [self.metadatos(i) for i in range(len(self))]
+        return PaletteCollection._desde_arrays(self._rgb, np.asarray(self._offsets, dtype=np.int64), {
+            'nombre': _columna(d.get('nombre', '') for d in datos),
+            'origen_imagen_path': _columna(d.get('origen_imagen_path', '') for d in datos),
+            'armonia_tipo': _columna(d.get('armonia_tipo', '') for d in datos),
+            'parametros': _columna(d.get('parametros') or None for d in datos),
+            'archivo_guardado': _columna(d.get('archivo_guardado') for d in datos),
+        })
+
+    def __repr__(self) -> str:
+        return f"ColeccionBinaria({self.path!r}, {len(self)} paletas, {self._rgb.shape[0]} colores)"
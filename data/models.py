@@ -1,22 +1,180 @@
-from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Optional
-from logic.color_utils import adjust_palette_hsv
+from collections.abc import MutableSequence
+from typing import List, Tuple, Dict, Iterable, Optional, Union
+import numpy as np
+from logic.color_utils import adjust_hsv_array
+
+
+def _array_colores(colores, exigir_tuplas: bool = True) -> np.ndarray:
+    """
+    Convierte los colores a un array uint8 (N, 3) propio, validando tipo, forma y rango en una
+    sola pasada vectorizada. Con `exigir_tuplas` los colores de una lista deben ser tuplas,
+    como en la representación por tuplas (from_dict lo desactiva: el JSON trae listas).
+    """
+    if isinstance(colores, np.ndarray):
+        arr = colores
+    else:
+        if not isinstance(colores, list):
+            colores = list(colores)
+        if exigir_tuplas and not all(type(c) is tuple for c in colores):
+            raise ValueError(f"Color inválido en Paleta: {next(c for c in colores if type(c) is not tuple)}")
+        try:
+            arr = np.array(colores)
+        except ValueError:
+            raise ValueError(f"Colores inválidos en Paleta: {colores}") from None
+    if arr.size == 0:
+        return np.empty((0, 3), dtype=np.uint8)
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError(f"Los colores deben tener forma (N, 3), got {arr.shape}")
+    if arr.dtype.kind not in 'iu':
+        raise ValueError(f"Valores de color deben ser ints en 0-255, got dtype {arr.dtype}")
+    rgb = arr.astype(np.uint8)
+    if arr.dtype != np.uint8 and not np.array_equal(rgb, arr):
+        raise ValueError(f"Valores de color deben ser ints en 0-255: {arr[(arr < 0) | (arr > 255)].tolist()}")
+    return rgb
+
+
+class ColoresPaleta(MutableSequence):
+    """
+    Vista de los colores de una Paleta con la semántica de la antigua lista de tuplas
+    (índices, iteración, igualdad con listas, copy, append...) sin materializar las tuplas.
+    Las modificaciones se validan y se escriben en el array de la paleta.
+    """
+    __slots__ = ('_paleta',)
+
+    def __init__(self, paleta: 'Paleta'):
+        self._paleta = paleta
+
+    def __len__(self) -> int:
+        return self._paleta._rgb.shape[0]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [tuple(c) for c in self._paleta._rgb[i].tolist()]
+        r, g, b = self._paleta._rgb[i].tolist()
+        return r, g, b
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __setitem__(self, i, valor):
+        colores = self.copy()
+        colores[i] = valor
+        self._paleta.colores = colores
+
+    def __delitem__(self, i):
+        self._paleta._rgb = np.delete(self._paleta._rgb, i, axis=0)
+
+    def insert(self, i: int, valor: Tuple[int, int, int]) -> None:
+        colores = self.copy()
+        colores.insert(i, valor)
+        self._paleta.colores = colores
+
+    def copy(self) -> List[Tuple[int, int, int]]:
+        """Lista de tuplas independiente de la paleta."""
+        return [tuple(c) for c in self._paleta._rgb.tolist()]
+
+    def __array__(self, dtype=None, copy=None):
+        rgb = self._paleta._rgb
+        return rgb.astype(dtype) if dtype is not None else rgb.copy()
+
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, ColoresPaleta):
+            return np.array_equal(self._paleta._rgb, otro._paleta._rgb)
+        if isinstance(otro, (list, tuple)):
+            return self.copy() == [tuple(c) if isinstance(c, list) else c for c in otro]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
 
-@dataclass
 class Paleta:
-    """Representa una paleta de colores con metadata y funciones de ajuste."""
-    nombre: str
-    colores: List[Tuple[int, int, int]]
-    origen_imagen_path: str = ""
-    armonia_tipo: str = ""
-    parametros: Dict = field(default_factory=dict)
-    archivo_guardado: Optional[str] = None
+    """
+    Representa una paleta de colores con metadata y funciones de ajuste.
+
+    Los colores se guardan en un array uint8 (N, 3) contiguo (`rgb`); `colores` es una vista
+    con la semántica de la lista de tuplas (ver ColoresPaleta). Con __slots__ y sin tuplas
+    por color, una paleta ocupa una fracción de la memoria de la representación anterior, lo
+    que importa al cargar colecciones de cientos de miles de paletas.
+    """
+    __slots__ = ('nombre', '_rgb', 'origen_imagen_path', 'armonia_tipo', '_parametros', 'archivo_guardado')
+
+    def __init__(
+        self,
+        nombre: str,
+        colores: Union[Iterable[Tuple[int, int, int]], np.ndarray],
+        origen_imagen_path: str = "",
+        armonia_tipo: str = "",
+        parametros: Optional[Dict] = None,
+        archivo_guardado: Optional[str] = None
+    ):
+        self.nombre = nombre
+        self._rgb = _array_colores(colores)
+        self.origen_imagen_path = origen_imagen_path
+        self.armonia_tipo = armonia_tipo
+        # El diccionario de parámetros se crea al primer acceso: la mayoría de paletas no tiene
+        self._parametros = parametros or None
+        self.archivo_guardado = archivo_guardado
+
+    @property
+    def colores(self) -> ColoresPaleta:
+        return ColoresPaleta(self)
+
+    @colores.setter
+    def colores(self, colores) -> None:
+        self._rgb = _array_colores(colores)
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """Colores como array uint8 (N, 3), de solo lectura (para cambiarlos, asignar `colores`)."""
+        vista = self._rgb.view()
+        vista.flags.writeable = False
+        return vista
+
+    @property
+    def parametros(self) -> Dict:
+        if self._parametros is None:
+            self._parametros = {}
+        return self._parametros
+
+    @parametros.setter
+    def parametros(self, parametros: Optional[Dict]) -> None:
+        self._parametros = parametros
+
+    @property
+    def pesos(self) -> Optional[List[float]]:
+        """Proporción de píxeles de cada color, si la paleta viene de una extracción detallada."""
+        return self._parametros.get('pesos') if self._parametros else None
+
+    def __eq__(self, otra) -> bool:
+        if not isinstance(otra, Paleta):
+            return NotImplemented
+        return (self.nombre == otra.nombre and np.array_equal(self._rgb, otra._rgb)
+                and self.origen_imagen_path == otra.origen_imagen_path and self.armonia_tipo == otra.armonia_tipo
+                and (self._parametros or {}) == (otra._parametros or {})
+                and self.archivo_guardado == otra.archivo_guardado)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Paleta(nombre={self.nombre!r}, colores={self.colores!r}, "
+                f"origen_imagen_path={self.origen_imagen_path!r}, armonia_tipo={self.armonia_tipo!r}, "
+                f"parametros={self.parametros!r}, archivo_guardado={self.archivo_guardado!r})")
+
+    def __getstate__(self):
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__}
+
+    def __setstate__(self, estado):
+        for nombre, valor in estado.items():
+            setattr(self, nombre, valor)
 
     def to_dict(self) -> Dict:
         """Serializa la paleta a un diccionario JSON-serializable."""
         return {
             'nombre': self.nombre,
-            'colores': [list(c) for c in self.colores],  # convertir tuplas a listas para JSON
+            'colores': self._rgb.tolist(),  # listas de ints para JSON
             'origen_imagen_path': self.origen_imagen_path,
             'armonia_tipo': self.armonia_tipo,
             'parametros': self.parametros,
@@ -26,67 +184,68 @@ class Paleta:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Paleta':
         """Crea una instancia de Paleta a partir de un diccionario (p. ej. cargado de JSON)."""
-        nombre = data.get('nombre', '')
-        colores_raw = data.get('colores', [])
-        # Convertir listas internas a tuplas
-        colores = [tuple(c) for c in colores_raw]
-        origen = data.get('origen_imagen_path', '')
-        armonia = data.get('armonia_tipo', '')
-        parametros = data.get('parametros', {}) or {}
-        archivo = data.get('archivo_guardado')
-        paleta = cls(
-            nombre=nombre,
-            colores=colores,
-            origen_imagen_path=origen,
-            armonia_tipo=armonia,
-            parametros=parametros,
-            archivo_guardado=archivo,
-        )
+        paleta = cls.__new__(cls)
+        paleta.nombre = data.get('nombre', '')
+        # Las listas del JSON pasan directamente al array, sin convertirlas antes a tuplas
+        paleta._rgb = _array_colores(data.get('colores', []), exigir_tuplas=False)
+        paleta.origen_imagen_path = data.get('origen_imagen_path', '')
+        paleta.armonia_tipo = data.get('armonia_tipo', '')
+        paleta._parametros = data.get('parametros') or None
+        paleta.archivo_guardado = data.get('archivo_guardado')
         return paleta
 
-    def apply_hsv_shift(self, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0, val_offset_pct: float = 0.0) -> None:
-       
-        if not self.colores:
-            return
-        nuevos = adjust_palette_hsv(self.colores, hue_shift_deg, sat_offset_pct, val_offset_pct)
-        self.colores = nuevos
-        # Registrar en parámetros
-        self.parametros['hsv_shift'] = {
+    @classmethod
+    def from_dicts(cls, datos: List[Dict]) -> List['Paleta']:
+        """
+        Como from_dict sobre muchas paletas (p. ej. una colección), pero con los colores de
+        todas convertidos y validados en un solo array: cada paleta guarda una vista de su
+        tramo, sin array ni validación propios.
+        """
+        datos = list(datos)
+        listas = [d.get('colores', []) for d in datos]
+        todos = _array_colores([c for colores in listas for c in colores], exigir_tuplas=False)
+        fin = np.cumsum([len(colores) for colores in listas])
+        paletas = []
+        inicio = 0
+        for data, f in zip(datos, fin.tolist()):
+            paleta = cls.__new__(cls)
+            paleta.nombre = data.get('nombre', '')
+            paleta._rgb = todos[inicio:f]
+            paleta.origen_imagen_path = data.get('origen_imagen_path', '')
+            paleta.armonia_tipo = data.get('armonia_tipo', '')
+            paleta._parametros = data.get('parametros') or None
+            paleta.archivo_guardado = data.get('archivo_guardado')
+            paletas.append(paleta)
+            inicio = f
+        return paletas
+
+    def _registrar_hsv_shift(self, parametros: Dict, hue_shift_deg: float, sat_offset_pct: float,
+                             val_offset_pct: float) -> None:
+        parametros['hsv_shift'] = {
             'hue_shift_deg': hue_shift_deg,
             'sat_offset_pct': sat_offset_pct,
             'val_offset_pct': val_offset_pct,
         }
 
+    def apply_hsv_shift(self, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0, val_offset_pct: float = 0.0) -> None:
+
+        if not len(self._rgb):
+            return
+        # Mismo ajuste que adjust_palette_hsv, directamente sobre el array
+        self._rgb = adjust_hsv_array(self._rgb, hue_shift_deg, sat_offset_pct, val_offset_pct)
+        # Registrar en parámetros
+        self._registrar_hsv_shift(self.parametros, hue_shift_deg, sat_offset_pct, val_offset_pct)
+
     def with_hsv_shift(self, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0, val_offset_pct: float = 0.0) -> 'Paleta':
-       
-        nuevos = adjust_palette_hsv(self.colores, hue_shift_deg, sat_offset_pct, val_offset_pct)
+
         nuevos_parametros = dict(self.parametros)
-        nuevos_parametros['hsv_shift'] = {
-            'hue_shift_deg': hue_shift_deg,
-            'sat_offset_pct': sat_offset_pct,
-            'val_offset_pct': val_offset_pct,
-        }
+        self._registrar_hsv_shift(nuevos_parametros, hue_shift_deg, sat_offset_pct, val_offset_pct)
         nueva = Paleta(
             nombre=f"{self.nombre} (HSV shift)",
-            colores=nuevos,
+            colores=adjust_hsv_array(self._rgb, hue_shift_deg, sat_offset_pct, val_offset_pct),
             origen_imagen_path=self.origen_imagen_path,
             armonia_tipo=self.armonia_tipo,
             parametros=nuevos_parametros,
             archivo_guardado=None,
         )
         return nueva
-
-    def __post_init__(self):
-        # Validaciones básicas de colores
-        validated = []
-        for c in self.colores:
-            if (not isinstance(c, tuple)) or len(c) != 3:
-                raise ValueError(f"Color inválido en Paleta: {c}")
-            r, g, b = c
-            if not all(isinstance(ch, int) and 0 <= ch <= 255 for ch in (r, g, b)):
-                raise ValueError(f"Valores de color deben ser ints en 0-255: {c}")
-            validated.append((r, g, b))
-        self.colores = validated
-        # Inicializar parámetros si no existe
-        if self.parametros is None:
-            self.parametros = {}
\ No newline at end of file
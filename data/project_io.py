@@ -1,7 +1,16 @@
 
 import json
-from typing import List
+import os
+import re
+from typing import Dict, Iterable, Iterator, List
 from data.models import Paleta
+from data.coleccion import PaletteCollection
+
+# Caracteres que se leen de cada vez al recorrer una colección por partes (se amplía si una
+# sola paleta no cabe)
+TAMANO_LECTURA = 1 << 16
+
+_ESPACIOS = re.compile(r'[ \t\n\r]*')
 
 def guardar_paleta_a_archivo(paleta: Paleta, path: str) -> None:
     
@@ -33,9 +42,151 @@ def cargar_coleccion_paletas(path: str) -> List[Paleta]:
    
     with open(path, 'r', encoding='utf-8') as f:
         data_list = json.load(f)
-    paletas = []
-    for data in data_list:
-        pal = Paleta.from_dict(data)
-        # No asignamos archivo_guardado individual aquí salvo que se decida
-        paletas.append(pal)
-    return paletas
+    # Colores de todas las paletas validados de una vez. No asignamos archivo_guardado
+    # individual aquí salvo que se decida
+    return Paleta.from_dicts(data_list)
+
+def cargar_coleccion_columnar(path: str) -> PaletteCollection:
+    """Como cargar_coleccion_paletas, pero en una PaletteCollection (sin crear objetos Paleta)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return PaletteCollection.from_dicts(json.load(f))
+
+def _iterar_elementos(path: str, tamano_lectura: int = TAMANO_LECTURA) -> Iterator[Dict]:
+    """
+    Elementos de un archivo con un array JSON de objetos, de uno en uno: solo se mantiene en
+    memoria el bloque leído y el objeto en curso, nunca el archivo completo.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos = '', 0
+        estado = 'inicio'  # inicio -> primero -> (elemento <-> separador)
+        while True:
+            pos = _ESPACIOS.match(buffer, pos).end()
+            if pos == len(buffer):
+                buffer, pos = f.read(tamano_lectura), 0
+                if not buffer:
+                    raise ValueError(f"Colección JSON incompleta: {path}")
+                continue
+            caracter = buffer[pos]
+            if estado == 'inicio':
+                if caracter != '[':
+                    raise ValueError(f"El archivo no contiene una colección (array JSON): {path}")
+                pos += 1
+                estado = 'primero'
+            elif caracter == ']' and estado in ('primero', 'separador'):
+                return
+            elif estado == 'separador':
+                if caracter != ',':
+                    raise ValueError(f"JSON no válido en {path}: se esperaba ',' o ']', got {caracter!r}")
+                pos += 1
+                estado = 'elemento'
+            else:
+                try:
+                    elemento, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Objeto partido entre dos bloques: añadir otro (al menos tan grande como lo
+                    # pendiente, para que una paleta enorme no se intente decodificar muchas veces)
+                    bloque = f.read(max(tamano_lectura, len(buffer) - pos))
+                    if not bloque:
+                        raise
+                    buffer, pos = buffer[pos:] + bloque, 0
+                    continue
+                yield elemento
+                estado = 'separador'
+
+def iterar_coleccion_paletas(path: str, tamano_lectura: int = TAMANO_LECTURA) -> Iterator[Paleta]:
+    """
+    Paletas de una colección (formato de guardar_coleccion_paletas, indentado o compacto) de
+    una en una, sin cargar el archivo entero: la memoria no depende del tamaño de la colección.
+    """
+    for data in _iterar_elementos(path, tamano_lectura):
+        yield Paleta.from_dict(data)
+
+_CODIFICADOR_ESCALARES = json.JSONEncoder(ensure_ascii=False)
+
+# Un color de la lista 'colores' tal como lo escribe json.dump(..., indent=2) dentro de la colección
+_COLOR_INDENTADO = '      [\n        %d,\n        %d,\n        %d\n      ]'
+
+def _elemento_indentado(data: Dict) -> str:
+    """
+    Texto de una paleta como elemento del array de json.dump(lista, indent=2), idéntico byte
+    a byte. El codificador de json con indent es Python puro y lento con los colores (un
+    número por línea), así que la lista de colores se formatea directamente.
+    """
+    campos = []
+    for clave, valor in data.items():
+        if clave == 'colores':
+            texto = '[\n' + ',\n'.join(_COLOR_INDENTADO % tuple(c) for c in valor) + '\n    ]' if valor else '[]'
+        elif isinstance(valor, (dict, list)) and valor:
+            texto = json.dumps(valor, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+        else:
+            # Escalares y contenedores vacíos se escriben igual con y sin indent (sin indent, en C)
+            texto = _CODIFICADOR_ESCALARES.encode(valor)
+        campos.append(f'    {json.dumps(clave, ensure_ascii=False)}: {texto}')
+    return '{\n' + ',\n'.join(campos) + '\n  }' if campos else '{}'
+
+class EscritorColeccion:
+    """
+    Escribe una colección de paletas de forma incremental: cada escribir() serializa una
+    paleta y la añade al archivo. Por defecto el resultado es idéntico byte a byte al de
+    guardar_coleccion_paletas (indent=2); con compacto=True se omiten espacios y saltos de
+    línea. Se escribe en `path + '.tmp'`, que sustituye a `path` al salir del bloque with (o
+    con cerrar()): hasta entonces el archivo anterior sigue intacto, así que se puede
+    escribir una colección sobre sí misma mientras se lee. Si sale por una excepción el
+    temporal se borra y `path` no cambia.
+
+        with EscritorColeccion(path) as escritor:
+            for paleta in paletas:
+                escritor.escribir(paleta)
+    """
+
+    def __init__(self, path: str, compacto: bool = False):
+        self.path = path
+        self.compacto = compacto
+        self.n_paletas = 0
+        self._temporal = path + '.tmp'
+        self._f = open(self._temporal, 'w', encoding='utf-8')
+        self._f.write('[')
+
+    def escribir(self, paleta: Paleta) -> None:
+        self.escribir_dict(paleta.to_dict())
+
+    def escribir_dict(self, data: Dict) -> None:
+        """Añade un elemento ya serializado (un diccionario como los de Paleta.to_dict)."""
+        if self.compacto:
+            texto = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+            self._f.write(texto if self.n_paletas == 0 else ',' + texto)
+        else:
+            self._f.write(('\n  ' if self.n_paletas == 0 else ',\n  ') + _elemento_indentado(data))
+        self.n_paletas += 1
+
+    def cerrar(self) -> None:
+        if not self._f.closed:
+            self._f.write('\n]' if self.n_paletas and not self.compacto else ']')
+            self._f.close()
+            os.replace(self._temporal, self.path)
+
+    def descartar(self) -> None:
+        """Abandona la escritura: borra el temporal y deja `path` como estaba."""
+        if not self._f.closed:
+            self._f.close()
+            os.remove(self._temporal)
+
+    def __enter__(self) -> 'EscritorColeccion':
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+def guardar_coleccion_paletas_incremental(paletas: Iterable[Paleta], path: str, compacto: bool = False) -> int:
+    """
+    Como guardar_coleccion_paletas, pero consumiendo `paletas` (p. ej. un generador) de una
+    en una sin construir la lista de diccionarios. Devuelve el número de paletas escritas.
+    """
+    with EscritorColeccion(path, compacto=compacto) as escritor:
+        for paleta in paletas:
+            escritor.escribir(paleta)
+    return escritor.n_paletas
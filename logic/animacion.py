@@ -0,0 +1,129 @@
+from PIL import Image, ImageSequence
+import numpy as np
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from logic.clustering import (
+    N_COLORES_AUTO, centros_a_colores, puntos_imagen, reducir_rgb, seleccionar_n_colores_puntos, validar_opciones
+)
+from logic.color_spaces import a_rgb, desde_rgb
+from logic.kmeans import asignar_centros, kmeans
+
+# Bits por canal del histograma con el que se compara cada fotograma con el último agrupado
+BITS_HISTOGRAMA_CAMBIO = 4
+
+# Cambio entre histogramas (variación total, de 0 a 1) por debajo del cual un fotograma
+# reutiliza la paleta del último fotograma agrupado
+UMBRAL_CAMBIO = 0.02
+
+# Cambio a partir del cual se considera un corte de escena: la paleta se recalcula desde cero
+# (con reinicios) en lugar de arrancar en caliente desde la anterior
+UMBRAL_CORTE = 0.5
+
+Fuente = Union[str, Image.Image, Iterable[Union[str, Image.Image]]]
+
+
+def iterar_fotogramas(fuente: Fuente) -> Iterator[Image.Image]:
+    """
+    Fotogramas de una ruta o imagen (GIF, APNG o WebP animados; una imagen fija es un solo
+    fotograma) o de un iterable de imágenes o rutas. Cada fotograma solo es válido hasta
+    pedir el siguiente.
+    """
+    if isinstance(fuente, str):
+        with Image.open(fuente) as img:
+            yield from ImageSequence.Iterator(img)
+    elif isinstance(fuente, Image.Image):
+        yield from ImageSequence.Iterator(fuente)
+    else:
+        for fotograma in fuente:
+            if isinstance(fotograma, str):
+                with Image.open(fotograma) as img:
+                    yield img
+            else:
+                yield fotograma
+
+
+def _histograma_cambio(arr: np.ndarray) -> np.ndarray:
+    # Histograma normalizado de colores cuantizados a BITS_HISTOGRAMA_CAMBIO bits por canal
+    bits = BITS_HISTOGRAMA_CAMBIO
+    q = arr.reshape(-1, 3) >> (8 - bits)
+    claves = (q[:, 0].astype(np.int32) << (2 * bits)) | (q[:, 1].astype(np.int32) << bits) | q[:, 2]
+    conteos = np.bincount(claves, minlength=1 << (3 * bits)).astype(np.float64)
+    return conteos / conteos.sum()
+
+
+def _emparejar(anteriores: np.ndarray, nuevos: np.ndarray) -> np.ndarray:
+    """Reordena `nuevos` para que el centro i sea el más cercano posible al centro anterior i (voraz)."""
+    d = ((anteriores[:, None, :] - nuevos[None, :, :]) ** 2).sum(axis=2)
+    orden = np.empty(anteriores.shape[0], dtype=np.intp)
+    for _ in range(anteriores.shape[0]):
+        i, j = np.unravel_index(np.argmin(d), d.shape)
+        orden[i] = j
+        d[i, :] = np.inf
+        d[:, j] = np.inf
+    return nuevos[orden]
+
+
+def _proporciones(X: np.ndarray, pesos: Optional[np.ndarray], centros: np.ndarray) -> np.ndarray:
+    etiquetas, _ = asignar_centros(X, centros)
+    conteos = np.bincount(etiquetas, weights=pesos, minlength=centros.shape[0])
+    return conteos / conteos.sum()
+
+
+def paletas_fotogramas(
+    fuente: Fuente,
+    n_colors: Union[int, str] = 5,
+    max_size: int = 200,
+    mode: str = 'sample',
+    quant_bits: int = 5,
+    sampler: str = 'stratified',
+    color_space: str = 'rgb',
+    umbral_cambio: float = UMBRAL_CAMBIO,
+    umbral_corte: float = UMBRAL_CORTE,
+    token=None
+) -> Iterator[Tuple[int, List[Tuple[int, int, int]], np.ndarray]]:
+    """
+    Paleta de cada fotograma de una animación o secuencia, como generador de
+    (índice del fotograma, colores, proporción de píxeles de cada color).
+
+    El primer fotograma se agrupa con el k-means de NumPy completo (o con la selección
+    automática de k si n_colors='auto'; ese k se mantiene en toda la secuencia) y sus colores
+    se ordenan de más a menos dominante. Cada fotograma siguiente arranca en caliente desde
+    los centroides del último agrupado, así que converge en pocas iteraciones y el color i
+    sigue siendo el mismo color a lo largo de la animación. Si el histograma reducido apenas
+    cambia (menos de `umbral_cambio`) se reutiliza la paleta sin agrupar; si cambia más de
+    `umbral_corte` (corte de escena) se agrupa desde cero y los colores nuevos se emparejan
+    con los anteriores para conservar el orden.
+    """
+    validar_opciones('numpy', mode, sampler, color_space, n_colors)
+    centros = None  # Centroides del último fotograma agrupado, en el espacio de agrupamiento
+    histograma_ref = None
+    colores, proporciones = None, None
+    for indice, fotograma in enumerate(iterar_fotogramas(fuente)):
+        if token is not None:
+            token.comprobar()
+        reducido = reducir_rgb(fotograma, max_size)
+        histograma = _histograma_cambio(np.asarray(reducido))
+        cambio = 1.0 if histograma_ref is None else 0.5 * float(np.abs(histograma - histograma_ref).sum())
+        if cambio >= umbral_cambio:
+            puntos, pesos = puntos_imagen(reducido, False, max_size, mode, quant_bits, sampler)
+            X = desde_rgb(puntos, color_space)
+            if centros is None:
+                if n_colors == N_COLORES_AUTO:
+                    seleccion = seleccionar_n_colores_puntos(puntos, pesos, color_space, token=token)
+                    centros = desde_rgb(np.asarray(seleccion.colores, dtype=np.float64), color_space)
+                else:
+                    centros = kmeans(X, min(n_colors, X.shape[0]), sample_weight=pesos, token=token).centros
+                # Orden inicial por dominancia; después cada índice conserva su color
+                centros = centros[np.argsort(-_proporciones(X, pesos, centros), kind='stable')]
+            elif X.shape[0] >= centros.shape[0]:
+                k = centros.shape[0]
+                if cambio >= umbral_corte:
+                    nuevos = kmeans(X, k, sample_weight=pesos, token=token).centros
+                    centros = _emparejar(centros, nuevos)
+                else:
+                    centros = kmeans(X, k, sample_weight=pesos, token=token, centros_iniciales=centros).centros
+            # Con menos puntos que colores (fotograma casi liso en modo histograma) se conservan
+            # los centroides y solo se recalculan las proporciones
+            colores = centros_a_colores(a_rgb(centros, color_space))
+            proporciones = _proporciones(X, pesos, centros)
+            histograma_ref = histograma
+        yield indice, colores, proporciones
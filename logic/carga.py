@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from PIL import Image
+from typing import Tuple
+from logic.decoding import abrir_reducida
+from logic.preview import COMPLETA_MAX_SIZE
+
+# Lado máximo de la miniatura que se muestra (la etiqueta mide 300 px; margen para HiDPI)
+VISTA_MAX_SIZE = 600
+
+# Lado máximo del proxy de análisis (el max_size por defecto de la extracción de colores)
+ANALISIS_MAX_SIZE = 200
+
+
+@dataclass
+class ImagenCargada:
+    """
+    Imagen decodificada una sola vez y compartida en memoria por sus consumidores:
+    `base` es la decodificación reducida (lado entre COMPLETA_MAX_SIZE y ~2x, o la imagen
+    original si es menor) de la que parte la vista previa; `miniatura` (lado <= VISTA_MAX_SIZE)
+    es la que se muestra y `analisis` (lado <= ANALISIS_MAX_SIZE) la que se agrupa. La versión
+    a resolución completa no se conserva; `size` es su tamaño original.
+    """
+    path: str
+    size: Tuple[int, int]
+    base: Image.Image
+    miniatura: Image.Image
+    analisis: Image.Image
+
+
+def _reducir_a(img: Image.Image, max_size: int) -> Image.Image:
+    if max(img.size) <= max_size:
+        return img
+    try:
+        resample_filter = Image.Resampling.LANCZOS
+    except AttributeError:
+        resample_filter = Image.LANCZOS
+    reducida = img.copy()
+    # thumbnail promedia por bloques (reduce) antes del LANCZOS: barato incluso desde la base
+    reducida.thumbnail((max_size, max_size), resample_filter)
+    return reducida
+
+
+def cargar_imagen(path: str, max_size_base: int = COMPLETA_MAX_SIZE, max_size_miniatura: int = VISTA_MAX_SIZE,
+                  max_size_analisis: int = ANALISIS_MAX_SIZE, token=None) -> ImagenCargada:
+    """
+    Decodifica la imagen una vez, ya reducida (draft JPEG o promedio por bloques de las
+    franjas, ver abrir_reducida), y deriva de esa base la miniatura y el proxy de análisis
+    sin volver a leer el archivo. El reescalado fino de la base al tamaño de la vista previa
+    se deja a VistaPrevia, que se construye en su propio hilo.
+    """
+    with Image.open(path) as probe:
+        size = probe.size
+    base, _ = abrir_reducida(path, max_size_base, margen=1.0, token=token)
+    if token is not None:
+        token.comprobar()
+    miniatura = _reducir_a(base, max_size_miniatura)
+    analisis = _reducir_a(miniatura, max_size_analisis)
+    return ImagenCargada(path=path, size=size, base=base, miniatura=miniatura, analisis=analisis)
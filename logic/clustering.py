@@ -1,52 +1,54 @@
 
 from PIL import Image
+import time
 import numpy as np
-from sklearn.cluster import KMeans
-from typing import List, Tuple
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from logic.kmeans import asignar_centros, barrido_kmeans
+from logic.motores import MOTORES, llamar_motor
+from logic.sampling import SAMPLERS, muestrear, muestreo_reservorio
+from logic.decoding import abrir_proxy, iterar_franjas_rgb
+from logic.color_spaces import ESPACIOS, a_rgb, desde_rgb
 
 
-def extraer_colores_dominantes(
-    img: Image.Image,
-    n_colors: int = 5,
-    resize_for_speed: bool = True,
-    max_size: int = 200
-) -> List[Tuple[int, int, int]]:
-   
-    # Convertir a RGB
-    img_rgb = img.convert('RGB')
-    # Redimensionar para velocidad si procede
-    if resize_for_speed:
-        w, h = img_rgb.size
-        max_dim = max(w, h)
-        if max_dim > max_size:
-            scale = max_size / max_dim
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            # Seleccionar filtro de resampling: Pillow>=9 usa Image.Resampling.LANCZOS
-            try:
-                resample_filter = Image.Resampling.LANCZOS
-            except AttributeError:
-                # Pillow<9
-                resample_filter = Image.LANCZOS if hasattr(Image, 'LANCZOS') else Image.ANTIALIAS
-            img_rgb = img_rgb.resize((new_w, new_h), resample_filter)
-    # Obtener datos de píxeles
-    arr = np.array(img_rgb)  # shape (H, W, 3)
-    pixels = arr.reshape(-1, 3).astype(float)
-    # Si hay menos píxeles que n_colors, retornar los únicos
-    if pixels.shape[0] < n_colors:
-        unique = np.unique(pixels, axis=0)
-        colores = [tuple(map(int, u)) for u in unique]
-        return colores
-    # KMeans
-    num_pixels = pixels.shape[0]
-    if num_pixels > 10000:
-        idx = np.random.choice(num_pixels, 10000, replace=False)
-        sample = pixels[idx]
-    else:
-        sample = pixels
-    kmeans = KMeans(n_clusters=n_colors, random_state=42, n_init=10)
-    kmeans.fit(sample)
-    centers = kmeans.cluster_centers_
+# Número máximo de píxeles que se agrupan en modo 'sample'
+MAX_MUESTRAS = 10000
+
+# Valor de n_colors que activa la selección automática, y rango de k que se evalúa
+N_COLORES_AUTO = 'auto'
+K_MIN_AUTO = 2
+K_MAX_AUTO = 16
+CRITERIOS_K = ('silhouette', 'elbow')
+
+# Píxeles por bloque en la asignación completa a centroides (acota la matriz k x bloque)
+PIXELES_POR_BLOQUE = 65536
+
+def histograma_cuantizado(pixels: np.ndarray, bits: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Histograma de color cuantizado a `bits` por canal sobre píxeles uint8 (N, 3).
+    Devuelve (color medio de cada bin ocupado, número de píxeles del bin).
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"bits debe estar entre 1 y 8, got {bits}")
+    pixels = np.asarray(pixels, dtype=np.uint8).reshape(-1, 3)
+    shift = 8 - bits
+    # Empaquetar RGB cuantizado en una sola clave entera
+    q = pixels >> shift
+    claves = (q[:, 0].astype(np.int64) << (2 * bits)) | (q[:, 1].astype(np.int64) << bits) | q[:, 2]
+    n_bins = 1 << (3 * bits)
+    conteos = np.bincount(claves, minlength=n_bins)
+    ocupados = np.flatnonzero(conteos)
+    # El representante de cada bin es la media real de sus píxeles, no el centro del bin
+    medios = np.empty((ocupados.size, 3), dtype=np.float64)
+    for canal in range(3):
+        medios[:, canal] = np.bincount(claves, weights=pixels[:, canal], minlength=n_bins)[ocupados]
+    medios /= conteos[ocupados, None]
+    return medios, conteos[ocupados].astype(np.float64)
+
+
+def centros_a_colores(centers: np.ndarray) -> List[Tuple[int, int, int]]:
+    """Centroides RGB (float) a colores (r, g, b) enteros en 0-255."""
     colores = []
     for center in centers:
         r, g, b = center
@@ -54,3 +56,388 @@ def extraer_colores_dominantes(
         r = max(0, min(r, 255)); g = max(0, min(g, 255)); b = max(0, min(b, 255))
         colores.append((r, g, b))
     return colores
+
+
+def puntos_imagen(img: Image.Image, resize_for_speed: bool, max_size: int, mode: str, quant_bits: int,
+                  sampler: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Píxeles a agrupar (muestra o medias de bins del histograma) y sus pesos (None en modo muestra)."""
+    # Convertir a RGB y redimensionar para velocidad si procede
+    img_rgb = reducir_rgb(img, max_size) if resize_for_speed else img.convert('RGB')
+    # Obtener datos de píxeles
+    arr = np.array(img_rgb)  # shape (H, W, 3)
+    if mode == 'histogram':
+        # Todos los píxeles, agrupados en bins cuantizados y ponderados por su población
+        return histograma_cuantizado(arr.reshape(-1, 3), bits=quant_bits)
+    # Muestreo reproducible con su propio Generator (no usa el estado global de NumPy)
+    return muestrear(arr, MAX_MUESTRAS, sampler=sampler, rng=np.random.default_rng(42)), None
+
+
+def reducir_rgb(img: Image.Image, max_size: int) -> Image.Image:
+    """Copia RGB de la imagen con el lado mayor limitado a max_size (LANCZOS)."""
+    img_rgb = img.convert('RGB')
+    w, h = img_rgb.size
+    max_dim = max(w, h)
+    if max_dim > max_size:
+        scale = max_size / max_dim
+        new_w = int(w * scale)
+        new_h = int(h * scale)
+        # Seleccionar filtro de resampling: Pillow>=9 usa Image.Resampling.LANCZOS
+        try:
+            resample_filter = Image.Resampling.LANCZOS
+        except AttributeError:
+            # Pillow<9
+            resample_filter = Image.LANCZOS if hasattr(Image, 'LANCZOS') else Image.ANTIALIAS
+        img_rgb = img_rgb.resize((new_w, new_h), resample_filter)
+    return img_rgb
+
+
+def extraer_colores_dominantes(
+    img: Image.Image,
+    n_colors: Union[int, str] = 5,
+    resize_for_speed: bool = True,
+    max_size: int = 200,
+    engine: str = 'numpy',
+    mode: str = 'sample',
+    quant_bits: int = 5,
+    sampler: str = 'stratified',
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    color_space: str = 'rgb',
+    token=None,
+    agrupador: Optional[Callable[..., List[Tuple[int, int, int]]]] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    Colores dominantes de la imagen. `color_space` ('rgb', 'oklab' o 'lab') es el espacio en
+    el que se agrupan los píxeles; en OKLab/CIELAB las distancias euclídeas siguen mejor la
+    diferencia percibida, y los centroides se devuelven convertidos a sRGB dentro de gamut.
+    Con n_colors='auto' el número de colores se elige como en seleccionar_n_colores.
+    `token` (objeto con comprobar()) permite cancelar la extracción desde otro hilo y
+    `agrupador` sustituye a agrupar_puntos, como en extraer_colores_dominantes_archivo.
+    """
+    validar_opciones(engine, mode, sampler, color_space, n_colors)
+    puntos, pesos = puntos_imagen(img, resize_for_speed, max_size, mode, quant_bits, sampler)
+    return (agrupador or agrupar_puntos)(puntos, pesos, n_colors, engine, n_jobs=n_jobs, executor=executor,
+                                         color_space=color_space, token=token)
+
+
+def agrupar_puntos(
+    puntos: np.ndarray,
+    pesos: Optional[np.ndarray],
+    n_colors: Union[int, str] = 5,
+    engine: str = 'numpy',
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    color_space: str = 'rgb',
+    token=None
+) -> List[Tuple[int, int, int]]:
+    """
+    Etapa de agrupamiento de la extracción, separada de la decodificación: `puntos` son píxeles
+    RGB muestreados (pesos=None) o las medias de los bins del histograma con su población.
+    Solo necesita los arrays, así que puede ejecutarse en otro proceso (ver async_tasks.procesos).
+    """
+    if pesos is None:
+        return _agrupar_muestra(puntos, n_colors, engine, n_jobs=n_jobs, executor=executor,
+                                color_space=color_space, token=token)
+    if n_colors == N_COLORES_AUTO:
+        return seleccionar_n_colores_puntos(puntos, pesos, color_space, token=token).colores
+    if puntos.shape[0] <= n_colors:
+        return centros_a_colores(puntos)
+    centers = llamar_motor(engine, desde_rgb(puntos, color_space), n_colors, pesos, n_jobs=n_jobs,
+                           executor=executor, token=token)
+    return centros_a_colores(a_rgb(centers, color_space))
+
+
+def validar_opciones(engine: str, mode: str, sampler: str, color_space: str = 'rgb',
+                     n_colors: Union[int, str] = 5) -> None:
+    """Lanza ValueError si alguna opción de extracción no es válida (para validar antes de lanzar trabajos)."""
+    if engine not in MOTORES:
+        raise ValueError(f"Motor de clustering no soportado: {engine}")
+    if n_colors == N_COLORES_AUTO:
+        # El barrido de k con arranque en caliente es propio del k-means de NumPy
+        if engine != 'numpy':
+            raise ValueError(f"n_colors='auto' solo está disponible con engine='numpy', got {engine}")
+    elif not isinstance(n_colors, (int, np.integer)) or n_colors < 1:
+        raise ValueError(f"n_colors debe ser un entero positivo o 'auto', got {n_colors!r}")
+    if mode not in ('sample', 'histogram'):
+        raise ValueError(f"Modo de extracción no soportado: {mode}")
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Estrategia de muestreo no soportada: {sampler}")
+    if color_space not in ESPACIOS:
+        raise ValueError(f"Espacio de color no soportado: {color_space}")
+
+
+def _agrupar_muestra(sample: np.ndarray, n_colors: Union[int, str], engine: str,
+                     n_jobs: Optional[int] = None, executor: Optional[Executor] = None,
+                     color_space: str = 'rgb', token=None) -> List[Tuple[int, int, int]]:
+    if n_colors == N_COLORES_AUTO:
+        return seleccionar_n_colores_puntos(sample, None, color_space, token=token).colores
+    # Si hay menos píxeles que n_colors, retornar los únicos
+    if sample.shape[0] < n_colors:
+        unique = np.unique(sample.astype(float), axis=0)
+        colores = [tuple(map(int, u)) for u in unique]
+        return colores
+    # KMeans en el espacio de color elegido
+    pixels = desde_rgb(sample, color_space)
+    centers = llamar_motor(engine, pixels, n_colors, n_jobs=n_jobs, executor=executor, token=token)
+    return centros_a_colores(a_rgb(centers, color_space))
+
+
+@dataclass
+class SeleccionNColores:
+    """
+    Resultado de la selección automática del número de colores: k elegido, su paleta y, para
+    cada k evaluado, la puntuación del criterio (mayor es mejor) y la inercia.
+    """
+    n_colors: int
+    colores: List[Tuple[int, int, int]]
+    ks: List[int]
+    puntuaciones: List[float]
+    inercias: List[float]
+    criterio: str
+
+
+def _puntuaciones_codo(inercias: List[float]) -> List[float]:
+    # Método del codo (kneedle): distancia de la curva de inercia normalizada a la recta que une
+    # sus extremos; el codo es el k donde la curva se separa más de esa recta.
+    y = np.asarray(inercias, dtype=np.float64)
+    if y.size < 3 or y[0] <= y[-1]:
+        return [0.0] * y.size
+    x = np.linspace(0.0, 1.0, y.size)
+    y = (y - y[-1]) / (y[0] - y[-1])
+    return [float(v) for v in (1.0 - x) - y]
+
+
+def seleccionar_n_colores_puntos(puntos: np.ndarray, pesos: Optional[np.ndarray], color_space: str,
+                                 k_min: int = K_MIN_AUTO, k_max: int = K_MAX_AUTO,
+                                 criterio: str = 'silhouette', token=None) -> SeleccionNColores:
+    """Como seleccionar_n_colores, sobre puntos RGB (y sus pesos) ya extraídos de la imagen."""
+    if criterio not in CRITERIOS_K:
+        raise ValueError(f"Criterio de selección de k no soportado: {criterio}")
+    distintos = np.unique(np.asarray(puntos, dtype=np.float64), axis=0)
+    if distintos.shape[0] <= k_min:
+        # Nada que elegir: la paleta son los colores presentes
+        colores = centros_a_colores(distintos)
+        return SeleccionNColores(n_colors=len(colores), colores=colores, ks=[], puntuaciones=[],
+                                 inercias=[], criterio=criterio)
+    # Con más k que colores distintos solo se obtendrían centros repetidos
+    k_max = min(k_max, distintos.shape[0])
+    resultados, siluetas = barrido_kmeans(desde_rgb(puntos, color_space), k_min=k_min, k_max=k_max,
+                                          sample_weight=pesos, token=token)
+    inercias = [r.inercia for r in resultados]
+    puntuaciones = siluetas if criterio == 'silhouette' else _puntuaciones_codo(inercias)
+    # En empate gana el k más pequeño
+    mejor = int(np.argmax(puntuaciones))
+    colores = centros_a_colores(a_rgb(resultados[mejor].centros, color_space))
+    return SeleccionNColores(
+        n_colors=k_min + mejor,
+        colores=colores,
+        ks=list(range(k_min, k_max + 1)),
+        puntuaciones=[float(p) for p in puntuaciones],
+        inercias=inercias,
+        criterio=criterio,
+    )
+
+
+def seleccionar_n_colores(
+    img: Image.Image,
+    k_min: int = K_MIN_AUTO,
+    k_max: int = K_MAX_AUTO,
+    criterio: str = 'silhouette',
+    resize_for_speed: bool = True,
+    max_size: int = 200,
+    mode: str = 'sample',
+    quant_bits: int = 5,
+    sampler: str = 'stratified',
+    color_space: str = 'rgb'
+) -> SeleccionNColores:
+    """
+    Evalúa k = k_min..k_max sobre una única muestra (o histograma) de la imagen y elige el
+    número de colores por silueta simplificada ('silhouette') o por el codo de la inercia
+    ('elbow'). Cada k arranca de los centroides del anterior (ver barrido_kmeans).
+    """
+    validar_opciones('numpy', mode, sampler, color_space)
+    puntos, pesos = puntos_imagen(img, resize_for_speed, max_size, mode, quant_bits, sampler)
+    return seleccionar_n_colores_puntos(puntos, pesos, color_space, k_min=k_min, k_max=k_max, criterio=criterio)
+
+
+def extraer_colores_dominantes_archivo(
+    path: str,
+    n_colors: Union[int, str] = 5,
+    max_size: int = 200,
+    engine: str = 'numpy',
+    mode: str = 'sample',
+    quant_bits: int = 5,
+    sampler: str = 'stratified',
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    color_space: str = 'rgb',
+    token=None,
+    agrupador: Optional[Callable[..., List[Tuple[int, int, int]]]] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    Variante por ruta para imágenes muy grandes: decodifica en modo draft (JPEG) o por
+    franjas (TIFF/BMP/PPM sin comprimir) y nunca mantiene una copia RGB a resolución completa.
+    Con sampler='reservoir' (y mode='sample') muestrea directamente el flujo de franjas a
+    resolución completa en lugar de la versión reducida.
+    `agrupador` sustituye a agrupar_puntos (misma firma) para ejecutar el agrupamiento en
+    otro lugar, p. ej. BackendProcesos.agrupar.
+    """
+    validar_opciones(engine, mode, sampler, color_space, n_colors)
+    puntos, pesos = puntos_archivo(path, max_size=max_size, mode=mode, quant_bits=quant_bits, sampler=sampler,
+                                   token=token)
+    return (agrupador or agrupar_puntos)(puntos, pesos, n_colors, engine, n_jobs=n_jobs, executor=executor,
+                                         color_space=color_space, token=token)
+
+
+def puntos_archivo(path: str, max_size: int = 200, mode: str = 'sample', quant_bits: int = 5,
+                   sampler: str = 'stratified', token=None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Etapa de decodificación de extraer_colores_dominantes_archivo: (puntos, pesos) para agrupar_puntos."""
+    if sampler == 'reservoir' and mode == 'sample':
+        franjas = _comprobando(token, (franja for _, franja in iterar_franjas_rgb(path)))
+        return muestreo_reservorio(franjas, MAX_MUESTRAS, np.random.default_rng(42)), None
+    proxy = abrir_proxy(path, max_size=max_size, token=token)
+    return puntos_imagen(proxy, True, max_size, mode, quant_bits, sampler)
+
+
+def _comprobando(token, bloques: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    # Consulta el token antes de decodificar cada franja del flujo
+    for bloque in bloques:
+        if token is not None:
+            token.comprobar()
+        yield bloque
+
+
+@dataclass
+class ResultadoExtraccion:
+    """
+    Paleta extraída con su población: número de píxeles de la imagen completa asignados a
+    cada color y distancia media (euclídea, en RGB) de esos píxeles a su color.
+    """
+    colores: List[Tuple[int, int, int]]
+    conteos: np.ndarray
+    distancia_media: np.ndarray
+
+    @property
+    def pesos(self) -> np.ndarray:
+        """Proporción de píxeles de cada color (suma 1)."""
+        total = self.conteos.sum()
+        return self.conteos / total if total else np.zeros(len(self.colores))
+
+    def ordenado(self) -> 'ResultadoExtraccion':
+        """Copia con los colores ordenados de más a menos dominante."""
+        orden = np.argsort(-self.conteos, kind='stable')
+        return ResultadoExtraccion(
+            colores=[self.colores[i] for i in orden],
+            conteos=self.conteos[orden],
+            distancia_media=self.distancia_media[orden],
+        )
+
+    def a_parametros(self) -> Dict:
+        """Datos JSON-serializables para guardar en Paleta.parametros."""
+        return {
+            'pesos': [float(p) for p in self.pesos],
+            'conteos': [int(c) for c in self.conteos],
+            'distancia_media': [float(d) for d in self.distancia_media],
+        }
+
+
+def contar_poblaciones(
+    bloques: Iterable[np.ndarray],
+    colores: List[Tuple[int, int, int]],
+    tamano_bloque: int = PIXELES_POR_BLOQUE,
+    token=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Asigna cada píxel del flujo al color más cercano, por bloques de `tamano_bloque`
+    píxeles, de modo que la memoria no depende del tamaño de la imagen.
+    Devuelve (conteos por color, distancia media por color).
+    """
+    centros = np.asarray(colores, dtype=np.float64)
+    k = centros.shape[0]
+    conteos = np.zeros(k, dtype=np.int64)
+    sumas = np.zeros(k, dtype=np.float64)
+    for bloque in bloques:
+        pixels = bloque.reshape(-1, 3)
+        for i in range(0, pixels.shape[0], tamano_bloque):
+            if token is not None:
+                token.comprobar()
+            etiquetas, dist2 = asignar_centros(pixels[i:i + tamano_bloque], centros)
+            conteos += np.bincount(etiquetas, minlength=k)
+            sumas += np.bincount(etiquetas, weights=np.sqrt(dist2), minlength=k)
+    medias = np.divide(sumas, conteos, out=np.zeros(k), where=conteos > 0)
+    return conteos, medias
+
+
+def _bloques_imagen(img: Image.Image, tamano_bloque: int) -> Iterator[np.ndarray]:
+    # Franjas de filas convertidas a RGB por separado: nunca se copia la imagen entera
+    w, h = img.size
+    filas = max(1, tamano_bloque // max(w, 1))
+    for y0 in range(0, h, filas):
+        yield np.asarray(img.crop((0, y0, w, min(y0 + filas, h))).convert('RGB'))
+
+
+def extraer_paleta_detallada(
+    img: Image.Image,
+    n_colors: int = 5,
+    tamano_bloque: int = PIXELES_POR_BLOQUE,
+    **opciones
+) -> ResultadoExtraccion:
+    """
+    Como extraer_colores_dominantes (acepta las mismas opciones), pero además cuenta la
+    población de cada color sobre la imagen a resolución completa.
+    """
+    colores = extraer_colores_dominantes(img, n_colors=n_colors, **opciones)
+    conteos, medias = contar_poblaciones(_bloques_imagen(img, tamano_bloque), colores, tamano_bloque,
+                                         token=opciones.get('token'))
+    return ResultadoExtraccion(colores=colores, conteos=conteos, distancia_media=medias)
+
+
+def extraer_paleta_detallada_archivo(
+    path: str,
+    n_colors: int = 5,
+    tamano_bloque: int = PIXELES_POR_BLOQUE,
+    **opciones
+) -> ResultadoExtraccion:
+    """Variante por ruta: las poblaciones se cuentan sobre el flujo de franjas a resolución completa."""
+    colores = extraer_colores_dominantes_archivo(path, n_colors=n_colors, **opciones)
+    franjas = (franja for _, franja in iterar_franjas_rgb(path))
+    conteos, medias = contar_poblaciones(franjas, colores, tamano_bloque, token=opciones.get('token'))
+    return ResultadoExtraccion(colores=colores, conteos=conteos, distancia_media=medias)
+
+
+@dataclass
+class MetricasMotor:
+    """Tiempo de extracción y error medio de reconstrucción (distancia RGB de cada píxel a su color)."""
+    motor: str
+    colores: List[Tuple[int, int, int]]
+    segundos: float
+    error_medio: float
+
+
+def comparar_motores(
+    img: Image.Image,
+    n_colors: int = 5,
+    motores: Optional[Iterable[str]] = None,
+    **opciones
+) -> List[MetricasMotor]:
+    """
+    Extrae la paleta con cada motor del registro (o los indicados) y mide su tiempo y el error
+    medio de reconstrucción de la imagen completa con esa paleta. Sin `motores`, se omiten los
+    que dependen de paquetes opcionales no instalados.
+    """
+    resultados = []
+    todos = motores is None
+    for motor in (list(MOTORES) if todos else motores):
+        t0 = time.perf_counter()
+        try:
+            colores = extraer_colores_dominantes(img, n_colors=n_colors, engine=motor, **opciones)
+        except ImportError:
+            # Motores con dependencias opcionales (sklearn) se omiten si no están instalados
+            if not todos:
+                raise
+            continue
+        segundos = time.perf_counter() - t0
+        conteos, medias = contar_poblaciones(_bloques_imagen(img, PIXELES_POR_BLOQUE), colores)
+        error = float(np.dot(conteos, medias) / max(conteos.sum(), 1))
+        resultados.append(MetricasMotor(motor=motor, colores=colores, segundos=segundos, error_medio=error))
+    return resultados
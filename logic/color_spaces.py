@@ -0,0 +1,187 @@
+import numpy as np
+from typing import Optional
+
+# Espacios de color admitidos para el clustering (color_space=...)
+ESPACIOS = ('rgb', 'oklab', 'lab')
+
+# sRGB lineal -> XYZ (D65), y blanco de referencia D65 para CIELAB
+_RGB_A_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_A_RGB = np.linalg.inv(_RGB_A_XYZ)
+_BLANCO_D65 = np.array([0.95047, 1.0, 1.08883])
+
+# Matrices de OKLab (Björn Ottosson, 2020), desde sRGB lineal
+_RGB_A_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_A_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+_OKLAB_A_LMS = np.array([
+    [1.0, 0.3963377774, 0.2158037573],
+    [1.0, -0.1055613458, -0.0638541728],
+    [1.0, -0.0894841775, -1.2914855480],
+])
+_LMS_A_RGB = np.array([
+    [4.0767416621, -3.3077115913, 0.2309699292],
+    [-1.2684380046, 2.6097574011, -0.3413193965],
+    [-0.0041960863, -0.7034186147, 1.7076147010],
+])
+
+# Constantes CIELAB (valores exactos de la CIE)
+_LAB_EPSILON = 216.0 / 24389.0
+_LAB_KAPPA = 24389.0 / 27.0
+
+
+def _lut_srgb_a_lineal() -> np.ndarray:
+    v = np.arange(256, dtype=np.float64) / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+# Para entradas uint8 la decodificación sRGB es una simple tabla de 256 entradas
+_LUT_LINEAL = _lut_srgb_a_lineal()
+
+
+def srgb_a_lineal(rgb: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """sRGB en 0-255 (uint8 o float) -> RGB lineal en [0, 1]."""
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        return _LUT_LINEAL.astype(dtype)[rgb]
+    v = rgb.astype(dtype) / dtype(255.0)
+    return np.where(v <= 0.04045, v / dtype(12.92), ((np.maximum(v, 0) + dtype(0.055)) / dtype(1.055)) ** dtype(2.4))
+
+
+def lineal_a_srgb(lin: np.ndarray) -> np.ndarray:
+    """RGB lineal -> sRGB en 0-255 (float). Recorta al gamut [0, 1] antes de codificar."""
+    lin = np.clip(lin, 0.0, 1.0)
+    dtype = lin.dtype.type
+    v = np.where(lin <= 0.0031308, lin * dtype(12.92), dtype(1.055) * lin ** dtype(1 / 2.4) - dtype(0.055))
+    return v * dtype(255.0)
+
+
+def _aplicar_matriz(arr: np.ndarray, m: np.ndarray) -> np.ndarray:
+    return arr @ m.T.astype(arr.dtype)
+
+
+# Píxeles por bloque en la ruta uint8: 3 canales float32 de este tamaño caben en caché L2
+PIXELES_POR_BLOQUE = 1 << 15
+
+# Lab como transformación afín de f = (fx, fy, fz): L = 116 fy - 16, a = 500 (fx - fy), b = 200 (fy - fz)
+_F_A_LAB = np.array([
+    [0.0, 116.0, 0.0],
+    [500.0, -500.0, 0.0],
+    [0.0, 200.0, -200.0],
+])
+_F_A_LAB_OFFSET = np.array([-16.0, 0.0, 0.0])
+
+
+def _f_lab(t: np.ndarray) -> np.ndarray:
+    return np.where(t > _LAB_EPSILON, np.cbrt(t), (_LAB_KAPPA * t + 16.0) / 116.0).astype(t.dtype)
+
+
+def _convertir_uint8(rgb: np.ndarray, m1: np.ndarray, no_lineal, m2: np.ndarray,
+                     offset: Optional[np.ndarray], dtype) -> np.ndarray:
+    """
+    Ruta rápida para colores uint8: sRGB -> lineal por tabla, m1, función no lineal, m2 (+ offset).
+
+    Se procesa por bloques en disposición planar (3, m): los `np.take` sobre la tabla de 256
+    entradas y las matrices 3x3 trabajan sobre filas contiguas que caben en caché, en lugar
+    de pasar varias veces por arrays intermedios (N, 3) del tamaño de toda la imagen.
+    """
+    forma = rgb.shape
+    pixels = rgb.reshape(-1, 3)
+    n = pixels.shape[0]
+    lut = _LUT_LINEAL.astype(dtype)
+    m1 = m1.astype(dtype)
+    m2 = m2.astype(dtype)
+    salida = np.empty((n, 3), dtype=dtype)
+    lineal = np.empty((3, min(n, PIXELES_POR_BLOQUE)), dtype=dtype)
+    intermedio = np.empty_like(lineal)
+    for i in range(0, n, PIXELES_POR_BLOQUE):
+        bloque = pixels[i:i + PIXELES_POR_BLOQUE]
+        m = bloque.shape[0]
+        lin = lineal[:, :m]
+        tmp = intermedio[:, :m]
+        for c in range(3):
+            np.take(lut, bloque[:, c], out=lin[c])
+        np.matmul(m1, lin, out=tmp)
+        tmp[...] = no_lineal(tmp)
+        np.matmul(m2, tmp, out=lin)
+        if offset is not None:
+            lin += offset.astype(dtype)[:, None]
+        salida[i:i + m] = lin.T
+    return salida.reshape(forma[:-1] + (3,))
+
+
+def rgb_a_oklab(rgb: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Colores sRGB (..., 3) en 0-255 -> OKLab (L en [0, 1])."""
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        return _convertir_uint8(rgb, _RGB_A_LMS, np.cbrt, _LMS_A_OKLAB, None, dtype)
+    lms = _aplicar_matriz(srgb_a_lineal(rgb, dtype), _RGB_A_LMS)
+    return _aplicar_matriz(np.cbrt(lms), _LMS_A_OKLAB)
+
+
+def oklab_a_rgb(lab: np.ndarray) -> np.ndarray:
+    """OKLab (..., 3) -> sRGB en 0-255 (float), recortando los colores fuera de gamut."""
+    lab = np.asarray(lab)
+    if lab.dtype.kind != 'f':
+        lab = lab.astype(np.float64)
+    lms_ = _aplicar_matriz(lab, _OKLAB_A_LMS)
+    return lineal_a_srgb(_aplicar_matriz(lms_ * lms_ * lms_, _LMS_A_RGB))
+
+
+def rgb_a_lab(rgb: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Colores sRGB (..., 3) en 0-255 -> CIELAB D65 (L en [0, 100])."""
+    rgb = np.asarray(rgb)
+    m1 = _RGB_A_XYZ / _BLANCO_D65[:, None]
+    if rgb.dtype == np.uint8:
+        return _convertir_uint8(rgb, m1, _f_lab, _F_A_LAB, _F_A_LAB_OFFSET, dtype)
+    f = _f_lab(_aplicar_matriz(srgb_a_lineal(rgb, dtype), m1))
+    return (_aplicar_matriz(f, _F_A_LAB) + _F_A_LAB_OFFSET).astype(f.dtype)
+
+
+def lab_a_rgb(lab: np.ndarray) -> np.ndarray:
+    """CIELAB D65 (..., 3) -> sRGB en 0-255 (float), recortando los colores fuera de gamut."""
+    lab = np.asarray(lab)
+    if lab.dtype.kind != 'f':
+        lab = lab.astype(np.float64)
+    fy = (lab[..., 0] + 16.0) / 116.0
+    fx = fy + lab[..., 1] / 500.0
+    fz = fy - lab[..., 2] / 200.0
+    f = np.stack([fx, fy, fz], axis=-1)
+    f3 = f * f * f
+    xyz = np.where(f3 > _LAB_EPSILON, f3, (116.0 * f - 16.0) / _LAB_KAPPA)
+    # Para Y se usa la definición por L, como en la norma
+    L = lab[..., 0]
+    xyz[..., 1] = np.where(L > _LAB_KAPPA * _LAB_EPSILON, f3[..., 1], L / _LAB_KAPPA)
+    return lineal_a_srgb(_aplicar_matriz(xyz.astype(lab.dtype), _XYZ_A_RGB * _BLANCO_D65[None, :]))
+
+
+def desde_rgb(rgb: np.ndarray, espacio: str) -> np.ndarray:
+    """Convierte colores sRGB (0-255) al espacio indicado ('rgb' devuelve float sin cambios)."""
+    if espacio == 'rgb':
+        return np.asarray(rgb, dtype=np.float64)
+    if espacio == 'oklab':
+        return rgb_a_oklab(rgb)
+    if espacio == 'lab':
+        return rgb_a_lab(rgb)
+    raise ValueError(f"Espacio de color no soportado: {espacio}")
+
+
+def a_rgb(valores: np.ndarray, espacio: str) -> np.ndarray:
+    """Inversa de desde_rgb: devuelve sRGB en 0-255 (float) dentro de gamut."""
+    if espacio == 'rgb':
+        return np.clip(np.asarray(valores, dtype=np.float64), 0.0, 255.0)
+    if espacio == 'oklab':
+        return oklab_a_rgb(valores)
+    if espacio == 'lab':
+        return lab_a_rgb(valores)
+    raise ValueError(f"Espacio de color no soportado: {espacio}")
@@ -1,37 +1,140 @@
+import numpy as np
+from typing import Tuple, List, Union
 
-import colorsys
-from typing import Tuple, List
+Offset = Union[float, np.ndarray]
+
+
+_UINT8_A_UNIDAD = np.arange(256, dtype=np.float64) / 255.0
+
+# Componente (0 = v, 1 = q, 2 = p, 3 = t) que toma cada canal (filas r, g, b) en cada sector
+# i = 0..5 de colorsys.hsv_to_rgb; la columna 6 es la de los grises, que toman v
+_SECTORES = np.array([
+    [0, 1, 2, 2, 3, 0, 0],
+    [3, 0, 0, 1, 2, 2, 0],
+    [2, 2, 3, 0, 0, 1, 0],
+])
+
+
+def _rgb_a_hsv_canales(rgb: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Con uint8 la división se toma de una tabla de 256 valores (los mismos float64 de x / 255.0)
+    rgb = np.asarray(rgb)
+    c = _UINT8_A_UNIDAD[rgb] if rgb.dtype == np.uint8 else rgb.astype(np.float64) / 255.0
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    rangec = maxc - minc
+    gris = minc == maxc
+    # Evitar divisiones por cero en los grises; su h y s se fijan a 0 más abajo
+    den = np.where(gris, 1.0, rangec)
+    s = np.where(gris, 0.0, rangec / np.where(gris, 1.0, maxc))
+    rc = (maxc - r) / den
+    gc = (maxc - g) / den
+    bc = (maxc - b) / den
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gris, 0.0, np.mod(h / 6.0, 1.0))
+    return h, s, maxc
+
+
+def rgb_to_hsv_array(rgb: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de colorsys.rgb_to_hsv para colores (..., 3) en 0-255 (uint8 o float).
+    Devuelve HSV float64 en [0, 1] con las mismas operaciones, en el mismo orden, que colorsys,
+    de modo que el resultado es idéntico bit a bit al de rgb_to_hsv_tuple.
+    """
+    return np.stack(_rgb_a_hsv_canales(rgb), axis=-1)
+
+
+def _hsv_canales_a_rgb_255(h: np.ndarray, s: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # colorsys.hsv_to_rgb vectorizado sobre h, s y v por separado, escalado a 0-255 sin redondear
+    h, s, v = np.broadcast_arrays(np.mod(h, 1.0), np.clip(s, 0.0, 1.0), np.clip(v, 0.0, 1.0))
+    i = (h * 6.0).astype(np.int64)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = np.where(s == 0.0, 6, i % 6)
+    # Cada canal se toma del candidato de su sector con un solo indexado (en vez de np.choose
+    # y np.where por canal): mismos valores, menos pasadas sobre el array
+    candidatos = np.stack([v.ravel(), q.ravel(), p.ravel(), t.ravel()])
+    rgb = candidatos[_SECTORES[:, i.ravel()], np.arange(i.size)]
+    rgb *= 255
+    return rgb.T.reshape(h.shape + (3,))
+
+
+def _hsv_a_rgb_255(hsv: np.ndarray) -> np.ndarray:
+    # colorsys.hsv_to_rgb vectorizado, escalado a 0-255 sin redondear
+    hsv = np.asarray(hsv, dtype=np.float64)
+    return _hsv_canales_a_rgb_255(hsv[..., 0], hsv[..., 1], hsv[..., 2])
+
+
+def _redondear_255(rgb: np.ndarray) -> np.ndarray:
+    # Como int(round(x)) con recorte a 0-255: np.round también redondea la mitad al par
+    return np.clip(np.round(rgb), 0, 255).astype(np.uint8)
+
+
+def hsv_to_rgb_array(hsv: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de hsv_to_rgb_tuple para (..., 3) HSV en [0, 1]: normaliza h con
+    módulo 1, recorta s y v a [0, 1] y redondea como round() (mitad al par). Devuelve uint8.
+    """
+    return _redondear_255(_hsv_a_rgb_255(hsv))
+
+
+def adjust_hsv_array_float(
+    colors: np.ndarray,
+    hue_shift_deg: Offset = 0.0,
+    sat_offset_pct: Offset = 0.0,
+    val_offset_pct: Offset = 0.0
+) -> np.ndarray:
+    """
+    Como adjust_hsv_array pero sin redondear: devuelve float64 en 0-255. Sirve para construir
+    tablas (LUT) que luego se interpolan, donde redondear cada nodo añadiría error.
+    """
+    colors = np.asarray(colors)
+    h, s, v = _rgb_a_hsv_canales(colors)
+    hue_shift_deg = np.asarray(hue_shift_deg, dtype=np.float64)
+    sat_offset_pct = np.asarray(sat_offset_pct, dtype=np.float64)
+    val_offset_pct = np.asarray(val_offset_pct, dtype=np.float64)
+    v_new = np.clip(v + val_offset_pct / 100.0, 0.0, 1.0)
+    ajustados = _hsv_canales_a_rgb_255(
+        np.mod(h + hue_shift_deg / 360.0, 1.0),
+        np.clip(s + sat_offset_pct / 100.0, 0.0, 1.0),
+        v_new,
+    )
+    gris = s == 0.0
+    if gris.any():
+        # Grises: el matiz y la saturación no se aplican (seguirían siendo gris); con
+        # val_offset se devuelve el gris con el nuevo brillo y si no, el color original
+        nuevo_gris = np.broadcast_to(v_new, gris.shape) * 255
+        con_valor = np.broadcast_to(val_offset_pct != 0.0, gris.shape)
+        originales = np.clip(colors, 0, 255).astype(np.float64)
+        ajustados[gris] = np.where(con_valor[gris, None], nuevo_gris[gris, None], originales[gris])
+    return ajustados
+
+
+def adjust_hsv_array(
+    colors: np.ndarray,
+    hue_shift_deg: Offset = 0.0,
+    sat_offset_pct: Offset = 0.0,
+    val_offset_pct: Offset = 0.0
+) -> np.ndarray:
+    """
+    Versión vectorizada de adjust_color_hsv para colores (N, 3) en 0-255. Los desplazamientos
+    pueden ser escalares o arrays (N,) para ajustar cada color con valores distintos.
+    Devuelve uint8 (N, 3), idéntico color a color a la versión por tuplas.
+    """
+    return _redondear_255(adjust_hsv_array_float(colors, hue_shift_deg, sat_offset_pct, val_offset_pct))
 
 
 def rgb_to_hsv_tuple(rgb: Tuple[int, int, int]) -> Tuple[float, float, float]:
- 
-    r, g, b = rgb
-    # Normalizar a [0,1]
-    r_norm = r / 255.0
-    g_norm = g / 255.0
-    b_norm = b / 255.0
-    # colorsys.rgb_to_hsv devuelve (h, s, v) en [0,1]
-    h, s, v = colorsys.rgb_to_hsv(r_norm, g_norm, b_norm)
+    # colorsys.rgb_to_hsv sobre r/255, g/255, b/255: devuelve (h, s, v) en [0,1]
+    h, s, v = rgb_to_hsv_array(np.array(rgb)).tolist()
     return h, s, v
 
 
 def hsv_to_rgb_tuple(hsv: Tuple[float, float, float]) -> Tuple[int, int, int]:
-   
-    h, s, v = hsv
-    # Garantizar rango [0,1]
-    h = h % 1.0
-    s = max(0.0, min(s, 1.0))
-    v = max(0.0, min(v, 1.0))
-    # colorsys.hsv_to_rgb devuelve valores en [0,1]
-    r_norm, g_norm, b_norm = colorsys.hsv_to_rgb(h, s, v)
-    # Convertir a 0-255 y redondear
-    r = int(round(r_norm * 255))
-    g = int(round(g_norm * 255))
-    b = int(round(b_norm * 255))
-    # Asegurar enteros en rango
-    r = max(0, min(r, 255))
-    g = max(0, min(g, 255))
-    b = max(0, min(b, 255))
+    # Garantiza rango [0,1], convierte a 0-255 y redondea
+    r, g, b = hsv_to_rgb_array(np.array(hsv, dtype=np.float64)).tolist()
     return r, g, b
 
 
@@ -41,36 +144,12 @@ def adjust_color_hsv(
     sat_offset_pct: float = 0.0,
     val_offset_pct: float = 0.0
 ) -> Tuple[int, int, int]:
-   
-    # Convertir RGB a HSV
-    h, s, v = rgb_to_hsv_tuple(color)
-    # Si saturación original es cero (gris), no aplicar cambios de matiz o saturación; solo aplicar val_offset si se desea?
-    # Según tests, para s==0 y sat_offset != 0, saturación permanece 0 y valor permanece igual.
-    if s == 0.0:
-        # Para val_offset, si se quisiera afectar brillo, pero tests sugieren no cambiar valor en prueba de saturación
-        # Solo aplicar val_offset si explicitado? Aquí asumimos que val_offset puede aplicarse, pero en caso de solo sat_offset, retornamos original.
-        if hue_shift_deg == 0.0 and val_offset_pct == 0.0:
-            return color
-        # Si hay hue_shift pero s==0, ignorar hue_shift (mantener gris)
-        # Si hay val_offset, aplicar cambio de valor: ajustar v_new y retornar gris con nuevo brillo
-        if val_offset_pct != 0.0:
-            v_new = max(0.0, min(v + val_offset_pct / 100.0, 1.0))
-            # Convertir gris con nuevo valor: RGB iguales a v_new*255
-            gray = int(round(v_new * 255))
-            return (gray, gray, gray)
-        # Si solo hue_shift pero s==0: mantener color original
-        return color
-    # Para colores no grises, proceder normalmente
-    # Ajustar matiz: convertir grados a fracción [0,1]
-    h_new = (h + hue_shift_deg / 360.0) % 1.0
-    # Ajustar saturación y valor: sumas normalizadas
-    s_new = s + sat_offset_pct / 100.0
-    v_new = v + val_offset_pct / 100.0
-    # Clamp s_new, v_new a [0,1]
-    s_new = max(0.0, min(s_new, 1.0))
-    v_new = max(0.0, min(v_new, 1.0))
-    # Convertir de vuelta a RGB
-    return hsv_to_rgb_tuple((h_new, s_new, v_new))
+    """
+    Desplaza matiz (grados) y suma offsets de saturación y valor (en %) a un color RGB.
+    Para grises (s == 0) no se aplican matiz ni saturación: solo val_offset, si lo hay.
+    """
+    r, g, b = adjust_hsv_array(np.array([color]), hue_shift_deg, sat_offset_pct, val_offset_pct)[0].tolist()
+    return r, g, b
 
 
 def adjust_palette_hsv(
@@ -79,10 +158,7 @@ def adjust_palette_hsv(
     sat_offset_pct: float = 0.0,
     val_offset_pct: float = 0.0
 ) -> List[Tuple[int, int, int]]:
-   
-    adjusted = []
-    for color in palette:
-        adjusted_color = adjust_color_hsv(color, hue_shift_deg, sat_offset_pct, val_offset_pct)
-        adjusted.append(adjusted_color)
-    return adjusted
-
+    if not palette:
+        return []
+    adjusted = adjust_hsv_array(np.array(palette), hue_shift_deg, sat_offset_pct, val_offset_pct)
+    return [tuple(c) for c in adjusted.tolist()]
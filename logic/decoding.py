@@ -0,0 +1,194 @@
+from PIL import Image
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+
+# Filas aproximadas por franja al decodificar en streaming (~24 MB por franja RGB de 32k px de ancho)
+FILAS_POR_FRANJA = 256
+
+
+def _bits_por_pixel(rawmode: str) -> Optional[int]:
+    # Solo se admiten rawmodes que coinciden con un modo de imagen válido
+    try:
+        muestra = Image.new(rawmode, (8, 1))
+    except Exception:
+        return None
+    return len(muestra.tobytes())
+
+
+def _dividir_tile_raw(tile, ancho: int, filas: int) -> Optional[List[Tuple[int, int, list]]]:
+    """Divide un tile 'raw' de ancho completo en sub-tiles de `filas` filas ajustando el offset."""
+    x0, y0, x1, y1 = tile.extents
+    if x0 != 0 or x1 != ancho:
+        return None
+    args = tile.args
+    if isinstance(args, str):
+        args = (args, 0, 1)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientacion = args[2] if len(args) > 2 else 1
+    if not stride:
+        bits = _bits_por_pixel(rawmode)
+        if bits is None:
+            return None
+        stride = (ancho * bits + 7) // 8
+    alto = y1 - y0
+    unidades = []
+    for fy0 in range(0, alto, filas):
+        fy1 = min(fy0 + filas, alto)
+        # Con orientación negativa (BMP) las filas están almacenadas de abajo a arriba
+        fila_archivo = fy0 if orientacion > 0 else alto - fy1
+        offset = tile.offset + fila_archivo * stride
+        sub = tile._replace(
+            extents=(0, 0, ancho, fy1 - fy0),
+            offset=offset,
+            args=(rawmode, stride, orientacion),
+        )
+        unidades.append((y0 + fy0, y0 + fy1, [sub]))
+    return unidades
+
+
+def _planificar_franjas(tiles: list, ancho: int, alto: int, filas: int) -> Optional[List[Tuple[int, int, list]]]:
+    """
+    Agrupa los tiles de la imagen en franjas horizontales decodificables por separado.
+    Devuelve None si la disposición de tiles no permite decodificar por franjas.
+    """
+    if len(tiles) == 1:
+        if tiles[0].codec_name != 'raw':
+            return None
+        return _dividir_tile_raw(tiles[0], ancho, filas)
+    # Varios tiles/strips: agrupar por fila de tiles
+    filas_tiles = {}
+    for t in tiles:
+        x0, y0, x1, y1 = t.extents
+        filas_tiles.setdefault((y0, y1), []).append(t)
+    unidades = []
+    siguiente_y = 0
+    for (y0, y1) in sorted(filas_tiles):
+        grupo = filas_tiles[(y0, y1)]
+        cubierto = sum(t.extents[2] - t.extents[0] for t in grupo)
+        if y0 != siguiente_y or cubierto != ancho:
+            return None
+        ajustados = [
+            t._replace(extents=(t.extents[0], 0, t.extents[2], y1 - y0)) for t in grupo
+        ]
+        unidades.append((y0, y1, ajustados))
+        siguiente_y = y1
+    if siguiente_y != alto:
+        return None
+    # Fusionar filas de tiles pequeñas hasta alcanzar ~`filas` filas por franja
+    franjas = []
+    for y0, y1, grupo in unidades:
+        if franjas and franjas[-1][1] - franjas[-1][0] < filas:
+            fy0, _, fgrupo = franjas[-1]
+            desplazados = [
+                t._replace(extents=(t.extents[0], t.extents[1] + (y0 - fy0), t.extents[2], t.extents[3] + (y0 - fy0)))
+                for t in grupo
+            ]
+            franjas[-1] = (fy0, y1, fgrupo + desplazados)
+        else:
+            franjas.append((y0, y1, grupo))
+    return franjas
+
+
+def iterar_franjas(path: str, filas: int = FILAS_POR_FRANJA, draft_size: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Genera (y0, franja) recorriendo la imagen de arriba a abajo en su modo nativo.
+    Los formatos raw/por strips se decodifican franja a franja sin cargar la imagen completa;
+    el resto se decodifica una vez (con draft JPEG si se indica `draft_size`) y se recorta por franjas.
+    """
+    with Image.open(path) as img:
+        ancho, alto = img.size
+        tiles = list(img.tile)
+        formato = img.format
+        plan = None
+        if formato != 'JPEG' and getattr(img, 'n_frames', 1) == 1:
+            plan = _planificar_franjas(tiles, ancho, alto, filas)
+        if plan is None:
+            if draft_size is not None and formato == 'JPEG':
+                # Decodificación reducida en el dominio DCT (escalas 1/2, 1/4, 1/8)
+                img.draft('RGB', draft_size)
+            img.load()
+            w, h = img.size
+            for y0 in range(0, h, filas):
+                yield y0, img.crop((0, y0, w, min(y0 + filas, h)))
+            return
+    for y0, y1, tiles_franja in plan:
+        with Image.open(path) as franja:
+            # Restringir la decodificación a los tiles de esta franja
+            franja.tile = tiles_franja
+            franja._size = (ancho, y1 - y0)
+            if hasattr(franja, '_tile_size'):
+                # TIFF reserva el buffer según _tile_size en lugar de size
+                franja._tile_size = franja._size
+            franja.load()
+            yield y0, franja
+
+
+def iterar_franjas_rgb(path: str, filas: int = FILAS_POR_FRANJA, draft_size: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """Como iterar_franjas, pero entrega cada franja convertida a un array uint8 (h, w, 3)."""
+    for y0, franja in iterar_franjas(path, filas=filas, draft_size=draft_size):
+        yield y0, np.asarray(franja.convert('RGB'))
+
+
+def abrir_proxy(path: str, max_size: int = 200, filas: int = FILAS_POR_FRANJA, token=None) -> Image.Image:
+    """
+    Devuelve una versión RGB de la imagen con lado mayor <= max_size sin materializar
+    nunca una copia RGB a resolución completa: las franjas se reducen por bloques a medida
+    que se decodifican y solo el mosaico reducido se reescala con LANCZOS al tamaño final.
+    `token` (objeto con comprobar()) se consulta entre franjas para poder cancelar la carga.
+    """
+    reducida, destino = abrir_reducida(path, max_size, margen=2.0, filas=filas, token=token)
+    if reducida.size != destino:
+        try:
+            resample_filter = Image.Resampling.LANCZOS
+        except AttributeError:
+            resample_filter = Image.LANCZOS
+        reducida = reducida.resize(destino, resample_filter)
+    return reducida
+
+
+def abrir_reducida(path: str, max_size: int, margen: float = 2.0, filas: int = FILAS_POR_FRANJA,
+                   token=None) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Primera etapa de abrir_proxy: decodifica (con draft JPEG) y promedia por bloques enteros
+    hasta quedar entre 1 y ~`margen` veces el tamaño destino, sin el reescalado final.
+    Devuelve (imagen RGB reducida, tamaño destino con lado mayor <= max_size).
+    """
+    with Image.open(path) as probe:
+        ancho, alto = probe.size
+    max_dim = max(ancho, alto)
+    if max_dim > max_size:
+        scale = max_size / max_dim
+        destino = (max(1, int(ancho * scale)), max(1, int(alto * scale)))
+    else:
+        destino = (ancho, alto)
+    # Reducir por bloques hasta ~margen x el destino y dejar el resto al reescalado (como reducing_gap de Pillow)
+    draft_size = (max(1, int(destino[0] * margen)), max(1, int(destino[1] * margen)))
+    partes = []
+    pendiente = None
+    factor = None
+    for _, franja in iterar_franjas(path, filas=filas, draft_size=draft_size):
+        if token is not None:
+            token.comprobar()
+        franja = franja.convert('RGB')
+        if factor is None:
+            # El ancho real de la franja refleja la escala ya aplicada por draft
+            factor = max(1, franja.width // draft_size[0])
+        if pendiente is not None:
+            unida = Image.new('RGB', (franja.width, pendiente.height + franja.height))
+            unida.paste(pendiente, (0, 0))
+            unida.paste(franja, (0, pendiente.height))
+            franja = unida
+            pendiente = None
+        util = (franja.height // factor) * factor
+        if util < franja.height:
+            pendiente = franja.crop((0, util, franja.width, franja.height))
+        if util:
+            # Promedio por bloques factor x factor (Image.reduce, en C)
+            ancho_util = (franja.width // factor) * factor
+            partes.append(np.asarray(franja.reduce(factor, box=(0, 0, ancho_util, util))))
+    # Las filas sobrantes (< factor) del final solo se conservan si no hubo ninguna franja útil
+    if pendiente is not None and not partes:
+        partes.append(np.asarray(pendiente))
+    return Image.fromarray(np.concatenate(partes, axis=0), 'RGB'), destino
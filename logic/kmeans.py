@@ -0,0 +1,302 @@
+import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class ResultadoKMeans:
+    """Resultado de un ajuste k-means: centroides, etiquetas por muestra, inercia e iteraciones."""
+    centros: np.ndarray
+    etiquetas: np.ndarray
+    inercia: float
+    n_iter: int
+
+
+def _asignar(Xt: np.ndarray, x_sq: np.ndarray, centros: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Asigna cada muestra a su centro más cercano. Devuelve (etiquetas, distancia² mínima).
+
+    Trabaja en float32 con disposición (k, n) y codifica el índice del centro en los bits
+    bajos de la mantisa: así el argmin se reduce a un `min` entero vectorizado, varias veces
+    más rápido que `argmin` sobre un eje corto. Con k <= 256 se pierden como mucho 8 de los
+    23 bits de mantisa, irrelevante para distancias entre colores.
+    """
+    k = centros.shape[0]
+    cf = centros.astype(np.float32)
+    d = (-2.0 * cf) @ Xt
+    d += (cf * cf).sum(axis=1)[:, None]
+    d += x_sq
+    np.maximum(d, 0.0, out=d)
+    if k == 1:
+        return np.zeros(Xt.shape[1], dtype=np.intp), d[0]
+    if k > 256:
+        etiquetas = d.argmin(axis=0)
+        return etiquetas, d[etiquetas, np.arange(Xt.shape[1])]
+    bits = int(k - 1).bit_length()
+    codigos = d.view(np.int32)
+    codigos &= np.int32(~((1 << bits) - 1))
+    codigos |= np.arange(k, dtype=np.int32)[:, None]
+    minimos = codigos.min(axis=0)
+    etiquetas = (minimos & ((1 << bits) - 1)).astype(np.intp)
+    minimos &= np.int32(~((1 << bits) - 1))
+    return etiquetas, minimos.view(np.float32)
+
+
+def asignar_centros(X: np.ndarray, centros: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centro más cercano de cada fila de X (n, d) y su distancia² (float32)."""
+    Xt = np.ascontiguousarray(np.asarray(X).T, dtype=np.float32)
+    x_sq = (Xt * Xt).sum(axis=0)
+    return _asignar(Xt, x_sq, np.asarray(centros, dtype=np.float64))
+
+
+def _kmeans_plusplus(X: np.ndarray, Xt: np.ndarray, x_sq: np.ndarray, n_clusters: int, rng: np.random.Generator,
+                     pesos: Optional[np.ndarray] = None, iniciales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Siembra k-means++ voraz (varios candidatos por paso), como la de scikit-learn. Con
+    `iniciales` se parte de esos centros y solo se siembran los que faltan hasta n_clusters.
+    """
+    n_samples = X.shape[0]
+    n_local_trials = 2 + int(np.log(n_clusters))
+    centros = np.empty((n_clusters, X.shape[1]), dtype=X.dtype)
+    if iniciales is not None:
+        inicio = iniciales.shape[0]
+        centros[:inicio] = iniciales
+    else:
+        inicio = 1
+        if pesos is None:
+            primero = rng.integers(n_samples)
+        else:
+            # Con pesos, el primer centro se elige con probabilidad proporcional al peso
+            acumulado = np.cumsum(pesos)
+            primero = min(int(np.searchsorted(acumulado, rng.random() * acumulado[-1])), n_samples - 1)
+        centros[0] = X[primero]
+    _, dist_min = _asignar(Xt, x_sq, centros[:inicio])
+    if pesos is not None:
+        dist_min = dist_min * pesos
+    potencial = float(dist_min.sum(dtype=np.float64))
+    for c in range(inicio, n_clusters):
+        if potencial <= 0.0:
+            # Todos los puntos coinciden con algún centro: repetir puntos al azar
+            centros[c] = X[rng.integers(n_samples)]
+            continue
+        valores = rng.random(n_local_trials) * potencial
+        candidatos = np.searchsorted(np.cumsum(dist_min, dtype=np.float64), valores)
+        np.clip(candidatos, None, n_samples - 1, out=candidatos)
+        cand = X[candidatos].astype(np.float32)
+        dist_cand = (-2.0 * cand) @ Xt
+        dist_cand += (cand * cand).sum(axis=1)[:, None]
+        dist_cand += x_sq
+        np.maximum(dist_cand, 0.0, out=dist_cand)
+        if pesos is not None:
+            # dist_min ya está ponderada, así que basta ponderar las de los candidatos
+            dist_cand *= pesos
+        np.minimum(dist_min[None, :], dist_cand, out=dist_cand)
+        potenciales = dist_cand.sum(axis=1, dtype=np.float64)
+        mejor = int(np.argmin(potenciales))
+        potencial = float(potenciales[mejor])
+        dist_min = dist_cand[mejor]
+        centros[c] = X[candidatos[mejor]]
+    return centros
+
+
+def _inercia(dist: np.ndarray, pesos: Optional[np.ndarray]) -> float:
+    if pesos is None:
+        return float(dist.sum(dtype=np.float64))
+    return float(np.dot(dist.astype(np.float64), pesos))
+
+
+def _lloyd(X: np.ndarray, Xc: np.ndarray, Xt: np.ndarray, x_sq: np.ndarray, centros: np.ndarray, max_iter: int, tol_abs: float, pesos: Optional[np.ndarray] = None, token=None) -> ResultadoKMeans:
+    n_clusters, n_dims = centros.shape
+    # Índices desplazados por canal para acumular las sumas de todos los canales en un solo bincount
+    desplazamientos = (np.arange(n_dims) * n_clusters)[:, None]
+    canales = Xc.ravel() if pesos is None else (Xc * pesos).ravel()
+    etiquetas = None
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        if token is not None:
+            token.comprobar()
+        nuevas, dist = _asignar(Xt, x_sq, centros)
+        if etiquetas is not None and np.array_equal(nuevas, etiquetas):
+            # Convergencia estricta: ninguna muestra cambió de cluster; la asignación ya es final
+            return ResultadoKMeans(centros=centros, etiquetas=nuevas, inercia=_inercia(dist, pesos), n_iter=n_iter)
+        etiquetas = nuevas
+        conteos = np.bincount(etiquetas, weights=pesos, minlength=n_clusters).astype(np.float64)
+        sumas = np.bincount(
+            (etiquetas[None, :] + desplazamientos).ravel(), weights=canales, minlength=n_clusters * n_dims
+        ).reshape(n_dims, n_clusters).T
+        nuevos = centros.copy()
+        ocupados = conteos > 0
+        nuevos[ocupados] = sumas[ocupados] / conteos[ocupados, None]
+        if not ocupados.all():
+            # Reubicar clusters vacíos en las muestras más alejadas de su centro actual
+            lejanas = np.argsort(dist)[::-1][: int((~ocupados).sum())]
+            nuevos[~ocupados] = X[lejanas]
+        desplazamiento = float(((nuevos - centros) ** 2).sum())
+        centros = nuevos
+        if desplazamiento <= tol_abs:
+            break
+    etiquetas, dist = _asignar(Xt, x_sq, centros)
+    return ResultadoKMeans(centros=centros, etiquetas=etiquetas, inercia=_inercia(dist, pesos), n_iter=n_iter)
+
+
+def _reinicio(X: np.ndarray, Xc: np.ndarray, Xt: np.ndarray, x_sq: np.ndarray, n_clusters: int,
+              semilla: np.random.SeedSequence, max_iter: int, tol_abs: float,
+              pesos: Optional[np.ndarray], token=None) -> ResultadoKMeans:
+    # Función de módulo (no closure) para poder enviarla también a un ProcessPoolExecutor
+    rng = np.random.default_rng(semilla)
+    centros = _kmeans_plusplus(X, Xt, x_sq, n_clusters, rng, pesos)
+    return _lloyd(X, Xc, Xt, x_sq, centros, max_iter, tol_abs, pesos, token)
+
+
+def _preparar_datos(X: np.ndarray, sample_weight: Optional[np.ndarray], tol: float):
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if X.ndim != 2:
+        raise ValueError(f"X debe ser una matriz (n_muestras, n_dims), got shape {X.shape}")
+    pesos = None
+    if sample_weight is not None:
+        pesos = np.ascontiguousarray(sample_weight, dtype=np.float64)
+        if pesos.shape != (X.shape[0],):
+            raise ValueError(f"sample_weight debe tener shape ({X.shape[0]},), got {pesos.shape}")
+        if (pesos < 0).any() or pesos.sum() <= 0:
+            raise ValueError("sample_weight debe ser no negativo y con suma positiva")
+    # Copias transpuestas: float32 para la asignación, float64 para acumular las medias
+    Xc = np.ascontiguousarray(X.T)
+    Xt = Xc.astype(np.float32)
+    x_sq = (Xt * Xt).sum(axis=0)
+    if pesos is None:
+        tol_abs = tol * float(np.mean(np.var(X, axis=0)))
+    else:
+        media = np.average(X, axis=0, weights=pesos)
+        tol_abs = tol * float(np.mean(np.average((X - media) ** 2, axis=0, weights=pesos)))
+    return X, Xc, Xt, x_sq, pesos, tol_abs
+
+
+def _recoger(futuros: list, token) -> List[ResultadoKMeans]:
+    # El token no viaja al pool (no siempre es serializable): se consulta entre reinicios y,
+    # si se cancela, se descartan los que aún no han empezado
+    resultados = []
+    try:
+        for futuro in futuros:
+            if token is not None:
+                token.comprobar()
+            resultados.append(futuro.result())
+    except BaseException:
+        for futuro in futuros:
+            futuro.cancel()
+        raise
+    return resultados
+
+
+def kmeans(
+    X: np.ndarray,
+    n_clusters: int,
+    n_init: int = 10,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: Optional[int] = 42,
+    sample_weight: Optional[np.ndarray] = None,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    token=None,
+    centros_iniciales: Optional[np.ndarray] = None,
+) -> ResultadoKMeans:
+    """
+    K-means vectorizado en NumPy (Lloyd + siembra k-means++).
+
+    `tol` es relativa a la varianza media de los datos, igual que en scikit-learn; cada
+    reinicio usa su propio Generator derivado de `random_state`, de modo que el resultado
+    es determinista y no depende del estado global de NumPy. `sample_weight` pondera cada
+    muestra (p. ej. el número de píxeles de un bin de histograma) en la siembra, las medias
+    y la inercia.
+
+    Los reinicios son independientes y pueden ejecutarse en paralelo: con `n_jobs` > 1 se
+    reparten en un ThreadPoolExecutor (las operaciones de NumPy liberan el GIL) y con
+    `executor` en el pool que se indique (hilos o procesos). Como cada reinicio tiene su
+    semilla fija y el desempate es por orden de reinicio, el resultado es idéntico al serie.
+
+    `token` es un token de cancelación opcional (cualquier objeto con comprobar(), que lanza
+    una excepción si el trabajo se ha cancelado); se consulta en cada iteración de Lloyd de
+    la ejecución en serie y antes de recoger cada reinicio de la paralela.
+
+    Con `centros_iniciales` (n_clusters, n_dims) no hay siembra ni reinicios: se hace un único
+    ajuste de Lloyd desde esos centros (arranque en caliente, p. ej. desde la paleta del
+    fotograma anterior) y el centro i del resultado procede del centro inicial i.
+    """
+    X, Xc, Xt, x_sq, pesos, tol_abs = _preparar_datos(X, sample_weight, tol)
+    if n_clusters < 1 or n_clusters > X.shape[0]:
+        raise ValueError(f"n_clusters={n_clusters} debe estar entre 1 y n_muestras={X.shape[0]}")
+    if centros_iniciales is not None:
+        centros = np.array(centros_iniciales, dtype=np.float64)
+        if centros.shape != (n_clusters, X.shape[1]):
+            raise ValueError(f"centros_iniciales debe tener shape ({n_clusters}, {X.shape[1]}), got {centros.shape}")
+        return _lloyd(X, Xc, Xt, x_sq, centros, max_iter, tol_abs, pesos, token)
+    semillas = np.random.SeedSequence(random_state).spawn(n_init)
+    args = (X, Xc, Xt, x_sq, n_clusters)
+    if executor is not None:
+        futuros = [executor.submit(_reinicio, *args, s, max_iter, tol_abs, pesos) for s in semillas]
+        resultados = _recoger(futuros, token)
+    elif n_jobs is not None and n_jobs > 1 and n_init > 1:
+        with ThreadPoolExecutor(max_workers=min(n_jobs, n_init)) as pool:
+            futuros = [pool.submit(_reinicio, *args, s, max_iter, tol_abs, pesos) for s in semillas]
+            resultados = _recoger(futuros, token)
+    else:
+        resultados = [_reinicio(*args, s, max_iter, tol_abs, pesos, token) for s in semillas]
+    mejor = None
+    for resultado in resultados:
+        # En empate se conserva el primer reinicio, para que el orden de ejecución no influya
+        if mejor is None or resultado.inercia < mejor.inercia:
+            mejor = resultado
+    return mejor
+
+
+def silueta_simplificada(Xt: np.ndarray, x_sq: np.ndarray, centros: np.ndarray, pesos: Optional[np.ndarray] = None) -> float:
+    """
+    Silueta simplificada (media ponderada de (b - a) / max(a, b)), con a y b las distancias de
+    cada muestra a su centro más cercano y al segundo más cercano. Cuesta una sola matriz k x n,
+    en vez de las n x n distancias entre muestras de la silueta exacta.
+    """
+    if centros.shape[0] < 2:
+        return 0.0
+    cf = centros.astype(np.float32)
+    d = (-2.0 * cf) @ Xt
+    d += (cf * cf).sum(axis=1)[:, None]
+    d += x_sq
+    np.maximum(d, 0.0, out=d)
+    dos = np.sqrt(np.partition(d, 1, axis=0)[:2])
+    a, b = dos[0], dos[1]
+    den = np.maximum(a, b)
+    s = np.divide(b - a, den, out=np.zeros_like(den), where=den > 0)
+    return float(np.average(s, weights=pesos))
+
+
+def barrido_kmeans(
+    X: np.ndarray,
+    k_min: int = 2,
+    k_max: int = 16,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: Optional[int] = 42,
+    sample_weight: Optional[np.ndarray] = None,
+    token=None,
+) -> Tuple[List[ResultadoKMeans], List[float]]:
+    """
+    Ajusta k-means para k = k_min..k_max sobre los mismos datos y devuelve los resultados y la
+    silueta simplificada de cada k. Cada k arranca de los centroides ya convergidos de k - 1
+    más un centro nuevo sembrado con k-means++, de modo que Lloyd converge en pocas
+    iteraciones y el barrido completo cuesta del orden de un ajuste con n_init reinicios.
+    """
+    X, Xc, Xt, x_sq, pesos, tol_abs = _preparar_datos(X, sample_weight, tol)
+    k_max = min(k_max, X.shape[0])
+    if k_min < 1 or k_min > k_max:
+        raise ValueError(f"Rango de k no válido: {k_min}..{k_max} con n_muestras={X.shape[0]}")
+    rng = np.random.default_rng(random_state)
+    resultados, siluetas = [], []
+    centros = None
+    for k in range(k_min, k_max + 1):
+        centros = _kmeans_plusplus(X, Xt, x_sq, k, rng, pesos, iniciales=centros)
+        resultado = _lloyd(X, Xc, Xt, x_sq, centros, max_iter, tol_abs, pesos, token)
+        centros = resultado.centros
+        resultados.append(resultado)
+        siluetas.append(silueta_simplificada(Xt, x_sq, centros, pesos))
+    return resultados, siluetas
@@ -0,0 +1,163 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from logic.clustering import validar_opciones, agrupar_puntos, puntos_archivo
+
+# Extensiones que se recogen al recorrer directorios
+EXTENSIONES_IMAGEN = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp', '.gif')
+
+# Trabajos enviados al pool por proceso: acota la memoria en vuelo (cada trabajo solo retiene
+# su proxy reducido) sin dejar a los procesos sin trabajo entre resultados
+EN_VUELO_POR_PROCESO = 2
+
+ETAPAS = ('decodificacion', 'clustering')
+
+
+def listar_imagenes(entradas: Iterable[str]) -> Iterator[str]:
+    """Rutas de imagen de las entradas: los directorios se recorren recursivamente, en orden."""
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for raiz, dirs, archivos in os.walk(entrada):
+                dirs.sort()
+                for nombre in sorted(archivos):
+                    if nombre.lower().endswith(EXTENSIONES_IMAGEN):
+                        yield os.path.join(raiz, nombre)
+        else:
+            yield entrada
+
+
+def leer_lista(path: str) -> Iterator[str]:
+    """Rutas de un archivo de texto, una por línea (se ignoran líneas vacías y las que empiezan por #)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea and not linea.startswith('#'):
+                yield linea
+
+
+def rutas_procesadas_jsonl(path: str) -> Set[str]:
+    """
+    Rutas con resultado correcto en un JSONL de una ejecución anterior. Las que fallaron se
+    vuelven a intentar, y una última línea incompleta (ejecución interrumpida) se ignora.
+    """
+    hechas = set()
+    if not os.path.exists(path):
+        return hechas
+    with open(path, 'r', encoding='utf-8') as f:
+        for linea in f:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                continue
+            if isinstance(registro, dict) and 'colores' in registro:
+                hechas.add(registro['path'])
+    return hechas
+
+
+def procesar_imagen(path: str, opciones: Dict) -> Dict:
+    """
+    Extrae la paleta de una imagen (como extraer_colores_dominantes_archivo) midiendo por
+    separado la decodificación y el clustering. Nunca lanza: los errores van en el registro.
+    """
+    tiempos = {}
+    try:
+        t0 = time.perf_counter()
+        puntos, pesos = puntos_archivo(path, max_size=opciones['max_size'], mode=opciones['mode'],
+                                       quant_bits=opciones['quant_bits'], sampler=opciones['sampler'])
+        t1 = time.perf_counter()
+        tiempos['decodificacion'] = t1 - t0
+        colores = agrupar_puntos(puntos, pesos, opciones['n_colors'], opciones['engine'],
+                                 color_space=opciones['color_space'])
+        tiempos['clustering'] = time.perf_counter() - t1
+    except Exception as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}", 'tiempos': tiempos}
+    return {'path': path, 'colores': [list(c) for c in colores], 'tiempos': tiempos}
+
+
+@dataclass
+class InformeLote:
+    """Resumen de una ejecución: imágenes procesadas, errores, omitidas y tiempos por etapa (s)."""
+    procesadas: int = 0
+    errores: int = 0
+    omitidas: int = 0
+    segundos: float = 0.0
+    tiempos: Dict[str, float] = field(default_factory=lambda: {etapa: 0.0 for etapa in ETAPAS})
+
+    @property
+    def imagenes_por_segundo(self) -> float:
+        return self.procesadas / self.segundos if self.segundos > 0 else 0.0
+
+    def registrar(self, registro: Dict) -> None:
+        self.procesadas += 1
+        if 'error' in registro:
+            self.errores += 1
+        for etapa, t in registro.get('tiempos', {}).items():
+            self.tiempos[etapa] = self.tiempos.get(etapa, 0.0) + t
+
+    def resumen(self) -> str:
+        lineas = [f"{self.procesadas} imágenes en {self.segundos:.2f} s: {self.imagenes_por_segundo:.1f} img/s "
+                  f"(errores: {self.errores}, omitidas: {self.omitidas})"]
+        for etapa, total in self.tiempos.items():
+            media = 1000.0 * total / self.procesadas if self.procesadas else 0.0
+            lineas.append(f"  {etapa}: {total:.2f} s en total, {media:.1f} ms por imagen")
+        return "\n".join(lineas)
+
+
+def procesar_lote(
+    rutas: Iterable[str],
+    n_colors=5,
+    max_size: int = 200,
+    engine: str = 'numpy',
+    mode: str = 'sample',
+    quant_bits: int = 5,
+    sampler: str = 'stratified',
+    color_space: str = 'rgb',
+    n_procesos: Optional[int] = None,
+    omitir: Optional[Set[str]] = None,
+    informe: Optional[InformeLote] = None
+) -> Iterator[Dict]:
+    """
+    Extrae las paletas de `rutas` en un pool de procesos y devuelve los registros a medida que
+    terminan (no en el orden de entrada). Las rutas se consumen de forma perezosa y nunca hay
+    más de EN_VUELO_POR_PROCESO trabajos pendientes por proceso, así que la memoria no crece
+    con el tamaño del catálogo. Las rutas de `omitir` se saltan (reanudación). Si se pasa
+    `informe`, se actualiza con contadores y tiempos por etapa.
+    """
+    validar_opciones(engine, mode, sampler, color_space, n_colors)
+    opciones = dict(n_colors=n_colors, max_size=max_size, engine=engine, mode=mode, quant_bits=quant_bits,
+                    sampler=sampler, color_space=color_space)
+    omitir = omitir or set()
+    informe = informe if informe is not None else InformeLote()
+    n_procesos = n_procesos or os.cpu_count() or 1
+    max_en_vuelo = n_procesos * EN_VUELO_POR_PROCESO
+    t0 = time.perf_counter()
+    pendientes = set()
+    iterador = iter(rutas)
+    with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+        try:
+            agotado = False
+            while True:
+                while not agotado and len(pendientes) < max_en_vuelo:
+                    ruta = next(iterador, None)
+                    if ruta is None:
+                        agotado = True
+                    elif ruta in omitir:
+                        informe.omitidas += 1
+                    else:
+                        pendientes.add(pool.submit(procesar_imagen, ruta, opciones))
+                if not pendientes:
+                    break
+                hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    registro = futuro.result()
+                    informe.registrar(registro)
+                    informe.segundos = time.perf_counter() - t0
+                    yield registro
+        finally:
+            # Interrupción (o generador cerrado): no empezar los trabajos que quedan en cola
+            for futuro in pendientes:
+                futuro.cancel()
+    informe.segundos = time.perf_counter() - t0
@@ -0,0 +1,124 @@
+from functools import lru_cache
+from PIL import Image, ImageFilter
+import numpy as np
+from typing import Iterator, Tuple
+from logic.color_utils import adjust_hsv_array_float
+from logic.decoding import FILAS_POR_FRANJA, iterar_franjas_rgb
+
+# Nodos por eje de la tabla: 33 para la vista previa, 65 (máximo de Pillow) para exportar
+TAMANO_LUT = 33
+TAMANO_LUT_EXPORTAR = 65
+
+# Número de tablas recientes que se conservan en memoria (una de 65³ ocupa ~3 MB en float32)
+LUTS_EN_CACHE = 16
+
+# Píxeles por bloque al interpolar en NumPy (acota los temporales float a unos pocos MB)
+PIXELES_POR_BLOQUE = 1 << 16
+
+
+def _clave(hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float) -> Tuple[float, float, float]:
+    # Los deslizadores dan valores enteros; normalizar a float evita duplicar 30 y 30.0 en la caché
+    return float(hue_shift_deg), float(sat_offset_pct), float(val_offset_pct)
+
+
+@lru_cache(maxsize=LUTS_EN_CACHE)
+def _lut_en_cache(hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float, tamano: int) -> np.ndarray:
+    nodos = np.linspace(0.0, 255.0, tamano)
+    r, g, b = np.meshgrid(nodos, nodos, nodos, indexing='ij')
+    colores = np.stack([r, g, b], axis=-1).reshape(-1, 3)
+    lut = adjust_hsv_array_float(colores, hue_shift_deg, sat_offset_pct, val_offset_pct)
+    lut = lut.reshape(tamano, tamano, tamano, 3).astype(np.float32)
+    # La tabla se comparte entre llamadas: de solo lectura para que nadie la modifique
+    lut.setflags(write=False)
+    return lut
+
+
+def construir_lut(hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0, val_offset_pct: float = 0.0,
+                  tamano: int = TAMANO_LUT) -> np.ndarray:
+    """
+    Tabla 3D (tamano, tamano, tamano, 3) float32 con el ajuste HSV de adjust_hsv_array evaluado
+    en una rejilla uniforme de 0-255, indexada como lut[r, g, b]. Las últimas LUTS_EN_CACHE
+    tablas se conservan, de modo que volver a un ajuste reciente no la recalcula.
+    """
+    if not 2 <= tamano <= 65:
+        raise ValueError(f"tamano debe estar entre 2 y 65, got {tamano}")
+    return _lut_en_cache(*_clave(hue_shift_deg, sat_offset_pct, val_offset_pct), tamano)
+
+
+@lru_cache(maxsize=LUTS_EN_CACHE)
+def _filtro_en_cache(hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float, tamano: int) -> ImageFilter.Color3DLUT:
+    lut = _lut_en_cache(hue_shift_deg, sat_offset_pct, val_offset_pct, tamano)
+    # Pillow espera la tabla en [0, 1] con el canal rojo variando más rápido: orden [b, g, r]
+    tabla = np.ascontiguousarray(lut.transpose(2, 1, 0, 3)) / np.float32(255.0)
+    return ImageFilter.Color3DLUT(tamano, tabla.ravel(), channels=3)
+
+
+def filtro_lut(hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0, val_offset_pct: float = 0.0,
+               tamano: int = TAMANO_LUT) -> ImageFilter.Color3DLUT:
+    """Filtro de Pillow (interpolación trilineal en C) para la tabla de construir_lut."""
+    if not 2 <= tamano <= 65:
+        raise ValueError(f"tamano debe estar entre 2 y 65, got {tamano}")
+    return _filtro_en_cache(*_clave(hue_shift_deg, sat_offset_pct, val_offset_pct), tamano)
+
+
+def aplicar_lut(arr: np.ndarray, lut: np.ndarray, tamano_bloque: int = PIXELES_POR_BLOQUE) -> np.ndarray:
+    """
+    Aplica la tabla a un array RGB uint8 (..., 3) con interpolación trilineal en NumPy,
+    por bloques de `tamano_bloque` píxeles. Devuelve uint8 con la misma forma.
+    """
+    arr = np.asarray(arr)
+    pixels = arr.reshape(-1, 3)
+    salida = np.empty(pixels.shape, dtype=np.uint8)
+    tamano = lut.shape[0]
+    plana = lut.reshape(-1, 3)
+    paso = np.float32((tamano - 1) / 255.0)
+    # Desplazamientos en la tabla aplanada de las 8 esquinas de cada celda
+    esquinas = [(dr, dg, db) for dr in (0, 1) for dg in (0, 1) for db in (0, 1)]
+    for i in range(0, pixels.shape[0], tamano_bloque):
+        bloque = pixels[i:i + tamano_bloque]
+        pos = bloque.astype(np.float32) * paso
+        # La celda de la última fila de nodos se limita para que i0 + 1 siga dentro de la tabla
+        i0 = np.minimum(pos.astype(np.intp), tamano - 2)
+        frac = pos - i0
+        base = (i0[:, 0] * tamano + i0[:, 1]) * tamano + i0[:, 2]
+        acumulado = np.zeros(bloque.shape, dtype=np.float32)
+        for dr, dg, db in esquinas:
+            peso = (frac[:, 0] if dr else 1.0 - frac[:, 0]) * \
+                   (frac[:, 1] if dg else 1.0 - frac[:, 1]) * \
+                   (frac[:, 2] if db else 1.0 - frac[:, 2])
+            acumulado += plana[base + (dr * tamano + dg) * tamano + db] * peso[:, None]
+        salida[i:i + tamano_bloque] = np.clip(np.round(acumulado), 0, 255).astype(np.uint8)
+    return salida.reshape(arr.shape)
+
+
+def ajustar_imagen_hsv(img: Image.Image, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0,
+                       val_offset_pct: float = 0.0, tamano: int = TAMANO_LUT) -> Image.Image:
+    """Imagen RGB con el ajuste HSV aplicado mediante la LUT (ruta de Pillow, para la vista previa)."""
+    img_rgb = img.convert('RGB')
+    if hue_shift_deg == 0 and sat_offset_pct == 0 and val_offset_pct == 0:
+        return img_rgb
+    return img_rgb.filter(filtro_lut(hue_shift_deg, sat_offset_pct, val_offset_pct, tamano))
+
+
+def iterar_franjas_ajustadas(path: str, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0,
+                             val_offset_pct: float = 0.0, tamano: int = TAMANO_LUT_EXPORTAR,
+                             filas: int = FILAS_POR_FRANJA) -> Iterator[Tuple[int, np.ndarray]]:
+    """Franjas (y0, RGB uint8) de la imagen a resolución completa con el ajuste aplicado."""
+    filtro = filtro_lut(hue_shift_deg, sat_offset_pct, val_offset_pct, tamano)
+    for y0, franja in iterar_franjas_rgb(path, filas=filas):
+        yield y0, np.asarray(Image.fromarray(franja).filter(filtro))
+
+
+def exportar_ajuste_hsv(path: str, destino: str, hue_shift_deg: float = 0.0, sat_offset_pct: float = 0.0,
+                        val_offset_pct: float = 0.0, tamano: int = TAMANO_LUT_EXPORTAR, **opciones_guardado) -> str:
+    """
+    Exporta la imagen a resolución completa con el ajuste HSV. La entrada se decodifica y
+    ajusta por franjas, así que en memoria solo coinciden la imagen de salida y una franja.
+    """
+    with Image.open(path) as img:
+        size = img.size
+    salida = Image.new('RGB', size)
+    for y0, franja in iterar_franjas_ajustadas(path, hue_shift_deg, sat_offset_pct, val_offset_pct, tamano):
+        salida.paste(Image.fromarray(franja), (0, y0))
+    salida.save(destino, **opciones_guardado)
+    return destino
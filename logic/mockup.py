@@ -1,3 +1,4 @@
+from collections.abc import MutableSequence
 from PIL import Image, ImageDraw, ImageFont
 from typing import List, Tuple
 
@@ -5,7 +6,8 @@ from typing import List, Tuple
 def crear_mockup_ui(palette: List[Tuple[int, int, int]], size: Tuple[int, int] = (200, 200)) -> Image.Image:
    
     # Validaciones básicas
-    if not isinstance(palette, list):
+    # Listas o vistas mutables como Paleta.colores
+    if not isinstance(palette, MutableSequence):
         raise TypeError(f"palette debe ser una lista de tuplas RGB, got {type(palette)}")
     for c in palette:
         if (not isinstance(c, tuple)) or len(c) != 3:
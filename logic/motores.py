@@ -0,0 +1,206 @@
+from PIL import Image
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional, Tuple
+from logic.kmeans import kmeans
+
+# Un motor recibe los puntos a agrupar (n, 3) en el espacio de color de trabajo, el número de
+# colores y, opcionalmente, pesos por punto (modo histograma); devuelve los centros (k, 3).
+# Si se le pasa `token` (objeto con comprobar()), debe consultarlo en sus bucles largos para
+# poder cancelarse; llamar_motor solo lo pasa cuando lo hay, así que un motor registrado sin
+# ese parámetro sigue sirviendo para extracciones no cancelables.
+Motor = Callable[..., np.ndarray]
+
+# Puntos a los que se expanden las muestras ponderadas para los motores de Pillow
+MAX_PUNTOS_PILLOW = 65536
+
+
+def _centros_numpy(sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+                   n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+    return kmeans(sample, n_clusters=n_colors, random_state=42, n_init=10, sample_weight=weights,
+                  n_jobs=n_jobs, executor=executor, token=token).centros
+
+
+def _centros_sklearn(sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+                     n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+    # Importación diferida: scikit-learn solo se carga si se elige este motor.
+    # scikit-learn ya paraleliza internamente con OpenMP, así que n_jobs/executor no se usan;
+    # tampoco se puede interrumpir, así que el token solo se consulta antes de empezar.
+    if token is not None:
+        token.comprobar()
+    from sklearn.cluster import KMeans
+    kmeans_sk = KMeans(n_clusters=n_colors, random_state=42, n_init=10)
+    kmeans_sk.fit(sample, sample_weight=weights)
+    return kmeans_sk.cluster_centers_
+
+
+def _preparar(sample: np.ndarray, weights: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    X = np.asarray(sample, dtype=np.float64).reshape(-1, 3)
+    pesos = np.ones(X.shape[0]) if weights is None else np.asarray(weights, dtype=np.float64)
+    return X, pesos
+
+
+def _a_enteros(X: np.ndarray) -> np.ndarray:
+    """Reescala cada canal a 0-255 (uint8): así octree y Pillow sirven también en OKLab/Lab."""
+    minimo = X.min(axis=0)
+    rango = X.max(axis=0) - minimo
+    rango[rango == 0] = 1.0
+    return np.round((X - minimo) / rango * 255.0).astype(np.uint8)
+
+
+def _medias_por_etiqueta(X: np.ndarray, pesos: np.ndarray, etiquetas: np.ndarray, k: int) -> np.ndarray:
+    peso = np.bincount(etiquetas, weights=pesos, minlength=k)
+    sumas = np.stack([np.bincount(etiquetas, weights=X[:, c] * pesos, minlength=k) for c in range(3)], axis=1)
+    ocupados = peso > 0
+    return sumas[ocupados] / peso[ocupados, None]
+
+
+def _centros_median_cut(sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+                        n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+    """
+    Median cut (Heckbert) ponderado: parte repetidamente la caja con mayor peso × rango por la
+    mediana ponderada de su eje más largo. Devuelve la media ponderada de cada caja.
+    """
+    X, pesos = _preparar(sample, weights)
+    cajas = [np.arange(X.shape[0])]
+    while len(cajas) < n_colors:
+        if token is not None:
+            token.comprobar()
+        mejor, mejor_puntuacion, eje = -1, 0.0, 0
+        for i, idx in enumerate(cajas):
+            if idx.size < 2:
+                continue
+            rangos = X[idx].max(axis=0) - X[idx].min(axis=0)
+            puntuacion = float(rangos.max()) * float(pesos[idx].sum())
+            if puntuacion > mejor_puntuacion:
+                mejor, mejor_puntuacion, eje = i, puntuacion, int(rangos.argmax())
+        if mejor < 0:
+            # Ninguna caja tiene más de un color distinto
+            break
+        idx = cajas.pop(mejor)
+        idx = idx[np.argsort(X[idx, eje], kind='stable')]
+        acumulado = np.cumsum(pesos[idx])
+        corte = int(np.searchsorted(acumulado, acumulado[-1] / 2.0)) + 1
+        # Evitar cortar entre dos puntos con el mismo valor en el eje, y cajas vacías
+        valores = X[idx, eje]
+        while 0 < corte < idx.size and valores[corte] == valores[corte - 1]:
+            corte += 1
+        if corte >= idx.size:
+            corte = int(np.searchsorted(valores, valores[-1], side='left'))
+        cajas.extend([idx[:corte], idx[corte:]])
+    centros = [np.average(X[idx], axis=0, weights=pesos[idx]) for idx in cajas if pesos[idx].sum() > 0]
+    return np.array(centros)
+
+
+def _centros_octree(sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+                    n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+    """
+    Cuantización por octree: cada color es una hoja de profundidad 8 y, mientras sobren hojas,
+    se fusionan en su nodo padre las del nivel más profundo, empezando por los padres con menos
+    peso. Las fusiones de un nivel se deciden de una vez con sumas acumuladas, sin recorrer el
+    árbol nodo a nodo.
+    """
+    X, pesos = _preparar(sample, weights)
+    q = _a_enteros(X).astype(np.int64)
+
+    def claves(rep: np.ndarray, nivel: np.ndarray) -> np.ndarray:
+        desplazamiento = (8 - nivel)[:, None]
+        p = rep >> desplazamiento
+        return (nivel << 24) | (p[:, 0] << 16) | (p[:, 1] << 8) | p[:, 2]
+
+    hojas, primero, etiquetas = np.unique(claves(q, np.full(q.shape[0], 8)), return_index=True, return_inverse=True)
+    rep = q[primero]
+    nivel = np.full(hojas.size, 8)
+    peso = np.bincount(etiquetas, weights=pesos)
+    sumas = np.stack([np.bincount(etiquetas, weights=X[:, c] * pesos) for c in range(3)], axis=1)
+    while hojas.size > n_colors and nivel.max() > 0:
+        if token is not None:
+            token.comprobar()
+        d = nivel.max()
+        en_nivel = np.flatnonzero(nivel == d)
+        padres, inverso = np.unique(claves(rep[en_nivel], nivel[en_nivel] - 1), return_inverse=True)
+        peso_padre = np.bincount(inverso, weights=peso[en_nivel])
+        hijos = np.bincount(inverso)
+        orden = np.argsort(peso_padre, kind='stable')
+        # Cuántos padres (de menor a mayor peso) hay que fusionar para quedarse en n_colors hojas
+        reduccion = np.cumsum(hijos[orden] - 1)
+        n_fusionar = int(np.searchsorted(reduccion, hojas.size - n_colors)) + 1
+        fusionar = np.zeros(padres.size, dtype=bool)
+        fusionar[orden[:n_fusionar]] = True
+        mover = en_nivel[fusionar[inverso]]
+        grupo = inverso[fusionar[inverso]]
+        # Las hojas fusionadas suben un nivel y se agregan por padre
+        _, nuevo_inverso = np.unique(grupo, return_inverse=True)
+        _, primero_grupo = np.unique(nuevo_inverso, return_index=True)
+        n_nuevas = primero_grupo.size
+        nuevo_peso = np.bincount(nuevo_inverso, weights=peso[mover], minlength=n_nuevas)
+        nuevas_sumas = np.stack([np.bincount(nuevo_inverso, weights=sumas[mover, c], minlength=n_nuevas)
+                                 for c in range(3)], axis=1)
+        nuevo_rep = rep[mover][primero_grupo]
+        nuevo_nivel = np.full(n_nuevas, d - 1)
+        quedan = np.ones(hojas.size, dtype=bool)
+        quedan[mover] = False
+        rep = np.concatenate([rep[quedan], nuevo_rep])
+        nivel = np.concatenate([nivel[quedan], nuevo_nivel])
+        peso = np.concatenate([peso[quedan], nuevo_peso])
+        sumas = np.concatenate([sumas[quedan], nuevas_sumas])
+        hojas = claves(rep, nivel)
+    ocupadas = peso > 0
+    return sumas[ocupadas] / peso[ocupadas, None]
+
+
+def _motor_pillow(metodo_nombre: str) -> Motor:
+    """Motor basado en Image.quantize; los centros son las medias de los puntos de cada índice."""
+
+    def motor(sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+              n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+        # Pillow>=9.1 expone los métodos en Image.Quantize
+        try:
+            metodo = getattr(Image.Quantize, metodo_nombre)
+        except AttributeError:
+            metodo = getattr(Image, metodo_nombre)
+        if token is not None:
+            token.comprobar()
+        X, pesos = _preparar(sample, weights)
+        indices = np.arange(X.shape[0])
+        if weights is not None:
+            # Pillow no admite pesos: cada punto se repite en proporción a su peso
+            repeticiones = np.maximum(1, np.round(pesos * (MAX_PUNTOS_PILLOW / pesos.sum()))).astype(np.intp)
+            indices = np.repeat(indices, repeticiones)
+        q = _a_enteros(X)[indices]
+        img = Image.fromarray(q.reshape(1, -1, 3))
+        etiquetas = np.asarray(img.quantize(colors=n_colors, method=metodo)).ravel().astype(np.intp)
+        return _medias_por_etiqueta(X[indices], np.ones(indices.size), etiquetas, int(etiquetas.max()) + 1)
+
+    return motor
+
+
+# Registro de motores de extracción (engine=...). Se amplía con registrar_motor.
+MOTORES: Dict[str, Motor] = {
+    'numpy': _centros_numpy,
+    'sklearn': _centros_sklearn,
+    'median_cut': _centros_median_cut,
+    'octree': _centros_octree,
+    'pillow_mediancut': _motor_pillow('MEDIANCUT'),
+    'pillow_octree': _motor_pillow('FASTOCTREE'),
+}
+
+
+def registrar_motor(nombre: str, motor: Motor) -> None:
+    """Añade (o reemplaza) un motor en el registro para poder usarlo como engine=nombre."""
+    MOTORES[nombre] = motor
+
+
+def llamar_motor(nombre: str, sample: np.ndarray, n_colors: int, weights: Optional[np.ndarray] = None,
+                 n_jobs: Optional[int] = None, executor: Optional[Executor] = None, token=None) -> np.ndarray:
+    """Ejecuta el motor; el token solo se pasa si lo hay, por compatibilidad con motores externos."""
+    motor = obtener_motor(nombre)
+    if token is None:
+        return motor(sample, n_colors, weights, n_jobs=n_jobs, executor=executor)
+    return motor(sample, n_colors, weights, n_jobs=n_jobs, executor=executor, token=token)
+
+
+def obtener_motor(nombre: str) -> Motor:
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor de clustering no soportado: {nombre}")
+    return MOTORES[nombre]
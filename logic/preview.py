@@ -0,0 +1,45 @@
+from PIL import Image
+import numpy as np
+from logic.lut import TAMANO_LUT, TAMANO_LUT_EXPORTAR, ajustar_imagen_hsv
+
+# Lado máximo del proxy de vista previa (~1 MP) y de la imagen de calidad completa que se
+# muestra al soltar el deslizador (el QLabel nunca muestra más resolución que esta)
+PREVIEW_MAX_SIZE = 1024
+COMPLETA_MAX_SIZE = 2048
+
+
+def _reducir(img: Image.Image, max_size: int) -> Image.Image:
+    if img.mode == 'RGB' and max(img.size) <= max_size:
+        # Ya cabe: se comparte (p. ej. la miniatura de ImagenCargada) en lugar de copiarla
+        return img
+    img_rgb = img.convert('RGB')
+    if max(img_rgb.size) > max_size:
+        # thumbnail usa draft/reduce cuando puede y conserva la proporción
+        try:
+            resample_filter = Image.Resampling.LANCZOS
+        except AttributeError:
+            resample_filter = Image.LANCZOS
+        img_rgb.thumbnail((max_size, max_size), resample_filter)
+    return img_rgb
+
+
+class VistaPrevia:
+    """
+    Buffers de una imagen cargada para previsualizar ajustes HSV: `proxy` es un array RGB
+    uint8 contiguo de como mucho PREVIEW_MAX_SIZE de lado, que se recolorea con la LUT de
+    33³ en cada movimiento del deslizador; `completa` es la versión de mayor resolución que
+    se recolorea con la LUT de 65³ cuando el ajuste se estabiliza.
+    """
+
+    def __init__(self, img: Image.Image, max_size: int = PREVIEW_MAX_SIZE,
+                 max_size_completa: int = COMPLETA_MAX_SIZE):
+        self.completa = _reducir(img, max_size_completa)
+        self.proxy = np.ascontiguousarray(np.asarray(_reducir(self.completa, max_size)))
+
+    def render_proxy(self, hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float) -> np.ndarray:
+        img = Image.fromarray(self.proxy)
+        return np.asarray(ajustar_imagen_hsv(img, hue_shift_deg, sat_offset_pct, val_offset_pct, TAMANO_LUT))
+
+    def render_completa(self, hue_shift_deg: float, sat_offset_pct: float, val_offset_pct: float) -> np.ndarray:
+        return np.asarray(ajustar_imagen_hsv(self.completa, hue_shift_deg, sat_offset_pct, val_offset_pct,
+                                             TAMANO_LUT_EXPORTAR))
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+from typing import Iterable, Optional
+
+
+def muestreo_aleatorio(arr: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """n píxeles distintos al azar (Generator.choice sin reemplazo, sin permutar todo el índice)."""
+    pixels = arr.reshape(-1, arr.shape[-1])
+    if pixels.shape[0] <= n:
+        return pixels.copy()
+    idx = rng.choice(pixels.shape[0], n, replace=False, shuffle=False)
+    return pixels[idx]
+
+
+def muestreo_rejilla(arr: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Rejilla regular con paso constante y origen aleatorio; devuelve como mucho ~n píxeles."""
+    h, w = arr.shape[:2]
+    if h * w <= n:
+        return arr.reshape(-1, arr.shape[-1]).copy()
+    paso = max(1, math.ceil(math.sqrt(h * w / n)))
+    oy, ox = rng.integers(0, paso, size=2)
+    return arr[oy::paso, ox::paso].reshape(-1, arr.shape[-1])
+
+
+def muestreo_estratificado(arr: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Un píxel al azar dentro de cada bloque de una rejilla de ~n bloques (jittered sampling)."""
+    h, w = arr.shape[:2]
+    if h * w <= n:
+        return arr.reshape(-1, arr.shape[-1]).copy()
+    lado = max(1, math.ceil(math.sqrt(h * w / n)))
+    by, bx = math.ceil(h / lado), math.ceil(w / lado)
+    origen_y = np.arange(by) * lado
+    origen_x = np.arange(bx) * lado
+    # Los bloques del borde pueden ser más pequeños que `lado`
+    alto_bloque = np.minimum(lado, h - origen_y)
+    ancho_bloque = np.minimum(lado, w - origen_x)
+    ys = origen_y[:, None] + (rng.random((by, bx)) * alto_bloque[:, None]).astype(np.intp)
+    xs = origen_x[None, :] + (rng.random((by, bx)) * ancho_bloque[None, :]).astype(np.intp)
+    return arr[ys.ravel(), xs.ravel()]
+
+
+def muestreo_reservorio(bloques: Iterable[np.ndarray], n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Muestreo por reservorio (algoritmo R vectorizado por bloques) sobre un flujo de píxeles
+    (m, c): usa memoria O(n) sin conocer de antemano la longitud total del flujo.
+    """
+    reservorio = None
+    vistos = 0
+    for bloque in bloques:
+        bloque = bloque.reshape(-1, bloque.shape[-1])
+        m = bloque.shape[0]
+        if m == 0:
+            continue
+        if reservorio is None:
+            reservorio = np.empty((n, bloque.shape[1]), dtype=bloque.dtype)
+        # Llenado inicial del reservorio
+        llenar = min(max(n - vistos, 0), m)
+        if llenar:
+            reservorio[vistos:vistos + llenar] = bloque[:llenar]
+        resto = bloque[llenar:]
+        if resto.shape[0]:
+            # El elemento i-ésimo del flujo (0-based) sustituye a una posición al azar con prob. n/(i+1)
+            posiciones = vistos + llenar + np.arange(resto.shape[0])
+            destinos = (rng.random(resto.shape[0]) * (posiciones + 1)).astype(np.int64)
+            aceptados = destinos < n
+            # En índices repetidos NumPy conserva la última asignación, como el algoritmo secuencial
+            reservorio[destinos[aceptados]] = resto[aceptados]
+        vistos += m
+    if reservorio is None:
+        return np.empty((0, 3), dtype=np.uint8)
+    return reservorio[:min(vistos, n)]
+
+
+def _bloques_de_filas(arr: np.ndarray, filas: int = 64) -> Iterable[np.ndarray]:
+    for y0 in range(0, arr.shape[0], filas):
+        yield arr[y0:y0 + filas]
+
+
+# Estrategias de muestreo disponibles (sampler=...)
+SAMPLERS = {
+    'random': muestreo_aleatorio,
+    'grid': muestreo_rejilla,
+    'stratified': muestreo_estratificado,
+    'reservoir': lambda arr, n, rng: muestreo_reservorio(_bloques_de_filas(arr), n, rng),
+}
+
+
+def muestrear(arr: np.ndarray, n: int, sampler: str = 'stratified', rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Toma ~n píxeles de un array (H, W, C) con la estrategia indicada. Devuelve (m, C)."""
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Estrategia de muestreo no soportada: {sampler}")
+    if rng is None:
+        rng = np.random.default_rng(42)
+    return SAMPLERS[sampler](arr, n, rng)
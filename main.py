@@ -1,4 +1,5 @@
 
+import multiprocessing
 import sys
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
@@ -13,4 +14,7 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # En el ejecutable de PyInstaller los procesos del pool ('spawn') arrancan este mismo
+    # ejecutable: freeze_support los desvía al worker en lugar de abrir otra ventana
+    multiprocessing.freeze_support()
     main()
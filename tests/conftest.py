@@ -1,5 +1,3 @@
-
-
 import os
 import pytest
 
@@ -7,3 +5,12 @@ import pytest
 def set_qt_env():
     os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
     yield
+
+
+@pytest.fixture(scope="session")
+def app():
+    # QApplication compartida por los tests de UI y de workers (solo puede haber una por proceso)
+    pytest.importorskip("PySide6")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
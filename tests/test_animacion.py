@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from PIL import Image
+from async_tasks.scheduler import Cancelado, TokenCancelacion
+from logic.animacion import iterar_fotogramas, paletas_fotogramas
+
+COLORES = [(220, 40, 40), (40, 200, 60), (30, 60, 220)]
+
+
+def _fotograma(colores, desplazamiento=0, seed=0):
+    # Tres franjas verticales de ruido alrededor de cada color
+    rng = np.random.default_rng(seed)
+    arr = np.concatenate([np.tile(np.asarray(c, float), (60, 40, 1)) for c in colores], axis=1)
+    arr += desplazamiento + rng.normal(0, 4, size=arr.shape)
+    return Image.fromarray(arr.clip(0, 255).astype(np.uint8))
+
+
+def _distancia(a, b):
+    return np.abs(np.asarray(a, float) - np.asarray(b, float)).max()
+
+
+def test_gif_animado_un_resultado_por_fotograma(tmp_path):
+    path = str(tmp_path / "anim.gif")
+    fotogramas = [_fotograma(COLORES, seed=i) for i in range(3)] + [_fotograma(COLORES[::-1], seed=3)]
+    fotogramas[0].save(path, save_all=True, append_images=fotogramas[1:], duration=40)
+    assert sum(1 for _ in iterar_fotogramas(path)) == 4
+    resultados = list(paletas_fotogramas(path, n_colors=3))
+    assert [i for i, _, _ in resultados] == [0, 1, 2, 3]
+    for _, colores, pesos in resultados:
+        assert len(colores) == 3 and pesos.shape == (3,)
+        assert pesos.sum() == pytest.approx(1.0)
+        assert _distancia(sorted(colores), sorted(COLORES)) < 15
+
+
+def test_fotogramas_sin_cambios_reutilizan_la_paleta():
+    fotogramas = [_fotograma(COLORES) for _ in range(3)]
+    for i, fotograma in enumerate(fotogramas[1:], 1):
+        fotograma.paste((255, 255, 255), (0, 0, 5 * i, 5))
+    resultados = list(paletas_fotogramas(fotogramas, n_colors=3))
+    # Unos pocos píxeles apenas cambian el histograma: se reutiliza la paleta del primer fotograma
+    assert resultados[1][1] is resultados[0][1] and resultados[2][1] is resultados[0][1]
+    assert _distancia(sorted(resultados[0][1]), sorted(COLORES)) < 10
+
+
+def test_orden_estable_con_deriva_y_corte():
+    # Deriva lenta (arranque en caliente) y después un corte con los mismos colores permutados
+    fotogramas = [_fotograma(COLORES, desplazamiento=3 * i, seed=i) for i in range(6)]
+    fotogramas.append(_fotograma(COLORES[::-1], desplazamiento=15, seed=6))
+    paletas = [colores for _, colores, _ in paletas_fotogramas(fotogramas, n_colors=3, umbral_cambio=0.0)]
+    for anterior, actual in zip(paletas, paletas[1:]):
+        # El color i sigue siendo el mismo color: solo cambia lo que se desplaza la imagen
+        assert _distancia(anterior, actual) < 12
+
+
+def test_auto_y_cancelacion():
+    fotogramas = [_fotograma(COLORES, seed=i) for i in range(2)]
+    (_, colores, _), _ = paletas_fotogramas(fotogramas, n_colors='auto')
+    assert len(colores) == 3
+    token = TokenCancelacion()
+    token.cancelar()
+    with pytest.raises(Cancelado):
+        next(paletas_fotogramas(fotogramas, token=token))
+    with pytest.raises(ValueError):
+        next(paletas_fotogramas(fotogramas, mode='inexistente'))
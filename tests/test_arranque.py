@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip("PySide6")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Umbrales holgados (unas 5-10 veces lo medido) para detectar regresiones, no variaciones de la máquina
+UMBRAL_IMPORTACION_MS = 1000
+UMBRAL_PRIMER_FRAME_MS = 3000
+
+PESADOS = ('numpy', 'PIL', 'sklearn', 'scipy', 'data.models', 'logic.clustering', 'async_tasks.workers')
+
+
+def _ejecutar(codigo, *opciones):
+    entorno = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    resultado = subprocess.run([sys.executable, *opciones, '-c', codigo], cwd=RAIZ, env=entorno,
+                               capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    return resultado
+
+
+def test_importar_ventana_no_carga_modulos_pesados():
+    codigo = f"import sys, ui.main_window; print([m for m in {PESADOS!r} if m in sys.modules])"
+    resultado = _ejecutar(codigo, '-X', 'importtime')
+    assert resultado.stdout.strip() == '[]'
+    linea = next(l for l in resultado.stderr.splitlines() if l.rstrip().endswith('| ui.main_window'))
+    assert int(linea.split('|')[1]) / 1000.0 < UMBRAL_IMPORTACION_MS
+
+
+def test_primer_frame_antes_de_la_precarga():
+    codigo = f"""
+import sys, time
+t0 = time.perf_counter()
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+from ui.main_window import MODULOS_DIFERIDOS, MainWindow
+
+class Filtro(QObject):
+    cargados = None
+    def eventFilter(self, obj, evento):
+        if evento.type() == QEvent.Paint and Filtro.cargados is None:
+            Filtro.cargados = [m for m in {PESADOS!r} if m in sys.modules]
+            Filtro.ms = (time.perf_counter() - t0) * 1000.0
+        return False
+
+app = QApplication([])
+filtro = Filtro()
+app.installEventFilter(filtro)
+ventana = MainWindow()
+ventana.show()
+while Filtro.cargados is None:
+    app.processEvents()
+assert Filtro.cargados == [], Filtro.cargados
+assert Filtro.ms < {UMBRAL_PRIMER_FRAME_MS}, Filtro.ms
+# Tras el primer frame, la precarga en segundo plano deja disponibles los módulos diferidos
+limite = time.perf_counter() + 30
+while not all(m in sys.modules for m in MODULOS_DIFERIDOS) and time.perf_counter() < limite:
+    app.processEvents()
+    time.sleep(0.01)
+assert all(m in sys.modules for m in MODULOS_DIFERIDOS)
+ventana.close()
+"""
+    _ejecutar(codigo)
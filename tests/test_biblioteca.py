@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from data.biblioteca import TONOS_CALIDOS, TONOS_FRIOS, BibliotecaPaletas, caracteristicas_paletas
+from data.models import Paleta
+
+
+@pytest.fixture
+def paletas():
+    return [
+        Paleta(nombre="rojo", colores=[(250, 10, 10), (128, 128, 128)], origen_imagen_path="img.png",
+               parametros={'pesos': [0.7, 0.3]}),
+        Paleta(nombre="azul", colores=[(10, 40, 240)], origen_imagen_path="img.png", armonia_tipo="triadas"),
+        Paleta(nombre="naranja ñ", colores=[(255, 140, 0), (20, 20, 200)], origen_imagen_path="otra.png",
+               archivo_guardado="n.json", parametros={'pesos': [0.8, 0.2]}),
+        Paleta(nombre="gris", colores=[(128, 128, 128), (255, 255, 255)]),
+        Paleta(nombre="vacía", colores=[]),
+    ]
+
+
+def test_caracteristicas():
+    rgb = np.array([[250, 10, 10], [128, 128, 128], [10, 40, 240], [0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+    tonos, luminosidad = caracteristicas_paletas(rgb, [0, 2, 3, 5, 5])
+    # Los grises no cuentan para el tono; la paleta acromática y la vacía no tienen tono
+    assert tonos == [0, 8, None, None]
+    assert luminosidad[2] == pytest.approx(50, abs=0.1) and np.isnan(luminosidad[3])
+    # Con pesos, manda el color con más peso
+    tonos, _ = caracteristicas_paletas(rgb[:3], [0, 3], np.array([0.2, 0.0, 0.8]))
+    assert tonos == [8]
+
+
+def test_agregar_obtener_y_persistencia(paletas, tmp_path):
+    path = str(tmp_path / "biblioteca.sqlite")
+    with BibliotecaPaletas(path) as biblioteca:
+        assert biblioteca.agregar(iter(paletas[:3]), tamano_lote=2) == [1, 2, 3]
+        assert biblioteca.agregar(paletas[3:]) == [4, 5]
+        assert biblioteca._conexion.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    with BibliotecaPaletas(path) as biblioteca:
+        assert len(biblioteca) == 5
+        assert [biblioteca.obtener(i) for i in range(1, 6)] == paletas
+        assert biblioteca.obtener(3).pesos == [0.8, 0.2]
+        assert biblioteca.eliminar([2, 99]) == 1
+        with pytest.raises(KeyError):
+            biblioteca.obtener(2)
+        assert biblioteca.agregar([paletas[1]]) == [6]
+        # Los ids de las paletas eliminadas no se reutilizan, tampoco los del final
+        assert biblioteca.eliminar([6]) == 1
+        assert biblioteca.agregar([paletas[1]]) == [7]
+    with BibliotecaPaletas(path) as biblioteca:
+        assert biblioteca.agregar(paletas[:2]) == [8, 9]
+
+
+def test_buscar_por_indices(paletas, tmp_path):
+    with BibliotecaPaletas(str(tmp_path / "biblioteca.sqlite")) as biblioteca:
+        biblioteca.agregar(paletas)
+        assert [p.nombre for p in biblioteca.buscar(origen_imagen_path="img.png", tonos=TONOS_CALIDOS)] == ["rojo"]
+        assert sorted(biblioteca.buscar_ids(tonos=TONOS_CALIDOS)) == [1, 3]
+        assert biblioteca.buscar_ids(tonos=TONOS_CALIDOS, ordenar=True) == [1, 3]
+        assert biblioteca.buscar_ids(tonos=TONOS_FRIOS, luminosidad_max=40) == [2]
+        assert biblioteca.buscar(armonia_tipo="triadas") == [paletas[1]]
+        assert biblioteca.buscar_ids(nombre="naranja ñ") == [3] and biblioteca.buscar_ids(limite=2, ordenar=True) == [1, 2]
+        assert len(biblioteca.buscar_ids(tonos=TONOS_CALIDOS, limite=1)) == 1
+        for filtros in ({'origen_imagen_path': "img.png", 'tonos': TONOS_CALIDOS}, {'nombre': "gris"},
+                        {'armonia_tipo': "triadas"}, {'tonos': TONOS_FRIOS, 'luminosidad_min': 20},
+                        {'tonos': TONOS_CALIDOS, 'limite': 10}):
+            sql, parametros = biblioteca._consulta('id', **filtros)
+            plan = biblioteca._conexion.execute('EXPLAIN QUERY PLAN ' + sql, parametros).fetchall()
+            assert any('USING' in fila[-1] and 'INDEX' in fila[-1] for fila in plan), plan
@@ -0,0 +1,92 @@
+import os
+import time
+import pytest
+from data.cache import CacheExtracciones, hash_contenido
+import data.cache as cache_mod
+
+
+def _archivo(tmp_path, nombre, contenido):
+    path = tmp_path / nombre
+    path.write_bytes(contenido)
+    return str(path)
+
+
+def test_miss_guardar_hit(tmp_path):
+    cache = CacheExtracciones(directorio=str(tmp_path / "cache"))
+    img = _archivo(tmp_path, "a.png", b"imagen-a")
+    clave = cache.clave(img, n_colors=5, max_size=200, engine='numpy', sampler='stratified')
+    assert cache.obtener(clave) is None
+    cache.guardar(clave, [(1, 2, 3), (250, 0, 10)])
+    assert cache.obtener(clave) == [(1, 2, 3), (250, 0, 10)]
+    stats = cache.estadisticas()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entradas']) == (1, 1, 0, 1)
+
+
+def test_clave_depende_de_contenido_y_parametros(tmp_path):
+    cache = CacheExtracciones(directorio=str(tmp_path / "cache"))
+    a = _archivo(tmp_path, "a.png", b"contenido")
+    copia = _archivo(tmp_path, "copia.png", b"contenido")
+    b = _archivo(tmp_path, "b.png", b"otro contenido")
+    # Mismo contenido en otra ruta: misma clave (direccionada por contenido)
+    assert cache.clave(a, n_colors=5) == cache.clave(copia, n_colors=5)
+    assert cache.clave(a, n_colors=5) != cache.clave(b, n_colors=5)
+    assert cache.clave(a, n_colors=5) != cache.clave(a, n_colors=6)
+    assert cache.clave(a, n_colors=5, engine='numpy') != cache.clave(a, n_colors=5, engine='sklearn')
+
+
+def test_hash_archivos_grandes_por_bloques(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, 'HASH_COMPLETO_MAX_BYTES', 1024)
+    monkeypatch.setattr(cache_mod, 'HASH_BLOQUE_BYTES', 16)
+    monkeypatch.setattr(cache_mod, 'HASH_N_BLOQUES', 4)
+    datos = bytearray(os.urandom(4096))
+    a = _archivo(tmp_path, "a.bin", bytes(datos))
+    datos[-1] ^= 0xFF  # el último bloque siempre se incluye
+    b = _archivo(tmp_path, "b.bin", bytes(datos))
+    assert hash_contenido(a) != hash_contenido(b)
+    assert hash_contenido(a) == hash_contenido(a)
+    # Un cambio fuera de los bloques muestreados, con el mismo tamaño, también cambia la clave
+    antes = hash_contenido(a)
+    mtime = os.stat(a).st_mtime_ns
+    with open(a, 'r+b') as f:
+        f.seek(100)
+        f.write(b'\x00' * 8)
+    os.utime(a, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    assert hash_contenido(a) != antes
+
+
+def test_expulsion_lru(tmp_path):
+    cache = CacheExtracciones(directorio=str(tmp_path / "cache"), max_bytes=10**9)
+    claves = [f"{i:032x}" for i in range(4)]
+    for i, clave in enumerate(claves):
+        cache.guardar(clave, [(i, i, i)])
+        os.utime(cache._ruta(clave), (1000 + i, 1000 + i))
+    tam = cache.estadisticas()['bytes'] // 4
+    # Usar la entrada más antigua la convierte en la más reciente
+    assert cache.obtener(claves[0]) == [(0, 0, 0)]
+    cache.max_bytes = 3 * tam
+    cache.guardar(f"{9:032x}", [(9, 9, 9)])
+    assert cache.obtener(claves[1]) is None
+    assert cache.obtener(claves[0]) == [(0, 0, 0)]
+    stats = cache.estadisticas()
+    assert stats['evictions'] == 2
+    assert stats['entradas'] == 3
+
+
+def test_entrada_corrupta_es_miss(tmp_path):
+    cache = CacheExtracciones(directorio=str(tmp_path / "cache"))
+    clave = "f" * 32
+    os.makedirs(cache.directorio)
+    with open(cache._ruta(clave), 'w') as f:
+        f.write("{no es json")
+    assert cache.obtener(clave) is None
+    assert cache.estadisticas()['misses'] == 1
+
+
+def test_hit_en_milisegundos(tmp_path):
+    cache = CacheExtracciones(directorio=str(tmp_path / "cache"))
+    img = _archivo(tmp_path, "grande.tif", os.urandom(4 * 1024 * 1024))
+    clave = cache.clave(img, n_colors=5)
+    cache.guardar(clave, [(1, 1, 1)] * 5)
+    t0 = time.perf_counter()
+    assert cache.obtener(cache.clave(img, n_colors=5)) is not None
+    assert time.perf_counter() - t0 < 0.1
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from PIL import Image
+from async_tasks.scheduler import Cancelado, TokenCancelacion
+from logic.carga import cargar_imagen
+from logic.clustering import extraer_colores_dominantes
+from logic.preview import VistaPrevia
+
+
+def _guardar(tmp_path, w, h, nombre="img.png", seed=0):
+    rng = np.random.default_rng(seed)
+    path = str(tmp_path / nombre)
+    Image.fromarray(rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8)).save(path)
+    return path
+
+
+def test_cargar_imagen_tamanos(tmp_path):
+    path = _guardar(tmp_path, 1200, 800)
+    imagen = cargar_imagen(path, max_size_base=500, max_size_miniatura=300, max_size_analisis=150)
+    assert imagen.path == path and imagen.size == (1200, 800)
+    # La base solo se promedia por bloques enteros: entre el destino y el doble
+    assert imagen.base.size == (600, 400) and imagen.base.mode == 'RGB'
+    assert imagen.miniatura.size == (300, 200) and imagen.miniatura.mode == 'RGB'
+    assert imagen.analisis.size == (150, 100) and imagen.analisis.mode == 'RGB'
+    assert VistaPrevia(imagen.base, max_size=250, max_size_completa=500).completa.size == (500, 333)
+
+
+def test_cargar_imagen_pequena_comparte_buffers(tmp_path):
+    imagen = cargar_imagen(_guardar(tmp_path, 120, 90))
+    assert imagen.base.size == (120, 90)
+    # Sin reducción, base, miniatura, proxy de análisis y vista previa son la misma imagen
+    assert imagen.miniatura is imagen.base and imagen.analisis is imagen.base
+    assert VistaPrevia(imagen.base).completa is imagen.base
+
+
+def test_cargar_imagen_cancelada(tmp_path):
+    token = TokenCancelacion()
+    token.cancelar()
+    with pytest.raises(Cancelado):
+        cargar_imagen(_guardar(tmp_path, 300, 200), token=token)
+
+
+def test_clustering_worker_usa_la_imagen_cargada(app, tmp_path):
+    from async_tasks.workers import CargaWorker, ClusteringWorker
+    from data.cache import CacheExtracciones
+    path = _guardar(tmp_path, 900, 600, seed=1)
+    cargadas = []
+    carga = CargaWorker(path)
+    carga.cargada.connect(lambda imagen, qimg, ms: cargadas.append((imagen, qimg, ms)))
+    carga.run()
+    imagen, qimg, ms = cargadas[0]
+    assert (qimg.width(), qimg.height()) == imagen.miniatura.size and ms >= 0
+    resultados = []
+    worker = ClusteringWorker(path, n_colors=4, cache=CacheExtracciones(str(tmp_path / "cache")), imagen=imagen)
+    worker.resultado.connect(lambda colores, token: resultados.append(colores))
+    worker.run()
+    assert resultados == [extraer_colores_dominantes(imagen.analisis, 4)]
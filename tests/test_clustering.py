@@ -19,4 +19,188 @@ def test_extraer_colores_two_colors():
     img = create_test_image([(255,0,0),(0,255,0)], size=(100,100))
     colores = extraer_colores_dominantes(img, n_colors=2, resize_for_speed=False)
     # Debe contener rojo y verde (en cualquier orden)
-    assert set(colores) == {(255,0,0),(0,255,0)}
\ No newline at end of file
+    assert set(colores) == {(255,0,0),(0,255,0)}
+
+@pytest.mark.parametrize("engine", ['numpy', 'sklearn'])
+def test_extraer_colores_engines(engine):
+    if engine == 'sklearn':
+        pytest.importorskip("sklearn")
+    img = create_test_image([(255,0,0),(0,255,0),(0,0,255)], size=(90,30))
+    colores = extraer_colores_dominantes(img, n_colors=3, resize_for_speed=False, engine=engine)
+    assert set(colores) == {(255,0,0),(0,255,0),(0,0,255)}
+
+
+def test_extraer_colores_engine_invalido():
+    img = create_test_image([(255,0,0),(0,255,0)], size=(10,10))
+    with pytest.raises(ValueError):
+        extraer_colores_dominantes(img, n_colors=2, engine='inexistente')
+
+
+def test_histograma_cuantizado_conteos_y_medias():
+    from logic.clustering import histograma_cuantizado
+    pixels = np.array([(255, 0, 0)] * 6 + [(250, 2, 1)] * 2 + [(0, 0, 255)] * 4, dtype=np.uint8)
+    medios, conteos = histograma_cuantizado(pixels, bits=5)
+    # (255,0,0) y (250,2,1) caen en el mismo bin de 5 bits
+    assert conteos.sum() == len(pixels)
+    orden = np.argsort(conteos)
+    assert conteos[orden].tolist() == [4, 8]
+    assert np.allclose(medios[orden[1]], [253.75, 0.5, 0.25])
+    assert np.allclose(medios[orden[0]], [0, 0, 255])
+
+
+def test_extraer_colores_modo_histograma():
+    img = create_test_image([(255,0,0),(0,255,0),(0,0,255),(40,40,40)], size=(80,20))
+    colores = extraer_colores_dominantes(img, n_colors=4, resize_for_speed=False, mode='histogram')
+    assert set(colores) == {(255,0,0),(0,255,0),(0,0,255),(40,40,40)}
+
+
+def test_extraer_colores_histograma_determinista():
+    rng = np.random.default_rng(3)
+    img = Image.fromarray(rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8))
+    a = extraer_colores_dominantes(img, n_colors=6, mode='histogram', quant_bits=6)
+    b = extraer_colores_dominantes(img, n_colors=6, mode='histogram', quant_bits=6)
+    assert a == b and len(a) == 6
+
+
+def test_extraer_colores_n_jobs_identico():
+    rng = np.random.default_rng(11)
+    img = Image.fromarray(rng.integers(0, 256, size=(150, 150, 3), dtype=np.uint8))
+    assert extraer_colores_dominantes(img, n_colors=7, n_jobs=4) == extraer_colores_dominantes(img, n_colors=7)
+
+
+def test_paleta_detallada_conteos_imagen_completa():
+    from logic.clustering import extraer_paleta_detallada
+    # 3/4 rojo, 1/4 azul; la extracción usa la versión reducida pero los conteos la completa
+    arr = np.zeros((400, 400, 3), dtype=np.uint8)
+    arr[:, :300] = (255, 0, 0)
+    arr[:, 300:] = (0, 0, 255)
+    res = extraer_paleta_detallada(Image.fromarray(arr), n_colors=2, tamano_bloque=5000)
+    por_color = dict(zip(res.colores, res.conteos.tolist()))
+    assert por_color == {(255, 0, 0): 120000, (0, 0, 255): 40000}
+    assert np.allclose(res.distancia_media, 0.0)
+    ordenado = res.ordenado()
+    assert ordenado.colores == [(255, 0, 0), (0, 0, 255)]
+    assert np.allclose(ordenado.pesos, [0.75, 0.25])
+
+
+def test_paleta_detallada_independiente_del_bloque():
+    from logic.clustering import extraer_paleta_detallada
+    rng = np.random.default_rng(5)
+    img = Image.fromarray(rng.integers(0, 256, size=(90, 130, 3), dtype=np.uint8))
+    a = extraer_paleta_detallada(img, n_colors=4, tamano_bloque=777)
+    b = extraer_paleta_detallada(img, n_colors=4, tamano_bloque=10**6)
+    assert a.colores == b.colores
+    assert np.array_equal(a.conteos, b.conteos)
+    assert a.conteos.sum() == 90 * 130
+    assert np.allclose(a.distancia_media, b.distancia_media)
+    # Distancia media recalculada a mano con la matriz completa
+    pixels = np.asarray(img).reshape(-1, 3).astype(float)
+    d = np.sqrt(((pixels[:, None, :] - np.array(a.colores, dtype=float)[None]) ** 2).sum(axis=2))
+    etiquetas = d.argmin(axis=1)
+    esperadas = [d[etiquetas == i, i].mean() for i in range(4)]
+    assert np.allclose(a.distancia_media, esperadas, rtol=1e-4)
+
+
+def test_paleta_detallada_a_parametros(tmp_path):
+    import json
+    from logic.clustering import extraer_paleta_detallada_archivo
+    from data.models import Paleta
+    arr = np.zeros((100, 100, 3), dtype=np.uint8)
+    arr[:20] = (0, 255, 0)
+    path = str(tmp_path / "img.png")
+    Image.fromarray(arr).save(path)
+    res = extraer_paleta_detallada_archivo(path, n_colors=2).ordenado()
+    paleta = Paleta(nombre="P", colores=res.colores, parametros=res.a_parametros())
+    assert paleta.pesos == pytest.approx([0.8, 0.2])
+    recargada = Paleta.from_dict(json.loads(json.dumps(paleta.to_dict())))
+    assert recargada.pesos == paleta.pesos
+    assert recargada.parametros['conteos'] == [8000, 2000]
+
+
+@pytest.mark.parametrize("engine", ['median_cut', 'octree', 'pillow_mediancut', 'pillow_octree'])
+@pytest.mark.parametrize("mode", ['sample', 'histogram'])
+def test_motores_rapidos(engine, mode):
+    img = create_test_image([(255,0,0),(0,255,0),(0,0,255),(40,40,40)], size=(80,20))
+    colores = extraer_colores_dominantes(img, n_colors=4, resize_for_speed=False, engine=engine, mode=mode)
+    assert set(colores) == {(255,0,0),(0,255,0),(0,0,255),(40,40,40)}
+
+
+@pytest.mark.parametrize("engine", ['median_cut', 'octree', 'pillow_mediancut', 'pillow_octree'])
+def test_motores_rapidos_numero_de_colores(engine):
+    rng = np.random.default_rng(5)
+    img = Image.fromarray(rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8))
+    colores = extraer_colores_dominantes(img, n_colors=8, engine=engine, color_space='oklab')
+    assert 1 <= len(colores) <= 8
+    assert all(0 <= ch <= 255 for c in colores for ch in c)
+
+
+def test_registrar_motor():
+    from logic.motores import MOTORES, registrar_motor
+    llamadas = []
+
+    def motor_fijo(sample, n_colors, weights=None, n_jobs=None, executor=None):
+        llamadas.append(sample.shape)
+        return np.array([[10.0, 20.0, 30.0]])
+
+    registrar_motor('fijo', motor_fijo)
+    try:
+        img = create_test_image([(255,0,0),(0,255,0)], size=(10,10))
+        assert extraer_colores_dominantes(img, n_colors=2, engine='fijo') == [(10, 20, 30)]
+        assert llamadas
+    finally:
+        del MOTORES['fijo']
+
+
+def test_comparar_motores():
+    from logic.clustering import comparar_motores
+    img = create_test_image([(255,0,0),(0,255,0),(0,0,255)], size=(90,30))
+    metricas = comparar_motores(img, n_colors=3, motores=['numpy', 'median_cut', 'octree'])
+    assert [m.motor for m in metricas] == ['numpy', 'median_cut', 'octree']
+    for m in metricas:
+        assert m.segundos >= 0
+        # Paleta exacta: cada píxel coincide con su color
+        assert m.error_medio == pytest.approx(0.0, abs=1e-3)
+
+
+def _imagen_manchas(n, seed=0):
+    # n colores bien separados en manchas, con algo de ruido
+    rng = np.random.default_rng(seed)
+    base = np.array([(230, 30, 30), (30, 200, 40), (20, 40, 220), (240, 230, 60), (30, 30, 30), (200, 80, 220)])[:n]
+    etiquetas = rng.integers(0, n, size=(12, 12)).repeat(10, axis=0).repeat(10, axis=1)
+    arr = base[etiquetas] + rng.normal(0, 4, size=(120, 120, 3))
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+@pytest.mark.parametrize("criterio", ['silhouette', 'elbow'])
+@pytest.mark.parametrize("n", [3, 5])
+def test_seleccionar_n_colores(criterio, n):
+    from logic.clustering import seleccionar_n_colores
+    sel = seleccionar_n_colores(_imagen_manchas(n), criterio=criterio)
+    assert sel.n_colors == n
+    assert len(sel.colores) == n
+    assert sel.ks == list(range(2, 17))
+    assert len(sel.puntuaciones) == len(sel.inercias) == 15
+    # La inercia no crece al añadir centros (arranque en caliente desde k - 1)
+    assert all(b <= a + 1e-6 for a, b in zip(sel.inercias, sel.inercias[1:]))
+
+
+@pytest.mark.parametrize("mode", ['sample', 'histogram'])
+def test_extraer_n_colores_auto(mode):
+    colores = extraer_colores_dominantes(_imagen_manchas(4), n_colors='auto', mode=mode)
+    assert len(colores) == 4
+
+
+def test_n_colores_auto_pocos_colores():
+    img = create_test_image([(255,0,0),(0,255,0)], size=(20,20))
+    assert set(extraer_colores_dominantes(img, n_colors='auto')) == {(255,0,0),(0,255,0)}
+
+
+def test_n_colores_auto_opciones_invalidas():
+    img = create_test_image([(255,0,0),(0,255,0)], size=(10,10))
+    with pytest.raises(ValueError):
+        extraer_colores_dominantes(img, n_colors='auto', engine='octree')
+    with pytest.raises(ValueError):
+        extraer_colores_dominantes(img, n_colors='muchos')
+    from logic.clustering import seleccionar_n_colores
+    with pytest.raises(ValueError):
+        seleccionar_n_colores(_imagen_manchas(3), criterio='gap')
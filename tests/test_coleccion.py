@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from data.coleccion import PaletteCollection
+from data.models import Paleta
+from data.project_io import cargar_coleccion_columnar, guardar_coleccion_paletas
+from logic.color_utils import adjust_palette_hsv
+
+
+@pytest.fixture
+def paletas():
+    return [
+        Paleta(nombre="a", colores=[(255, 0, 0), (0, 128, 255)], armonia_tipo="triadas"),
+        Paleta(nombre="b", colores=[], origen_imagen_path="img.png"),
+        Paleta(nombre="c", colores=[(10, 20, 30), (128, 128, 128), (250, 240, 5)], parametros={'pesos': [0.5, 0.3, 0.2]}),
+        Paleta(nombre="d", colores=[(1, 2, 3)], armonia_tipo="triadas", archivo_guardado="d.json"),
+    ]
+
+
+def test_ida_y_vuelta_con_paletas_y_dicts(paletas):
+    coleccion = PaletteCollection.from_paletas(paletas)
+    assert len(coleccion) == 4 and coleccion.rgb.shape == (6, 3)
+    assert coleccion.offsets.tolist() == [0, 2, 2, 5, 6] and coleccion.n_colores.tolist() == [2, 0, 3, 1]
+    assert coleccion.to_paletas() == paletas
+    assert PaletteCollection.from_dicts(p.to_dict() for p in paletas).to_paletas() == paletas
+    assert coleccion[-1] == paletas[-1] and coleccion.paleta(2).pesos == [0.5, 0.3, 0.2]
+    with pytest.raises(IndexError):
+        coleccion.paleta(4)
+
+
+def test_slice_sin_copias(paletas):
+    coleccion = PaletteCollection.from_paletas(paletas)
+    parte = coleccion[1:3]
+    assert [p.nombre for p in parte] == ["b", "c"] and parte.offsets.tolist() == [0, 0, 3]
+    assert np.shares_memory(parte.rgb, coleccion.rgb) and np.shares_memory(parte.columna('nombre'), coleccion.columna('nombre'))
+    assert not parte.rgb.flags.writeable
+    assert len(coleccion[3:1]) == 0
+    assert [p.nombre for p in coleccion[::-2]] == ["d", "b"]
+
+
+def test_paleta_no_comparte_parametros(paletas):
+    coleccion = PaletteCollection.from_paletas(paletas)
+    paleta = coleccion[2]
+    paleta.apply_hsv_shift(5)
+    assert 'hsv_shift' in paleta.parametros
+    assert coleccion.columna('parametros')[2] == {'pesos': [0.5, 0.3, 0.2]}
+    assert coleccion[2:3][0].parametros == {'pesos': [0.5, 0.3, 0.2]}
+
+
+def test_filtrar_y_medias(paletas):
+    coleccion = PaletteCollection.from_paletas(paletas)
+    triadas = coleccion.filtrar(lambda c: c.columna('armonia_tipo') == 'triadas')
+    assert triadas.to_paletas() == [paletas[0], paletas[3]]
+    medias = coleccion.medias()
+    assert np.allclose(medias[[0, 2, 3]], [np.mean(p.rgb, axis=0) for p in (paletas[0], paletas[2], paletas[3])])
+    assert np.isnan(medias[1]).all()
+    # Filtrar por un atributo calculado: paletas con rojo medio alto
+    assert [p.nombre for p in coleccion.filtrar(medias[:, 0] > 100)] == ["a", "c"]
+    with pytest.raises(ValueError):
+        coleccion.filtrar(np.ones(3, dtype=bool))
+
+
+def test_ajustar_hsv_identico_a_adjust_palette_hsv(paletas, monkeypatch):
+    import data.coleccion as coleccion_mod
+    # Bloques pequeños para cubrir el recorrido por bloques
+    monkeypatch.setattr(coleccion_mod, 'COLORES_POR_BLOQUE', 4)
+    coleccion = PaletteCollection.from_paletas(paletas)
+    ajustada = coleccion.ajustar_hsv(40, -20, 10)
+    for original, nueva in zip(paletas, ajustada):
+        assert nueva.colores == adjust_palette_hsv(original.colores, 40, -20, 10)
+        assert nueva.nombre == original.nombre
+    # Un desplazamiento por paleta
+    matices = np.array([0, 90, 180, 270])
+    por_paleta = coleccion[1:].ajustar_hsv(hue_shift_deg=matices[1:])
+    for original, nueva, h in zip(paletas[1:], por_paleta, matices[1:]):
+        assert nueva.colores == adjust_palette_hsv(original.colores, h)
+    assert coleccion.to_paletas() == paletas
+    with pytest.raises(ValueError):
+        coleccion.ajustar_hsv(hue_shift_deg=matices[:2])
+
+
+def test_cargar_coleccion_columnar(paletas, tmp_path):
+    path = str(tmp_path / "coleccion.json")
+    guardar_coleccion_paletas(paletas, path)
+    coleccion = cargar_coleccion_columnar(path)
+    assert coleccion.to_paletas() == paletas
+    guardar_coleccion_paletas(coleccion, path)
+    assert cargar_coleccion_columnar(path).to_paletas() == paletas
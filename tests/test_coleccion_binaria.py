@@ -0,0 +1,92 @@
+import json
+import numpy as np
+import pytest
+from data.coleccion_binaria import (
+    ColeccionBinaria, binaria_a_json, guardar_coleccion_binaria, json_a_binaria
+)
+from data.models import Paleta
+from data.project_io import guardar_coleccion_paletas, guardar_coleccion_paletas_incremental
+
+
+@pytest.fixture
+def paletas():
+    return [
+        Paleta(nombre="a ñ", colores=[(255, 0, 0), (0, 128, 255)], armonia_tipo="triadas",
+               parametros={'pesos': [0.6, 0.4]}),
+        Paleta(nombre="b", colores=[], origen_imagen_path="img.png"),
+        Paleta(nombre="c", colores=[(1, 2, 3)], archivo_guardado="c.json"),
+    ]
+
+
+def test_acceso_aleatorio(paletas, tmp_path):
+    path = str(tmp_path / "coleccion.bin")
+    assert guardar_coleccion_binaria(iter(paletas), path) == 3
+    coleccion = ColeccionBinaria(path)
+    assert len(coleccion) == 3 and list(coleccion) == paletas
+    assert coleccion[-1] == paletas[2] and coleccion.paleta(0).pesos == [0.6, 0.4]
+    # Los colores son una vista del archivo mapeado; las Paleta tienen su propia copia
+    colores = coleccion.colores(0)
+    assert not colores.flags.writeable and not colores.flags.owndata
+    assert colores.tolist() == [[255, 0, 0], [0, 128, 255]] and coleccion.colores(1).shape == (0, 3)
+    assert coleccion.paleta(0)._rgb.flags.owndata
+    assert coleccion.metadatos(1)['origen_imagen_path'] == "img.png"
+    assert coleccion.to_coleccion().to_paletas() == paletas
+    with pytest.raises(IndexError):
+        coleccion.paleta(3)
+
+
+@pytest.mark.parametrize("compacto", [False, True])
+def test_conversion_json_sin_perdidas(paletas, tmp_path, compacto):
+    original, binario, vuelta = (str(tmp_path / n) for n in ("original.json", "coleccion.bin", "vuelta.json"))
+    guardar_coleccion_paletas_incremental(paletas, original, compacto=compacto)
+    assert json_a_binaria(original, binario) == 3
+    assert binaria_a_json(binario, vuelta, compacto=compacto) == 3
+    with open(original, encoding='utf-8') as a, open(vuelta, encoding='utf-8') as b:
+        assert a.read() == b.read()
+
+
+def test_conversion_conserva_campos_y_orden(tmp_path):
+    # JSON escrito a mano: claves en otro orden, campos ausentes y claves desconocidas
+    datos = [{'colores': [[1, 2, 3]], 'nombre': 'x', 'extra': [1, {'a': None}]}, {'nombre': 'sin colores'}]
+    original, binario, vuelta = (str(tmp_path / n) for n in ("original.json", "coleccion.bin", "vuelta.json"))
+    with open(original, 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+    json_a_binaria(original, binario)
+    binaria_a_json(binario, vuelta)
+    with open(vuelta, encoding='utf-8') as f:
+        cargados = json.load(f)
+    assert cargados == datos and [list(d) for d in cargados] == [list(d) for d in datos]
+    assert ColeccionBinaria(binario).paleta(1) == Paleta(nombre='sin colores', colores=[])
+
+
+def test_archivos_no_validos(paletas, tmp_path):
+    guardar_coleccion_paletas(paletas, str(tmp_path / "coleccion.json"))
+    with pytest.raises(ValueError):
+        ColeccionBinaria(str(tmp_path / "coleccion.json"))
+    path = tmp_path / "coleccion.bin"
+    guardar_coleccion_binaria(paletas, str(path))
+    contenido = path.read_bytes()
+    path.write_bytes(contenido[:-5])
+    with pytest.raises(ValueError):
+        ColeccionBinaria(str(path))
+    guardar_coleccion_binaria([], str(path))
+    assert len(ColeccionBinaria(str(path))) == 0
+
+
+def test_reescribir_una_coleccion_abierta(paletas, tmp_path):
+    path = str(tmp_path / "coleccion.bin")
+    guardar_coleccion_binaria(paletas, path)
+    coleccion = ColeccionBinaria(path)
+    # Sobre sí misma, desde el archivo mapeado: el anterior no se trunca mientras se lee
+    assert guardar_coleccion_binaria(coleccion.to_coleccion()[::-1], path) == 3
+    assert list(coleccion) == paletas
+    assert list(ColeccionBinaria(path)) == paletas[::-1]
+    assert not (tmp_path / "coleccion.bin.tmp").exists()
+
+    def fallan():
+        yield paletas[0]
+        raise RuntimeError("fallo a mitad")
+    with pytest.raises(RuntimeError):
+        guardar_coleccion_binaria(fallan(), path)
+    assert list(ColeccionBinaria(path)) == paletas[::-1]
+    assert not (tmp_path / "coleccion.bin.tmp").exists()
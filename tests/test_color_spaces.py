@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+from PIL import Image
+from logic.color_spaces import rgb_a_oklab, oklab_a_rgb, rgb_a_lab, lab_a_rgb, desde_rgb, a_rgb
+from logic.clustering import extraer_colores_dominantes
+
+PRIMARIOS = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255], [255, 255, 255], [0, 0, 0]], dtype=np.uint8)
+
+# Valores de referencia publicados (Ottosson para OKLab, CIE D65 2° para Lab)
+OKLAB_REF = np.array([
+    [0.627955, 0.224863, 0.125846],
+    [0.866440, -0.233888, 0.179498],
+    [0.452014, -0.032457, -0.311528],
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0],
+])
+LAB_REF = np.array([
+    [53.2408, 80.0925, 67.2032],
+    [87.7347, -86.1827, 83.1793],
+    [32.2970, 79.1875, -107.8602],
+    [100.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0],
+])
+
+
+@pytest.mark.parametrize("entrada", [PRIMARIOS, PRIMARIOS.astype(np.float64)])
+def test_valores_de_referencia(entrada):
+    assert np.allclose(rgb_a_oklab(entrada), OKLAB_REF, atol=1e-4)
+    assert np.allclose(rgb_a_lab(entrada), LAB_REF, atol=1e-2)
+
+
+def test_referencias_a_rgb():
+    assert np.allclose(oklab_a_rgb(OKLAB_REF), PRIMARIOS, atol=0.05)
+    assert np.allclose(lab_a_rgb(LAB_REF), PRIMARIOS, atol=0.05)
+
+
+@pytest.mark.parametrize("espacio", ['oklab', 'lab'])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_ida_y_vuelta_exacta_uint8(espacio, dtype):
+    rng = np.random.default_rng(0)
+    # Más de un bloque de la ruta rápida, para cubrir también el bloque final incompleto
+    pixels = rng.integers(0, 256, size=(100_003, 3), dtype=np.uint8)
+    conv = rgb_a_oklab if espacio == 'oklab' else rgb_a_lab
+    vuelta = a_rgb(conv(pixels, dtype=dtype), espacio)
+    assert np.array_equal(np.round(vuelta).astype(np.uint8), pixels)
+
+
+@pytest.mark.parametrize("espacio", ['oklab', 'lab'])
+def test_ruta_uint8_coincide_con_float(espacio):
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, size=(20, 30, 3), dtype=np.uint8)
+    rapida = desde_rgb(pixels, espacio)
+    assert rapida.shape == (20, 30, 3)
+    assert np.allclose(rapida, desde_rgb(pixels.astype(np.float32), espacio), atol=1e-4)
+
+
+def test_recorte_de_gamut():
+    # Colores Lab/OKLab sin equivalente sRGB: el resultado queda dentro de 0-255
+    fuera = a_rgb(np.array([[50.0, 120.0, -120.0], [100.0, -128.0, 127.0]]), 'lab')
+    assert fuera.min() >= 0 and fuera.max() <= 255
+    fuera = a_rgb(np.array([[0.7, 0.4, 0.4], [1.2, 0.0, 0.0]]), 'oklab')
+    assert fuera.min() >= 0 and fuera.max() <= 255
+    assert np.allclose(fuera[1], 255)
+
+
+def test_espacio_invalido():
+    with pytest.raises(ValueError):
+        desde_rgb(PRIMARIOS, 'hsv')
+    with pytest.raises(ValueError):
+        extraer_colores_dominantes(Image.new('RGB', (10, 10)), color_space='hsv')
+
+
+@pytest.mark.parametrize("espacio", ['oklab', 'lab'])
+@pytest.mark.parametrize("mode", ['sample', 'histogram'])
+def test_extraer_en_espacio_perceptual(espacio, mode):
+    arr = np.zeros((60, 90, 3), dtype=np.uint8)
+    arr[:, :30] = (200, 30, 40)
+    arr[:, 30:60] = (20, 160, 90)
+    arr[:, 60:] = (240, 240, 230)
+    colores = extraer_colores_dominantes(Image.fromarray(arr), n_colors=3, mode=mode, color_space=espacio)
+    assert set(colores) == {(200, 30, 40), (20, 160, 90), (240, 240, 230)}
@@ -62,3 +62,76 @@ def test_adjust_palette_hsv(palette, shift_h, shift_s, shift_v):
     for orig, new in zip(palette, result):
         expected = adjust_color_hsv(orig, hue_shift_deg=shift_h, sat_offset_pct=shift_s, val_offset_pct=shift_v)
         assert new == expected
+
+
+import colorsys
+import numpy as np
+from logic.color_utils import rgb_to_hsv_array, hsv_to_rgb_array, adjust_hsv_array
+
+
+def _ref_hsv_to_rgb(hsv):
+    # Implementación original por tuplas sobre colorsys, como referencia
+    h, s, v = hsv
+    h = h % 1.0
+    s = max(0.0, min(s, 1.0))
+    v = max(0.0, min(v, 1.0))
+    return tuple(max(0, min(int(round(c * 255)), 255)) for c in colorsys.hsv_to_rgb(h, s, v))
+
+
+def _ref_adjust(color, hue, sat, val):
+    h, s, v = colorsys.rgb_to_hsv(*(c / 255.0 for c in color))
+    if s == 0.0:
+        if val == 0.0:
+            return tuple(color)
+        gray = int(round(max(0.0, min(v + val / 100.0, 1.0)) * 255))
+        return (gray, gray, gray)
+    h_new = (h + hue / 360.0) % 1.0
+    s_new = max(0.0, min(s + sat / 100.0, 1.0))
+    v_new = max(0.0, min(v + val / 100.0, 1.0))
+    return _ref_hsv_to_rgb((h_new, s_new, v_new))
+
+
+def _colores_prueba(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    colores = rng.integers(0, 256, size=(n, 3), dtype=np.uint8)
+    # Incluir grises y colores con canales repetidos (empates en el máximo)
+    grises = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+    empates = colores.copy()
+    empates[:, 1] = empates[:, 0]
+    return np.concatenate([colores, grises, empates])
+
+
+def test_rgb_to_hsv_array_identico_a_colorsys():
+    colores = _colores_prueba()
+    hsv = rgb_to_hsv_array(colores)
+    ref = np.array([colorsys.rgb_to_hsv(*(c / 255.0 for c in color)) for color in colores.tolist()])
+    assert np.array_equal(hsv, ref)
+
+
+def test_hsv_to_rgb_array_identico():
+    rng = np.random.default_rng(1)
+    hsv = rng.uniform(-0.5, 1.5, size=(20000, 3))
+    # Valores exactos de frontera: h = k/6, s = 0, casi 1
+    hsv[:600, 0] = np.repeat(np.arange(6) / 6.0, 100)
+    hsv[600:700, 1] = 0.0
+    hsv[700:800, 0] = np.nextafter(1.0, 0.0)
+    ref = np.array([_ref_hsv_to_rgb(t) for t in hsv.tolist()])
+    assert np.array_equal(hsv_to_rgb_array(hsv), ref)
+
+
+@pytest.mark.parametrize("hue, sat, val", [
+    (0, 0, 0), (180, 0, 0), (90, 20, -20), (-30, 50, 10), (0, 50, 0), (0, 0, -100), (359.9, -100, 100),
+])
+def test_adjust_hsv_array_identico(hue, sat, val):
+    colores = _colores_prueba(5000)
+    ref = np.array([_ref_adjust(c, hue, sat, val) for c in colores.tolist()])
+    assert np.array_equal(adjust_hsv_array(colores, hue, sat, val), ref)
+    assert adjust_palette_hsv([tuple(c) for c in colores[:50].tolist()], hue, sat, val) == [tuple(c) for c in ref[:50].tolist()]
+
+
+def test_adjust_hsv_array_desplazamientos_por_color():
+    colores = np.array([(200, 100, 50), (128, 128, 128), (10, 20, 30)], dtype=np.uint8)
+    hue = np.array([30.0, 0.0, -45.0])
+    val = np.array([0.0, 10.0, -5.0])
+    esperado = [adjust_color_hsv(tuple(c), h, 0.0, v) for c, h, v in zip(colores.tolist(), hue, val)]
+    assert [tuple(c) for c in adjust_hsv_array(colores, hue, 0.0, val).tolist()] == esperado
@@ -0,0 +1,76 @@
+import pytest
+from PIL import Image
+import numpy as np
+from logic.decoding import iterar_franjas_rgb, abrir_proxy
+from logic.clustering import extraer_colores_dominantes_archivo
+
+
+def _imagen_aleatoria(size=(80, 100), seed=0):
+    rng = np.random.default_rng(seed)
+    w, h = size
+    return rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("ext, kwargs", [
+    ('tif', {}),                            # TIFF sin comprimir: franjas por offset
+    ('bmp', {}),                            # BMP: filas almacenadas de abajo a arriba
+    ('ppm', {}),
+    ('png', {}),                            # formato comprimido: carga única y recorte por franjas
+    ('tif', {'compression': 'tiff_lzw'}),
+])
+def test_franjas_reconstruyen_imagen(tmp_path, ext, kwargs):
+    arr = _imagen_aleatoria()
+    path = str(tmp_path / f"img.{ext}")
+    Image.fromarray(arr).save(path, **kwargs)
+    franjas = list(iterar_franjas_rgb(path, filas=16))
+    assert len(franjas) == 7
+    assert [y0 for y0, _ in franjas] == list(range(0, 100, 16))
+    assert np.array_equal(np.concatenate([f for _, f in franjas]), arr)
+
+
+def test_franjas_modo_paleta(tmp_path):
+    arr = _imagen_aleatoria()
+    path = str(tmp_path / "img.bmp")
+    Image.fromarray(arr).convert('P').save(path)
+    esperado = np.asarray(Image.open(path).convert('RGB'))
+    completo = np.concatenate([f for _, f in iterar_franjas_rgb(path, filas=10)])
+    assert np.array_equal(completo, esperado)
+
+
+@pytest.mark.parametrize("ext", ['tif', 'jpg', 'png'])
+def test_proxy_tamano_y_color_medio(tmp_path, ext):
+    # Degradado suave para que draft JPEG y la reducción por bloques sean comparables
+    x = np.linspace(0, 255, 1600)
+    y = np.linspace(0, 255, 1200)
+    arr = np.stack([
+        np.broadcast_to(x[None, :], (1200, 1600)),
+        np.broadcast_to(y[:, None], (1200, 1600)),
+        np.full((1200, 1600), 90.0),
+    ], axis=-1).astype(np.uint8)
+    path = str(tmp_path / f"grande.{ext}")
+    Image.fromarray(arr).save(path)
+    proxy = abrir_proxy(path, max_size=200)
+    assert proxy.mode == 'RGB'
+    assert proxy.size == (200, 150)
+    media = np.asarray(proxy).reshape(-1, 3).mean(axis=0)
+    assert np.allclose(media, arr.reshape(-1, 3).mean(axis=0), atol=3)
+
+
+def test_extraer_desde_archivo(tmp_path):
+    arr = np.zeros((400, 600, 3), dtype=np.uint8)
+    arr[:, :300] = (255, 0, 0)
+    arr[:, 300:] = (0, 0, 255)
+    path = str(tmp_path / "dos.tif")
+    Image.fromarray(arr).save(path)
+    colores = extraer_colores_dominantes_archivo(path, n_colors=2)
+    assert set(colores) == {(255, 0, 0), (0, 0, 255)}
+
+
+def test_extraer_desde_archivo_reservorio(tmp_path):
+    arr = np.zeros((300, 300, 3), dtype=np.uint8)
+    arr[:100] = (255, 255, 0)
+    arr[100:] = (0, 128, 0)
+    path = str(tmp_path / "dos.bmp")
+    Image.fromarray(arr).save(path)
+    colores = extraer_colores_dominantes_archivo(path, n_colors=2, sampler='reservoir')
+    assert set(colores) == {(255, 255, 0), (0, 128, 0)}
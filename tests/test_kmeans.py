@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+from logic.kmeans import kmeans
+
+
+def _blobs(centros, n_por_blob=300, sigma=4.0, seed=0):
+    rng = np.random.default_rng(seed)
+    centros = np.asarray(centros, dtype=float)
+    puntos = [c + rng.normal(0, sigma, size=(n_por_blob, centros.shape[1])) for c in centros]
+    return np.concatenate(puntos)
+
+
+def test_kmeans_separa_blobs():
+    centros = [(250, 10, 10), (10, 250, 10), (10, 10, 250), (128, 128, 128)]
+    X = _blobs(centros)
+    res = kmeans(X, n_clusters=4)
+    encontrados = sorted(map(tuple, np.round(res.centros, -1).astype(int)))
+    assert encontrados == sorted(map(tuple, np.round(centros, -1).astype(int)))
+    assert np.bincount(res.etiquetas).tolist() == [300, 300, 300, 300]
+
+
+def test_kmeans_determinista():
+    X = np.random.default_rng(1).uniform(0, 255, size=(2000, 3))
+    a = kmeans(X, n_clusters=6, random_state=42)
+    b = kmeans(X, n_clusters=6, random_state=42)
+    assert np.array_equal(a.centros, b.centros)
+    assert np.array_equal(a.etiquetas, b.etiquetas)
+    assert a.inercia == b.inercia
+
+
+def test_kmeans_no_usa_rng_global():
+    X = np.random.default_rng(2).uniform(0, 255, size=(1000, 3))
+    np.random.seed(0)
+    a = kmeans(X, n_clusters=5)
+    np.random.seed(123)
+    b = kmeans(X, n_clusters=5)
+    assert np.array_equal(a.centros, b.centros)
+
+
+def test_kmeans_inercia_comparable_a_sklearn():
+    sklearn_cluster = pytest.importorskip("sklearn.cluster")
+    X = _blobs([(200, 30, 30), (30, 200, 30), (30, 30, 200), (220, 220, 40), (90, 90, 90)], sigma=15.0)
+    res = kmeans(X, n_clusters=5)
+    ref = sklearn_cluster.KMeans(n_clusters=5, random_state=42, n_init=10).fit(X)
+    assert res.inercia == pytest.approx(ref.inertia_, rel=1e-3)
+
+
+def test_kmeans_valida_n_clusters():
+    X = np.zeros((3, 3))
+    with pytest.raises(ValueError):
+        kmeans(X, n_clusters=4)
+    with pytest.raises(ValueError):
+        kmeans(X, n_clusters=0)
+
+
+def test_importar_clustering_no_carga_sklearn():
+    codigo = "import sys, logic.clustering; print('sklearn' in sys.modules)"
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True, cwd=raiz)
+    assert out.stdout.strip() == 'False'
+
+
+def test_kmeans_pesos_equivalen_a_repetir_muestras():
+    rng = np.random.default_rng(4)
+    unicos = rng.uniform(0, 255, size=(200, 3))
+    repeticiones = rng.integers(1, 6, size=200)
+    ponderado = kmeans(unicos, n_clusters=4, sample_weight=repeticiones)
+    expandido = np.repeat(unicos, repeticiones, axis=0)
+    # La inercia ponderada es la inercia de las muestras repetidas con esos mismos centros
+    d = ((expandido[:, None, :] - ponderado.centros[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    assert ponderado.inercia == pytest.approx(d.sum(), rel=1e-4)
+    ref = kmeans(expandido, n_clusters=4)
+    assert ponderado.inercia == pytest.approx(ref.inercia, rel=0.05)
+
+
+def test_kmeans_paralelo_identico_a_serie():
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    X = _blobs([(200, 30, 30), (30, 200, 30), (30, 30, 200), (90, 90, 90)], sigma=30.0)
+    serie = kmeans(X, n_clusters=6)
+    hilos = kmeans(X, n_clusters=6, n_jobs=4)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        ejecutor_hilos = kmeans(X, n_clusters=6, executor=pool)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        procesos = kmeans(X, n_clusters=6, executor=pool)
+    for res in (hilos, ejecutor_hilos, procesos):
+        assert np.array_equal(res.centros, serie.centros)
+        assert np.array_equal(res.etiquetas, serie.etiquetas)
+        assert res.inercia == serie.inercia
+
+
+def test_barrido_kmeans_y_silueta():
+    from logic.kmeans import barrido_kmeans
+    X = _blobs([(250, 10, 10), (10, 250, 10), (10, 10, 250), (128, 128, 128)], n_por_blob=200)
+    resultados, siluetas = barrido_kmeans(X, k_min=2, k_max=8)
+    assert [r.centros.shape[0] for r in resultados] == list(range(2, 9))
+    # La silueta simplificada es máxima en el número real de grupos
+    assert int(np.argmax(siluetas)) + 2 == 4
+    assert all(-1.0 <= s <= 1.0 for s in siluetas)
+
+
+def test_kmeans_arranque_en_caliente_conserva_indices():
+    centros = [(250, 10, 10), (10, 250, 10), (10, 10, 250)]
+    X = _blobs(centros)
+    iniciales = np.array([(10, 10, 200), (200, 10, 10), (10, 200, 10)], dtype=float)
+    res = kmeans(X, n_clusters=3, centros_iniciales=iniciales)
+    assert np.abs(res.centros - np.array(centros)[[2, 0, 1]]).max() < 2
+    assert res.n_iter <= 3
+    with pytest.raises(ValueError):
+        kmeans(X, n_clusters=3, centros_iniciales=iniciales[:2])
@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from PIL import Image
+from data.models import Paleta
+from data.project_io import cargar_coleccion_paletas
+from logic.clustering import extraer_colores_dominantes_archivo
+from logic.lote import InformeLote, listar_imagenes, procesar_lote, rutas_procesadas_jsonl
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def catalogo(tmp_path):
+    rng = np.random.default_rng(0)
+    (tmp_path / "sub").mkdir()
+    rutas = []
+    for nombre in ("b.png", "a.jpg", "sub/c.bmp"):
+        path = str(tmp_path / nombre)
+        Image.fromarray(rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8)).save(path)
+        rutas.append(path)
+    (tmp_path / "notas.txt").write_text("no es una imagen")
+    return tmp_path
+
+
+def test_listar_imagenes_recursivo_y_ordenado(catalogo):
+    rutas = list(listar_imagenes([str(catalogo)]))
+    assert [os.path.relpath(r, catalogo) for r in rutas] == ["a.jpg", "b.png", os.path.join("sub", "c.bmp")]
+
+
+def test_rutas_procesadas_ignora_errores_y_linea_cortada(tmp_path):
+    path = tmp_path / "salida.jsonl"
+    path.write_text('{"path": "a.png", "colores": [[1, 2, 3]]}\n'
+                    '{"path": "b.png", "error": "OSError: x"}\n'
+                    '{"path": "c.png", "colo')
+    assert rutas_procesadas_jsonl(str(path)) == {"a.png"}
+
+
+def test_procesar_lote_resultados_errores_y_omitidas(catalogo):
+    rutas = list(listar_imagenes([str(catalogo)])) + [str(catalogo / "no_existe.png")]
+    informe = InformeLote()
+    registros = list(procesar_lote(rutas, n_colors=3, n_procesos=1, omitir={rutas[0]}, informe=informe))
+    por_ruta = {r['path']: r for r in registros}
+    assert set(por_ruta) == set(rutas[1:])
+    assert por_ruta[rutas[1]]['colores'] == [list(c) for c in extraer_colores_dominantes_archivo(rutas[1], 3)]
+    assert set(por_ruta[rutas[1]]['tiempos']) == {'decodificacion', 'clustering'}
+    assert 'error' in por_ruta[rutas[-1]]
+    assert (informe.procesadas, informe.errores, informe.omitidas) == (3, 1, 1)
+    assert informe.imagenes_por_segundo > 0
+    with pytest.raises(ValueError):
+        list(procesar_lote(rutas, engine='inexistente'))
+
+
+def _ejecutar_cli(*args):
+    # El lote no debe cargar Qt: se comprueba en el propio proceso de la CLI
+    codigo = ("import sys, batch; codigo = batch.main(sys.argv[1:]); "
+              "assert 'PySide6' not in sys.modules; sys.exit(codigo)")
+    return subprocess.run([sys.executable, "-c", codigo, *args], cwd=RAIZ, capture_output=True, text=True)
+
+
+def test_cli_jsonl_reanudable_sin_pyside(catalogo, tmp_path):
+    salida = str(tmp_path / "paletas.jsonl")
+    resultado = _ejecutar_cli(str(catalogo), "--salida", salida, "-n", "3", "--procesos", "1")
+    assert resultado.returncode == 0, resultado.stderr
+    assert "img/s" in resultado.stderr and "decodificacion" in resultado.stderr
+    with open(salida, encoding='utf-8') as f:
+        registros = [json.loads(linea) for linea in f]
+    assert len(registros) == 3 and all(len(r['colores']) == 3 for r in registros)
+    # Segunda ejecución: nada nuevo que procesar
+    resultado = _ejecutar_cli(str(catalogo), "--salida", salida, "-n", "3", "--procesos", "1")
+    assert "omitidas: 3" in resultado.stderr
+    with open(salida, encoding='utf-8') as f:
+        assert len(f.readlines()) == 3
+
+
+def test_cli_coleccion(catalogo, tmp_path):
+    coleccion = str(tmp_path / "coleccion.json")
+    lista = tmp_path / "lista.txt"
+    lista.write_text(f"# catálogo\n{catalogo / 'a.jpg'}\n\n{catalogo / 'b.png'}\n")
+    resultado = _ejecutar_cli("--lista", str(lista), "--coleccion", coleccion, "--procesos", "1")
+    assert resultado.returncode == 0, resultado.stderr
+    paletas = cargar_coleccion_paletas(coleccion)
+    assert sorted(p.nombre for p in paletas) == ["a.jpg", "b.png"]
+    resultado = _ejecutar_cli(str(catalogo), "--coleccion", coleccion, "--procesos", "1")
+    assert "omitidas: 2" in resultado.stderr
+    assert len(cargar_coleccion_paletas(coleccion)) == 3
+    assert not os.path.exists(coleccion + ".pendientes.jsonl")
+
+
+def test_cli_coleccion_recupera_pendientes(catalogo, tmp_path):
+    # Una ejecución anterior cortada dejó una paleta en pendientes y una línea a medias
+    coleccion = str(tmp_path / "coleccion.json")
+    previa = Paleta(nombre="a.jpg", colores=[(1, 2, 3)], origen_imagen_path=str(catalogo / 'a.jpg'))
+    with open(coleccion + ".pendientes.jsonl", 'w', encoding='utf-8') as f:
+        f.write(json.dumps(previa.to_dict()) + '\n{"nombre": "b.p')
+    resultado = _ejecutar_cli(str(catalogo), "--coleccion", coleccion, "--procesos", "1")
+    assert resultado.returncode == 0, resultado.stderr
+    assert "omitidas: 1" in resultado.stderr
+    paletas = cargar_coleccion_paletas(coleccion)
+    assert previa in paletas and len(paletas) == 3
+    assert not os.path.exists(coleccion + ".pendientes.jsonl")
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from PIL import Image
+from logic.color_utils import adjust_hsv_array
+from logic.lut import construir_lut, filtro_lut, aplicar_lut, ajustar_imagen_hsv, exportar_ajuste_hsv
+
+AJUSTES = [(0, 0, 0), (180, 0, 0), (30, 20, -10), (-90, -40, 25)]
+
+
+def _imagen_suave(h=64, w=96, seed=0):
+    # Degradados con poco ruido: la LUT interpola bien salvo en saltos bruscos de matiz
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 255, h)[:, None]
+    x = np.linspace(0, 255, w)[None, :]
+    arr = np.stack([np.broadcast_to(x, (h, w)), np.broadcast_to(y, (h, w)), (x + y) / 2], axis=-1)
+    return np.clip(arr + rng.normal(0, 3, size=arr.shape), 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("ajuste", AJUSTES)
+def test_lut_exacta_en_los_nodos(ajuste):
+    # Con 18 nodos la rejilla cae en enteros (paso 15): en los nodos solo difiere del ajuste
+    # exacto en los empates de redondeo (x.5) que introduce guardar la tabla en float32
+    lut = construir_lut(*ajuste, tamano=18)
+    nodos = np.arange(0, 256, 15)
+    colores = np.stack(np.meshgrid(nodos, nodos, nodos, indexing='ij'), axis=-1).reshape(-1, 3).astype(np.uint8)
+    diferencia = np.abs(aplicar_lut(colores, lut).astype(int) - adjust_hsv_array(colores, *ajuste))
+    assert diferencia.max() <= 1
+
+
+@pytest.mark.parametrize("ajuste", AJUSTES)
+def test_lut_aproxima_ajuste_exacto(ajuste):
+    arr = _imagen_suave()
+    exacto = adjust_hsv_array(arr.reshape(-1, 3), *ajuste).reshape(arr.shape).astype(int)
+    numpy_lut = aplicar_lut(arr, construir_lut(*ajuste, tamano=65), tamano_bloque=1000)
+    pillow_lut = np.asarray(ajustar_imagen_hsv(Image.fromarray(arr), *ajuste, tamano=65)).astype(int)
+    assert np.abs(numpy_lut - exacto).mean() < 1.0
+    # Pillow interpola en punto fijo: como mucho una unidad de diferencia con la ruta NumPy
+    assert np.abs(pillow_lut - numpy_lut).max() <= 1
+
+
+def test_cache_de_luts():
+    a = construir_lut(15, 0, 0)
+    assert construir_lut(15.0, 0.0, 0.0) is a
+    assert filtro_lut(15, 0, 0) is filtro_lut(15.0, 0, 0)
+    assert not a.flags.writeable
+    with pytest.raises(ValueError):
+        construir_lut(0, 0, 0, tamano=100)
+
+
+def test_exportar_ajuste_por_franjas(tmp_path):
+    arr = _imagen_suave(h=300, w=120)
+    origen = str(tmp_path / "img.bmp")
+    Image.fromarray(arr).save(origen)
+    destino = exportar_ajuste_hsv(origen, str(tmp_path / "out.png"), 45, 10, 5)
+    resultado = np.asarray(Image.open(destino))
+    esperado = np.asarray(ajustar_imagen_hsv(Image.fromarray(arr), 45, 10, 5, tamano=65))
+    assert np.array_equal(resultado, esperado)
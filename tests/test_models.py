@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from data.models import Paleta
 
 
@@ -61,3 +62,53 @@ def test_post_init_validation():
     # Colores vacíos es permitido
     pal = Paleta(nombre="Empty", colores=[])
     assert pal.colores == []
+
+
+def test_pesos_en_parametros():
+    pal = Paleta(nombre="Sin pesos", colores=[(1, 2, 3)])
+    assert pal.pesos is None
+    pal = Paleta(nombre="Con pesos", colores=[(1, 2, 3), (4, 5, 6)], parametros={'pesos': [0.7, 0.3]})
+    assert pal.pesos == [0.7, 0.3]
+    # Ajustar HSV conserva los pesos, que siguen alineados con los colores
+    assert pal.with_hsv_shift(hue_shift_deg=30).pesos == [0.7, 0.3]
+
+
+def test_colores_vista_con_semantica_de_lista():
+    pal = Paleta(nombre="Vista", colores=[(1, 2, 3), (4, 5, 6)])
+    assert not hasattr(pal, '__dict__')
+    assert pal.rgb.dtype == np.uint8 and pal.rgb.shape == (2, 3) and not pal.rgb.flags.writeable
+    assert pal.colores[0] == (1, 2, 3) and pal.colores[-1] == (4, 5, 6)
+    assert list(pal.colores) == [(1, 2, 3), (4, 5, 6)] and len(pal.colores) == 2
+    assert np.array_equal(np.asarray(pal.colores), [[1, 2, 3], [4, 5, 6]])
+    copia = pal.colores.copy()
+    copia.append((7, 8, 9))
+    assert len(pal.colores) == 2
+    pal.colores.append((7, 8, 9))
+    pal.colores[0] = (10, 20, 30)
+    del pal.colores[1]
+    assert pal.colores == [(10, 20, 30), (7, 8, 9)]
+    with pytest.raises(ValueError):
+        pal.colores.append((0, 0, 256))
+    assert pal.colores == [(10, 20, 30), (7, 8, 9)]
+
+
+def test_validacion_vectorizada_de_arrays():
+    pal = Paleta(nombre="Array", colores=np.array([[0, 128, 255]], dtype=np.int64))
+    assert pal.colores == [(0, 128, 255)] and pal.rgb.dtype == np.uint8
+    for invalido in (np.array([[0, 0, -1]]), np.array([[0.5, 0, 0]]), np.zeros((2, 4), dtype=np.uint8)):
+        with pytest.raises(ValueError):
+            Paleta(nombre="Err", colores=invalido)
+
+
+def test_from_dicts_comparte_un_array():
+    datos = [{'nombre': 'a', 'colores': [[1, 2, 3], [4, 5, 6]]}, {'nombre': 'b', 'colores': []},
+             {'nombre': 'c', 'colores': [[7, 8, 9]], 'parametros': {'pesos': [1.0]}}]
+    paletas = Paleta.from_dicts(datos)
+    assert paletas == [Paleta.from_dict(d) for d in datos]
+    assert paletas[0]._rgb.base is not None and paletas[0]._rgb.base is paletas[2]._rgb.base
+    assert paletas[2].pesos == [1.0] and paletas[1].colores == []
+    # Modificar una paleta no afecta a las demás que comparten el array
+    paletas[0].apply_hsv_shift(hue_shift_deg=90)
+    assert paletas[2].colores == [(7, 8, 9)]
+    with pytest.raises(ValueError):
+        Paleta.from_dicts([{'nombre': 'x', 'colores': [[1, 2, 3]]}, {'nombre': 'y', 'colores': [[1, 2]]}])
@@ -0,0 +1,59 @@
+import threading
+import pytest
+import numpy as np
+from PIL import Image
+from logic.lut import ajustar_imagen_hsv
+from logic.preview import VistaPrevia
+
+
+def _imagen(w=3000, h=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8))
+
+
+def test_vista_previa_tamanos():
+    vista = VistaPrevia(_imagen(), max_size=500, max_size_completa=1500)
+    assert vista.completa.size == (1500, 1000)
+    assert vista.proxy.shape == (333, 500, 3)
+    assert vista.proxy.dtype == np.uint8 and vista.proxy.flags.c_contiguous
+
+
+def test_vista_previa_render():
+    vista = VistaPrevia(_imagen(400, 300), max_size=200, max_size_completa=400)
+    proxy = vista.render_proxy(40, 10, -5)
+    assert proxy.shape == vista.proxy.shape
+    esperado = np.asarray(ajustar_imagen_hsv(Image.fromarray(vista.proxy), 40, 10, -5))
+    assert np.array_equal(proxy, esperado)
+    assert vista.render_completa(40, 10, -5).shape == (300, 400, 3)
+    # Sin ajuste, el proxy sale intacto
+    assert np.array_equal(vista.render_proxy(0, 0, 0), vista.proxy)
+
+
+def test_preview_worker_descarta_frames_obsoletos(app):
+    from PySide6.QtCore import Qt
+    from async_tasks.workers import PreviewWorker
+    worker = PreviewWorker()
+    frames = []
+    ultimo = threading.Event()
+    def recibir(qimg, secuencia, latencia, completa):
+        frames.append((secuencia, completa, qimg.width(), latencia))
+        if completa:
+            ultimo.set()
+    # Conexión directa: el slot se ejecuta en el hilo del worker, sin bucle de eventos
+    worker.frame_listo.connect(recibir, Qt.DirectConnection)
+    worker.set_imagen(_imagen(2400, 1600))
+    worker.start()
+    try:
+        # Arrastre simulado: muchas peticiones seguidas y una final en calidad completa
+        for paso in range(50):
+            worker.solicitar(paso, 0, 0)
+        final = worker.solicitar(49, 0, 0, completa=True)
+        assert ultimo.wait(30)
+    finally:
+        worker.detener()
+    secuencias = [s for s, _, _, _ in frames]
+    assert secuencias == sorted(secuencias)
+    assert len(frames) < 51
+    assert worker.descartados >= 51 - len(frames)
+    assert frames[-1][:3] == (final, True, 2048)
+    assert all(lat >= 0 for _, _, _, lat in frames)
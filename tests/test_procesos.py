@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from PIL import Image
+from async_tasks.procesos import BackendProcesos, _a_memoria_compartida
+from async_tasks.scheduler import Cancelado, TokenCancelacion
+from logic.clustering import agrupar_puntos, extraer_colores_dominantes_archivo
+
+
+@pytest.fixture(scope="module")
+def backend():
+    b = BackendProcesos(max_procesos=1)
+    b.esperar_arranque()
+    yield b
+    b.cerrar()
+
+
+def test_memoria_compartida_alinea_y_copia():
+    a = np.arange(30, dtype=np.uint8).reshape(10, 3)
+    b = np.linspace(0, 1, 7)
+    shm, descriptores = _a_memoria_compartida([a, b])
+    try:
+        assert descriptores[1][0] % 64 == 0
+        vistas = [np.ndarray(forma, dtype=dtype, buffer=shm.buf, offset=inicio) for inicio, forma, dtype in descriptores]
+        np.testing.assert_array_equal(vistas[0], a)
+        np.testing.assert_array_equal(vistas[1], b)
+        del vistas
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_agrupar_en_proceso_igual_que_en_hilo(backend):
+    rng = np.random.default_rng(3)
+    puntos = rng.integers(0, 256, size=(2000, 3), dtype=np.uint8)
+    assert backend.agrupar(puntos, None, 5) == agrupar_puntos(puntos, None, 5)
+    pesos = rng.random(2000)
+    assert backend.agrupar(puntos.astype(float), pesos, 4, color_space='oklab') == \
+        agrupar_puntos(puntos.astype(float), pesos, 4, color_space='oklab')
+
+
+def test_agrupador_en_extraccion_por_archivo(backend, tmp_path):
+    arr = (np.random.default_rng(4).random((80, 60, 3)) * 255).astype(np.uint8)
+    path = str(tmp_path / "img.png")
+    Image.fromarray(arr).save(path)
+    assert extraer_colores_dominantes_archivo(path, 4, agrupador=backend.agrupar) == \
+        extraer_colores_dominantes_archivo(path, 4)
+
+
+def test_token_cancelado_y_errores_del_proceso(backend):
+    puntos = np.random.default_rng(5).integers(0, 256, size=(5000, 3), dtype=np.uint8)
+    token = TokenCancelacion()
+    token.cancelar()
+    with pytest.raises(Cancelado):
+        backend.agrupar(puntos, None, 8, token=token)
+    with pytest.raises(ValueError):
+        backend.agrupar(puntos, None, 3, engine='inexistente')
+    # El pool sigue sirviendo tras un error
+    assert len(backend.agrupar(puntos, None, 3)) == 3
@@ -0,0 +1,68 @@
+import json
+import os
+import pytest
+from data.models import Paleta
+from data.project_io import (
+    EscritorColeccion, cargar_coleccion_paletas, guardar_coleccion_paletas, guardar_coleccion_paletas_incremental,
+    iterar_coleccion_paletas
+)
+
+
+@pytest.fixture
+def paletas():
+    # Nombres y parámetros con caracteres que el lector no debe confundir con la estructura del array
+    return [
+        Paleta(nombre='a "[{,', colores=[(1, 2, 3), (250, 128, 0)], parametros={'pesos': [0.6, 0.4], 'x': "]},\n"}),
+        Paleta(nombre="vacía ñ", colores=[]),
+        Paleta(nombre="c", colores=[(9, 9, 9)], armonia_tipo="triadas", archivo_guardado="c.json"),
+    ]
+
+
+def test_escritura_incremental_identica_a_la_actual(paletas, tmp_path):
+    actual, incremental = str(tmp_path / "actual.json"), str(tmp_path / "incremental.json")
+    for lista in (paletas, []):
+        guardar_coleccion_paletas(lista, actual)
+        assert guardar_coleccion_paletas_incremental(iter(lista), incremental) == len(lista)
+        with open(actual, encoding='utf-8') as a, open(incremental, encoding='utf-8') as b:
+            assert a.read() == b.read()
+
+
+@pytest.mark.parametrize("compacto", [False, True])
+@pytest.mark.parametrize("tamano_lectura", [1, 7, 1 << 16])
+def test_lectura_incremental(paletas, tmp_path, compacto, tamano_lectura):
+    path = str(tmp_path / "coleccion.json")
+    guardar_coleccion_paletas_incremental(paletas, path, compacto=compacto)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == [p.to_dict() for p in paletas]
+    assert list(iterar_coleccion_paletas(path, tamano_lectura=tamano_lectura)) == paletas
+    assert cargar_coleccion_paletas(path) == paletas
+
+
+def test_lectura_incremental_errores(tmp_path):
+    path = tmp_path / "coleccion.json"
+    for contenido in ('{"nombre": "x"}', '[{"nombre": "x", "colores": []}', '[{"nombre": "x"} {"nombre": "y"}]', ''):
+        path.write_text(contenido, encoding='utf-8')
+        with pytest.raises(ValueError):
+            list(iterar_coleccion_paletas(str(path), tamano_lectura=4))
+    path.write_text(" [ ] \n", encoding='utf-8')
+    assert list(iterar_coleccion_paletas(str(path))) == []
+
+
+def test_escritor_conserva_el_archivo_anterior_si_falla(paletas, tmp_path):
+    path = str(tmp_path / "coleccion.json")
+    guardar_coleccion_paletas(paletas, path)
+    with pytest.raises(RuntimeError):
+        with EscritorColeccion(path) as escritor:
+            escritor.escribir(paletas[0])
+            raise RuntimeError("interrumpido")
+    assert list(iterar_coleccion_paletas(path)) == paletas
+    assert os.listdir(tmp_path) == ["coleccion.json"]
+
+
+def test_reescribir_una_coleccion_sobre_si_misma(paletas, tmp_path):
+    path = str(tmp_path / "coleccion.json")
+    guardar_coleccion_paletas(paletas, path)
+    ajustadas = [p.with_hsv_shift(hue_shift_deg=10) for p in paletas]
+    assert guardar_coleccion_paletas_incremental(
+        (p.with_hsv_shift(hue_shift_deg=10) for p in iterar_coleccion_paletas(path, tamano_lectura=7)), path) == 3
+    assert cargar_coleccion_paletas(path) == ajustadas
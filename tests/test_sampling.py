@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from PIL import Image
+from logic.sampling import (
+    SAMPLERS, muestrear, muestreo_rejilla, muestreo_estratificado, muestreo_reservorio
+)
+from logic.clustering import extraer_colores_dominantes
+
+
+def _imagen(h=300, w=400, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=(h, w, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("sampler", sorted(SAMPLERS))
+def test_muestreo_reproducible_con_misma_semilla(sampler):
+    arr = _imagen()
+    a = muestrear(arr, 5000, sampler=sampler, rng=np.random.default_rng(7))
+    b = muestrear(arr, 5000, sampler=sampler, rng=np.random.default_rng(7))
+    assert np.array_equal(a, b)
+    c = muestrear(arr, 5000, sampler=sampler, rng=np.random.default_rng(8))
+    assert not np.array_equal(a, c)
+
+
+@pytest.mark.parametrize("sampler", sorted(SAMPLERS))
+def test_muestreo_no_depende_del_rng_global(sampler):
+    arr = _imagen()
+    np.random.seed(1)
+    a = muestrear(arr, 2000, sampler=sampler)
+    np.random.seed(2)
+    b = muestrear(arr, 2000, sampler=sampler)
+    assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize("sampler", sorted(SAMPLERS))
+def test_muestreo_tamano(sampler):
+    arr = _imagen()
+    muestra = muestrear(arr, 10000, sampler=sampler)
+    assert muestra.shape[1] == 3 and muestra.dtype == np.uint8
+    assert 0.7 * 10000 <= muestra.shape[0] <= 10000
+    # Imagen más pequeña que la muestra: se devuelven todos los píxeles
+    pequena = _imagen(20, 30)
+    assert muestrear(pequena, 10000, sampler=sampler).shape == (600, 3)
+
+
+def test_estratificado_cubre_todos_los_bloques():
+    # Cada píxel codifica su posición: se comprueba que hay una muestra por bloque de 10x10
+    h, w = 100, 200
+    ys, xs = np.mgrid[0:h, 0:w]
+    arr = np.stack([ys, xs, np.zeros_like(ys)], axis=-1).astype(np.int32)
+    muestra = muestreo_estratificado(arr, 200, np.random.default_rng(0))
+    bloques = set(zip((muestra[:, 0] // 10).tolist(), (muestra[:, 1] // 10).tolist()))
+    assert len(muestra) == 200 and len(bloques) == 200
+
+
+def test_rejilla_paso_constante():
+    h, w = 100, 100
+    ys, xs = np.mgrid[0:h, 0:w]
+    arr = np.stack([ys, xs, np.zeros_like(ys)], axis=-1)
+    muestra = muestreo_rejilla(arr, 100, np.random.default_rng(0))
+    assert len(muestra) == 100
+    assert set(np.diff(np.unique(muestra[:, 0]))) == {10}
+
+
+def test_reservorio_uniforme_sobre_flujo():
+    # Flujo de 0..9999 en bloques: cada mitad debe aportar ~la mitad de la muestra
+    valores = np.arange(10000).reshape(-1, 1)
+    bloques = (valores[i:i + 700] for i in range(0, 10000, 700))
+    muestra = muestreo_reservorio(bloques, 2000, np.random.default_rng(0))
+    assert muestra.shape == (2000, 1)
+    assert len(np.unique(muestra)) == 2000
+    assert 850 < (muestra < 5000).sum() < 1150
+
+
+def test_sampler_invalido():
+    with pytest.raises(ValueError):
+        muestrear(_imagen(), 100, sampler='inexistente')
+
+
+@pytest.mark.parametrize("sampler", sorted(SAMPLERS))
+def test_extraer_colores_reproducible(sampler):
+    img = Image.fromarray(_imagen(200, 200, seed=5))
+    a = extraer_colores_dominantes(img, n_colors=5, sampler=sampler)
+    np.random.seed(99)
+    b = extraer_colores_dominantes(img, n_colors=5, sampler=sampler)
+    assert a == b
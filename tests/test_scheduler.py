@@ -0,0 +1,130 @@
+import threading
+import time
+import numpy as np
+import pytest
+from PIL import Image
+from async_tasks.scheduler import (PRIORIDAD_ALTA, PRIORIDAD_BAJA, Cancelado, Planificador,
+                                   TokenCancelacion)
+from logic.clustering import contar_poblaciones, extraer_colores_dominantes
+from logic.kmeans import barrido_kmeans, kmeans
+
+
+def _bloquear(planificador):
+    # Ocupa el único hilo hasta que se libera el evento devuelto
+    liberar = threading.Event()
+    empezado = threading.Event()
+
+    def trabajo(token):
+        empezado.set()
+        liberar.wait(5)
+
+    planificador.enviar(trabajo)
+    assert empezado.wait(5)
+    return liberar
+
+
+def test_prioridades_y_orden_de_llegada():
+    p = Planificador(max_hilos=1)
+    liberar = _bloquear(p)
+    orden = []
+    trabajos = [p.enviar(lambda token, n=nombre: orden.append(n), prioridad=prioridad)
+                for nombre, prioridad in [('baja', PRIORIDAD_BAJA), ('normal1', 10), ('alta', PRIORIDAD_ALTA),
+                                          ('normal2', 10)]]
+    assert p.metricas()['en_cola'] == 4
+    liberar.set()
+    for t in trabajos:
+        t.futuro.result(5)
+    p.cerrar()
+    assert orden == ['alta', 'normal1', 'normal2', 'baja']
+
+
+def test_clave_sustituye_trabajo_en_cola():
+    p = Planificador(max_hilos=1)
+    liberar = _bloquear(p)
+    ejecutados = []
+    primero = p.enviar(lambda token: ejecutados.append(1), clave='extraccion')
+    segundo = p.enviar(lambda token: ejecutados.append(2), clave='extraccion')
+    assert primero.futuro.cancelled()
+    liberar.set()
+    assert segundo.futuro.result(5) is None
+    assert ejecutados == [2]
+    assert p.metricas()['cancelados'] == 1
+    p.cerrar()
+
+
+def test_clave_cancela_trabajo_en_ejecucion():
+    p = Planificador(max_hilos=2)
+    empezado = threading.Event()
+
+    def largo(token):
+        empezado.set()
+        while True:
+            token.comprobar()
+            time.sleep(0.001)
+
+    primero = p.enviar(largo, clave='extraccion')
+    assert empezado.wait(5)
+    segundo = p.enviar(lambda token: 'nuevo', clave='extraccion')
+    with pytest.raises(Cancelado):
+        primero.futuro.result(5)
+    assert segundo.futuro.result(5) == 'nuevo'
+    p.cerrar()
+
+
+def test_cerrar_espera_criticos_y_cancela_el_resto():
+    p = Planificador(max_hilos=1)
+    escrito = []
+
+    def exportar(token):
+        time.sleep(0.05)
+        escrito.append(True)
+
+    def extraer(token):
+        while True:
+            token.comprobar()
+            time.sleep(0.001)
+
+    exportacion = p.enviar(exportar, critico=True)
+    extraccion = p.enviar(extraer)
+    assert p.cerrar(esperar=True, timeout=5)
+    assert escrito == [True]
+    assert exportacion.futuro.done() and extraccion.futuro.cancelled()
+    with pytest.raises(RuntimeError):
+        p.enviar(exportar)
+
+
+def test_metricas_y_errores():
+    p = Planificador(max_hilos=1)
+
+    def falla(token):
+        raise ValueError("fallo")
+
+    ok = p.enviar(lambda x, token: x * 2, 21)
+    mal = p.enviar(falla)
+    assert ok.futuro.result(5) == 42
+    with pytest.raises(ValueError):
+        mal.futuro.result(5)
+    p.cerrar()
+    m = p.metricas()
+    assert m['completados'] == 1 and m['fallidos'] == 1
+    assert m['en_cola'] == 0 and m['en_ejecucion'] == 0
+    assert m['hilos'] == 1
+    assert m['espera_media_ms'] >= 0 and m['ejecucion_media_ms'] >= 0
+
+
+def test_token_cancela_bucles_de_clustering():
+    token = TokenCancelacion()
+    token.cancelar()
+    X = np.random.default_rng(0).random((500, 3))
+    with pytest.raises(Cancelado):
+        kmeans(X, 4, token=token)
+    with pytest.raises(Cancelado):
+        barrido_kmeans(X, 2, 4, token=token)
+    with pytest.raises(Cancelado):
+        contar_poblaciones([np.zeros((10, 10, 3), dtype=np.uint8)], [(0, 0, 0)], token=token)
+    img = Image.fromarray((np.random.default_rng(1).random((40, 40, 3)) * 255).astype(np.uint8))
+    for engine in ('numpy', 'median_cut', 'octree'):
+        with pytest.raises(Cancelado):
+            extraer_colores_dominantes(img, 4, engine=engine, token=token)
+    # Sin cancelar, el token no cambia el resultado
+    assert extraer_colores_dominantes(img, 4, token=TokenCancelacion()) == extraer_colores_dominantes(img, 4)
@@ -0,0 +1,68 @@
+import time
+import pytest
+from logic.color_utils import adjust_palette_hsv
+
+PALETA = [(200, 100, 50), (30, 60, 90), (128, 128, 128)]
+
+
+def _arrastrar(app, slider, pasos=200, ms_por_paso=1.0):
+    # Arrastre simulado: el slider pulsado recibe un valor nuevo cada ~ms_por_paso y se suelta al final
+    slider.setSliderDown(True)
+    for i in range(pasos):
+        slider.setValue(slider.minimum() + i % (slider.maximum() - slider.minimum() + 1))
+        app.processEvents()
+        time.sleep(ms_por_paso / 1000.0)
+    slider.setSliderDown(False)
+    app.processEvents()
+
+
+def test_arrastre_agrupa_redibujados(app, monkeypatch):
+    from ui.main_window import MainWindow
+    from data.models import Paleta
+    ventana = MainWindow()
+    try:
+        redibujados = []
+        monkeypatch.setattr(ventana, '_update_mockup', lambda colores: redibujados.append(colores))
+        ventana.paleta_actual = Paleta(nombre="p", colores=list(PALETA))
+        widget = ventana.palette_adjust_widget
+        widget.original_palette = list(PALETA)
+        widget.set_intervalo(16)
+        slider = widget.slider_hue_shift
+        t0 = time.perf_counter()
+        _arrastrar(app, slider)
+        duracion_ms = (time.perf_counter() - t0) * 1000
+        # Como mucho un redibujado por intervalo de 16 ms (más el de soltar), no uno por paso
+        assert 1 <= len(redibujados) <= duracion_ms / 16 + 2
+        assert len(redibujados) < 200
+        # Al soltar se aplica el último valor del arrastre
+        assert redibujados[-1] == adjust_palette_hsv(PALETA, slider.value(), 0, 0)
+    finally:
+        ventana.close()
+
+
+def test_intervalo_cero_recalcula_en_cada_cambio(app):
+    from ui.widgets import PaletteHSVAdjustWidget
+    widget = PaletteHSVAdjustWidget(intervalo_ms=0)
+    widget.set_palette(PALETA)
+    emitidas = []
+    widget.palette_changed.connect(emitidas.append)
+    for v in range(1, 21):
+        widget.slider_sat_offset.setValue(v)
+    assert len(emitidas) == 20
+    assert emitidas[-1] == adjust_palette_hsv(PALETA, 0, 20, 0)
+
+
+def test_soltar_aplica_sin_esperar_al_intervalo(app):
+    from ui.widgets import PaletteHSVAdjustWidget
+    widget = PaletteHSVAdjustWidget(intervalo_ms=10_000)
+    widget.set_palette(PALETA)
+    emitidas, ajustes = [], []
+    widget.palette_changed.connect(emitidas.append)
+    widget.adjustment_changed.connect(lambda *a: ajustes.append(a))
+    widget.slider_val_offset.setSliderDown(True)
+    for v in range(-1, -31, -1):
+        widget.slider_val_offset.setValue(v)
+    assert emitidas == []
+    widget.slider_val_offset.setSliderDown(False)
+    assert emitidas == [adjust_palette_hsv(PALETA, 0, 0, -30)]
+    assert ajustes == [(0, 0, -30)]
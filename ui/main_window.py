@@ -2,21 +2,31 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFileDialog, QListWidget, QListWidgetItem, QSplitter, QMessageBox, QScrollArea
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QAction, QPixmap, QImage
 
-from data.models import Paleta
-import data.project_io as pio
-from async_tasks.workers import ClusteringWorker, ExportWorker
-from logic.harmony import (
-    generar_complementarios, generar_analogos,
-    generar_triadas, generar_tetradicos, generar_monocromatica
-)
-from logic.mockup import crear_mockup_ui
+from async_tasks.scheduler import PRIORIDAD_ALTA, PRIORIDAD_BAJA, PRIORIDAD_NORMAL, Planificador
 from ui.widgets import HSVAdjustWidget, PaletteHSVAdjustWidget
 
-from PIL import Image
-from PIL.ImageQt import ImageQt
+import importlib
+import os
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from data.models import Paleta
+
+# Arranque: aquí solo se importa Qt y lo imprescindible para construir la ventana. numpy, PIL,
+# los workers y la lógica (clustering, armonías, mockup) se importan dentro de los métodos que
+# los usan, y MODULOS_DIFERIDOS se precargan en segundo plano tras el primer frame, de modo
+# que la primera acción del usuario normalmente ya los encuentra en sys.modules.
+MODULOS_DIFERIDOS = (
+    'numpy', 'PIL.Image', 'PIL.ImageQt', 'data.models', 'data.project_io',
+    'async_tasks.workers', 'async_tasks.procesos', 'logic.harmony', 'logic.mockup',
+)
+
+# Milisegundos sin cambios en los deslizadores antes de renderizar la vista previa en calidad completa
+PREVIEW_ESTABLE_MS = 250
 
 
 class MainWindow(QMainWindow):
@@ -26,11 +36,21 @@ class MainWindow(QMainWindow):
         self.resize(1200, 700)
 
         # Estado
-        self.paleta_actual: Paleta | None = None
+        self.paleta_actual: 'Paleta | None' = None
         self.paleta_original_colors: list | None = None  # Colores extraídos o cargados originalmente
         self.clustering_token = None
-        self.workers = []
-        self.loaded_image = None  # PIL Image cargada
+        # Pool acotado para extracciones y exportaciones (en lugar de un QThread por acción)
+        self.planificador = Planificador(max_hilos=2)
+        # Con DIVERGESIA_PROCESOS=1 el k-means se ejecuta en un pool de procesos (sin competir
+        # por el GIL con la UI); los procesos se arrancan tras el primer frame, no en la primera extracción
+        self.procesos = None
+        self._precargado = False
+        self.loaded_image = None  # ImagenCargada (base, miniatura y proxy de análisis)
+        self._ruta_cargando = None
+        self._t_seleccion = None
+        # Con DIVERGESIA_DEBUG=1 la barra de estado muestra la latencia de cada frame de la vista previa
+        self.debug = os.environ.get('DIVERGESIA_DEBUG') == '1'
+        self._ajuste_actual = (0, 0, 0)
 
         self._create_menu()
         self.status = self.statusBar()
@@ -99,6 +119,7 @@ class MainWindow(QMainWindow):
         # Widget para ajustes HSV
         self.palette_adjust_widget = PaletteHSVAdjustWidget()
         self.palette_adjust_widget.palette_changed.connect(self.on_palette_adjusted)
+        self.palette_adjust_widget.adjustment_changed.connect(self.on_ajuste_cambiado)
         right_layout.addWidget(self.palette_adjust_widget)
         # Botón para revertir a paleta original
         self.btn_revertir = QPushButton("Revertir a paleta original")
@@ -130,6 +151,37 @@ class MainWindow(QMainWindow):
         right_layout.addStretch()
         splitter.addWidget(right_widget)
 
+        # Vista previa recoloreada de la imagen, renderizada fuera del hilo de la UI; el hilo se
+        # crea con la primera imagen cargada (_obtener_preview_worker)
+        self.preview_worker = None
+        self._timer_preview_estable = QTimer(self)
+        self._timer_preview_estable.setSingleShot(True)
+        self._timer_preview_estable.setInterval(PREVIEW_ESTABLE_MS)
+        self._timer_preview_estable.timeout.connect(self._on_preview_estable)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._precargado:
+            # Primer frame: la precarga empieza cuando el bucle de eventos quede libre
+            self._precargado = True
+            QTimer.singleShot(0, self._precargar)
+
+    def _precargar(self):
+        # Los imports pesados se hacen en el planificador, con prioridad baja para no retrasar
+        # una carga de imagen que el usuario ya haya pedido
+        self.planificador.enviar(_importar_modulos, MODULOS_DIFERIDOS, prioridad=PRIORIDAD_BAJA)
+        if os.environ.get('DIVERGESIA_PROCESOS') == '1':
+            from async_tasks.procesos import BackendProcesos
+            self.procesos = BackendProcesos()
+
+    def _obtener_preview_worker(self):
+        if self.preview_worker is None:
+            from async_tasks.workers import PreviewWorker
+            self.preview_worker = PreviewWorker()
+            self.preview_worker.frame_listo.connect(self._on_preview_listo)
+            self.preview_worker.start()
+        return self.preview_worker
+
     def _create_menu(self):
         menubar = self.menuBar()
         menu_archivo = menubar.addMenu("Archivo")
@@ -151,30 +203,46 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Seleccionar imagen", "", "Imágenes (*.png *.jpg *.jpeg *.bmp)")
         if not path:
             return
-        try:
-            img = Image.open(path)
-            self.loaded_image = img
-            # Mostrar versión escalada
-            qt_img = ImageQt(img.convert('RGBA'))
-            pix = QPixmap.fromImage(QImage(qt_img))
-            pix = pix.scaled(self.label_original.maximumSize(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.label_original.setPixmap(pix)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"No se pudo cargar la imagen: {e}")
+        # Decodificar una sola vez fuera del hilo de la UI; la miniatura y el proxy de análisis
+        # llegan juntos en _on_imagen_cargada
+        from async_tasks.workers import CargaWorker
+        self._t_seleccion = time.perf_counter()
+        self._ruta_cargando = path
+        worker = CargaWorker(path, self._t_seleccion)
+        worker.cargada.connect(self._on_imagen_cargada)
+        worker.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+        # Una selección nueva sustituye a la carga anterior si aún no ha terminado
+        self._enviar_trabajo(worker, prioridad=PRIORIDAD_ALTA, clave='carga')
+        self.status.showMessage("Cargando imagen...", 2000)
+
+    def _on_imagen_cargada(self, imagen, qimg: QImage, latencia_ms: float):
+        if imagen.path != self._ruta_cargando:
             return
-        # Extraer colores
-        worker = ClusteringWorker(path, n_colors=5)
+        from async_tasks.workers import ClusteringWorker
+        self.loaded_image = imagen
+        # Mostrar versión escalada
+        pix = QPixmap.fromImage(qimg)
+        pix = pix.scaled(self.label_original.maximumSize(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.label_original.setPixmap(pix)
+        self._obtener_preview_worker().set_imagen(imagen.base)
+        # Extraer colores; el número de colores se elige automáticamente (k = 2..16)
+        n_colors = 'auto'
+        worker = ClusteringWorker(imagen.path, n_colors=n_colors, procesos=self.procesos, imagen=imagen)
         worker.resultado.connect(self.handle_colores_extraidos)
         worker.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
-        worker.start()
-        self.workers.append(worker)
-        self.clustering_token = f"{path}:5"
-        self.status.showMessage("Extrayendo colores...", 2000)
+        # Una imagen nueva sustituye a la extracción anterior si aún no ha terminado
+        self._enviar_trabajo(worker, prioridad=PRIORIDAD_ALTA, clave='extraccion')
+        self.clustering_token = f"{imagen.path}:{n_colors}"
+        if self.debug:
+            self.status.showMessage(f"Extrayendo colores... (primeros píxeles a {latencia_ms:.0f} ms de la selección)", 2000)
+        else:
+            self.status.showMessage("Extrayendo colores...", 2000)
 
     def on_abrir_paleta(self):
         path, _ = QFileDialog.getOpenFileName(self, "Abrir paleta JSON", "", "JSON (*.json)")
         if not path:
             return
+        import data.project_io as pio
         try:
             paleta = pio.cargar_paleta_desde_archivo(path)
         except Exception as e:
@@ -202,6 +270,7 @@ class MainWindow(QMainWindow):
     def handle_colores_extraidos(self, colores: list, token: str):
         if token != self.clustering_token:
             return
+        from data.models import Paleta
         # Guardar colores originales para revertir
         self.paleta_original_colors = colores.copy()
         self.btn_revertir.setEnabled(True)
@@ -220,12 +289,20 @@ class MainWindow(QMainWindow):
         self._update_color_swatches(colores)
         self.palette_adjust_widget.set_palette(colores)
         self._update_mockup(colores)
-        self.status.showMessage("Colores extraídos", 3000)
+        mensaje = f"Colores extraídos ({len(colores)})"
+        if self.debug:
+            if self._t_seleccion is not None:
+                mensaje += f"; primera paleta a {(time.perf_counter() - self._t_seleccion) * 1000.0:.0f} ms de la selección"
+            m = self.planificador.metricas()
+            mensaje += (f"; planificador: en cola {m['en_cola']}, espera media {m['espera_media_ms']:.1f} ms, "
+                        f"ejecución media {m['ejecucion_media_ms']:.1f} ms, cancelados {m['cancelados']}")
+        self.status.showMessage(mensaje, 3000)
 
     def on_revertir_paleta(self):
         """Revertir a la paleta original extraída o cargada."""
         if not self.paleta_original_colors:
             return
+        from data.models import Paleta
         originales = self.paleta_original_colors.copy()
         nombre = self.paleta_actual.nombre if self.paleta_actual else "Paleta"
         paleta = Paleta(nombre=nombre, colores=originales,
@@ -254,6 +331,8 @@ class MainWindow(QMainWindow):
             self.colors_layout.addWidget(lbl)
 
     def _update_mockup(self, colores: list):
+        from PIL.ImageQt import ImageQt
+        from logic.mockup import crear_mockup_ui
         try:
             img = crear_mockup_ui(colores, size=(200, 200))
             qim = ImageQt(img.convert('RGBA'))
@@ -271,6 +350,27 @@ class MainWindow(QMainWindow):
         self._update_mockup(nuevos_colores)
         self.status.showMessage("Paleta ajustada", 1000)
 
+    def on_ajuste_cambiado(self, hue_shift_deg: int, sat_offset_pct: int, val_offset_pct: int):
+        if self.loaded_image is None:
+            return
+        self._ajuste_actual = (hue_shift_deg, sat_offset_pct, val_offset_pct)
+        # Frame rápido sobre el proxy; la calidad completa espera a que el ajuste se estabilice
+        self.preview_worker.solicitar(*self._ajuste_actual)
+        self._timer_preview_estable.start()
+
+    def _on_preview_estable(self):
+        self.preview_worker.solicitar(*self._ajuste_actual, completa=True)
+
+    def _on_preview_listo(self, qimg: QImage, secuencia: int, latencia_ms: float, completa: bool):
+        pix = QPixmap.fromImage(qimg)
+        pix = pix.scaled(self.label_original.maximumSize(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.label_original.setPixmap(pix)
+        if self.debug:
+            calidad = "completa" if completa else "proxy"
+            self.status.showMessage(
+                f"Vista previa #{secuencia} ({calidad}): {latencia_ms:.1f} ms, "
+                f"descartados {self.preview_worker.descartados}", 2000)
+
     def on_guardar_paleta(self):
         if not self.paleta_actual:
             QMessageBox.information(self, "Info", "No hay paleta para guardar.")
@@ -280,16 +380,30 @@ class MainWindow(QMainWindow):
             return
         ext = path.split('.')[-1].lower()
         formato = ext if ext in ('json', 'css', 'csv') else 'json'
+        from async_tasks.workers import ExportWorker
         worker = ExportWorker(self.paleta_actual, path, formato=formato)
         worker.finished.connect(lambda p: self.status.showMessage(f"Guardado en {p}", 3000))
         worker.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
-        worker.start()
-        self.workers.append(worker)
+        # Crítico: al cerrar la ventana se espera a que el archivo quede escrito
+        self._enviar_trabajo(worker, prioridad=PRIORIDAD_NORMAL, critico=True)
+
+    def _enviar_trabajo(self, worker, **opciones):
+        # El worker vive como hijo de la ventana hasta que se entregan sus señales (encoladas
+        # antes que el deleteLater) y después se libera
+        worker.setParent(self)
+        trabajo = self.planificador.enviar(worker.run, **opciones)
+        trabajo.futuro.add_done_callback(lambda _: worker.deleteLater())
+        return trabajo
 
     def on_generar_armonia(self, tipo: str):
         if not self.paleta_actual:
             QMessageBox.information(self, "Info", "No hay paleta actual para generar armonía.")
             return
+        from data.models import Paleta
+        from logic.harmony import (
+            generar_complementarios, generar_analogos,
+            generar_triadas, generar_tetradicos, generar_monocromatica
+        )
         base_colors = self.paleta_actual.colores
         try:
             if tipo == 'complementario':
@@ -323,6 +437,7 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Error generando armonía: {e}")
 
     def _on_paleta_seleccionada(self, item: QListWidgetItem):
+        from data.models import Paleta
         paleta = item.data(Qt.UserRole)
         if not isinstance(paleta, Paleta):
             return
@@ -334,10 +449,18 @@ class MainWindow(QMainWindow):
         self.status.showMessage(f"Paleta '{paleta.nombre}' seleccionada", 2000)
 
     def closeEvent(self, event):
-        for w in self.workers:
-            try:
-                if hasattr(w, 'terminate'):
-                    w.terminate()
-            except Exception:
-                pass
+        self._timer_preview_estable.stop()
+        if self.preview_worker is not None:
+            self.preview_worker.detener()
+        # Cancela las extracciones y espera a las exportaciones en curso (nunca terminate())
+        self.planificador.cerrar(esperar=True)
+        if self.procesos is not None:
+            self.procesos.cerrar()
         event.accept()
+
+
+def _importar_modulos(nombres, token=None):
+    for nombre in nombres:
+        if token is not None:
+            token.comprobar()
+        importlib.import_module(nombre)
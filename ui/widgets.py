@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QSlider, QVBoxLayout, QGroupBox
-from PySide6.QtCore import Qt, Signal
-from logic.color_utils import rgb_to_hsv_tuple, hsv_to_rgb_tuple
+from PySide6.QtCore import Qt, Signal, QTimer
+
+# Intervalo por defecto (ms) para agrupar los cambios de los deslizadores: un frame a 60 Hz
+INTERVALO_AJUSTE_MS = 16
 
 
 class HSVAdjustWidget(QWidget):
@@ -131,8 +133,9 @@ class HSVAdjustWidget(QWidget):
 class PaletteHSVAdjustWidget(QWidget):
    
     palette_changed = Signal(list)  # Emite lista de tuplas (R,G,B)
+    adjustment_changed = Signal(int, int, int)  # Emite (hue_shift_deg, sat_offset_pct, val_offset_pct)
 
-    def __init__(self):
+    def __init__(self, intervalo_ms: int = INTERVALO_AJUSTE_MS):
         super().__init__()
         # Sliders de ajustes
         # Hue shift: -180 a +180
@@ -196,10 +199,18 @@ class PaletteHSVAdjustWidget(QWidget):
         # Estado interno
         self.original_palette = []  # Lista de tuplas RGB originales
 
+        # Los cambios de los sliders se agrupan: como mucho un recálculo por intervalo, siempre
+        # con los últimos valores, y uno inmediato al soltar el slider
+        self._timer_ajuste = QTimer(self)
+        self._timer_ajuste.setSingleShot(True)
+        self._timer_ajuste.timeout.connect(self.flush)
+        self._ajuste_pendiente = False
+        self.set_intervalo(intervalo_ms)
+
         # Conectar señales de sliders
-        self.slider_hue_shift.valueChanged.connect(self._on_adjustment_changed)
-        self.slider_sat_offset.valueChanged.connect(self._on_adjustment_changed)
-        self.slider_val_offset.valueChanged.connect(self._on_adjustment_changed)
+        for slider in (self.slider_hue_shift, self.slider_sat_offset, self.slider_val_offset):
+            slider.valueChanged.connect(self._on_adjustment_changed)
+            slider.sliderReleased.connect(self.flush)
         self.reset_button.clicked.connect(self.reset_adjustments)
 
         # Inicializar a cero
@@ -215,6 +226,9 @@ class PaletteHSVAdjustWidget(QWidget):
         self.palette_changed.emit(self.original_palette.copy())
 
     def block_signals_and_reset_sliders(self):
+        # Un ajuste pendiente de los valores anteriores ya no aplica
+        self._timer_ajuste.stop()
+        self._ajuste_pendiente = False
         # Bloquear señales de sliders temporalmente
         self.slider_hue_shift.blockSignals(True)
         self.slider_sat_offset.blockSignals(True)
@@ -234,35 +248,45 @@ class PaletteHSVAdjustWidget(QWidget):
         self.slider_hue_shift.blockSignals(False)
         self.slider_sat_offset.blockSignals(False)
         self.slider_val_offset.blockSignals(False)
+        self.adjustment_changed.emit(0, 0, 0)
+
+    def set_intervalo(self, intervalo_ms: int):
+        """Intervalo mínimo entre recálculos de la paleta; 0 recalcula en cada cambio."""
+        self.intervalo_ms = max(0, int(intervalo_ms))
+        self._timer_ajuste.setInterval(self.intervalo_ms)
 
     def _on_adjustment_changed(self, _value=None):
-        """Cuando cambia algún slider, recalcula la paleta ajustada y emite palette_changed."""
+        """Actualiza los labels y programa el recálculo de la paleta para el siguiente intervalo."""
+        self.label_hue_shift.setText(f"Hue Shift: {self.slider_hue_shift.value()}°")
+        self.label_sat_offset.setText(f"Sat Offset: {self.slider_sat_offset.value()}%")
+        self.label_val_offset.setText(f"Val Offset: {self.slider_val_offset.value()}%")
+        self._ajuste_pendiente = True
+        if self.intervalo_ms == 0:
+            self.flush()
+        elif not self._timer_ajuste.isActive():
+            # No se reinicia si ya está en marcha: durante un arrastre continuo se sigue
+            # emitiendo una vez por intervalo en lugar de esperar a que el slider pare
+            self._timer_ajuste.start()
+
+    def flush(self):
+        """Recalcula y emite ya el ajuste pendiente, si lo hay (p. ej. al soltar el slider)."""
+        self._timer_ajuste.stop()
+        if not self._ajuste_pendiente:
+            return
+        self._ajuste_pendiente = False
         # Leer valores de sliders
         hue_shift_deg = self.slider_hue_shift.value()  # -180 a 180
         sat_offset_pct = self.slider_sat_offset.value()  # -100 a 100
         val_offset_pct = self.slider_val_offset.value()  # -100 a 100
 
-        # Actualizar labels
-        self.label_hue_shift.setText(f"Hue Shift: {hue_shift_deg}°")
-        self.label_sat_offset.setText(f"Sat Offset: {sat_offset_pct}%")
-        self.label_val_offset.setText(f"Val Offset: {val_offset_pct}%")
-
-        # Aplicar transformación a cada color de la paleta original
-        adjusted = []
-        for color in self.original_palette:
-            # Convertir RGB a HSV normalizado
-            h, s, v = rgb_to_hsv_tuple(color)
-            # h está en [0,1]; convertir shift a fracción
-            h_new = (h + hue_shift_deg / 360.0) % 1.0
-            # Ajustar s y v: s, v en [0,1]
-            s_new = min(max(s + sat_offset_pct / 100.0, 0.0), 1.0)
-            v_new = min(max(v + val_offset_pct / 100.0, 0.0), 1.0)
-            # Convertir de vuelta a RGB
-            rgb_new = hsv_to_rgb_tuple((h_new, s_new, v_new))
-            adjusted.append(rgb_new)
-
-        # Emitir paleta ajustada
+        # Misma transformación (vectorizada) que adjust_color_hsv, grises incluidos. Importación
+        # diferida: numpy no hace falta para dibujar la ventana por primera vez
+        from logic.color_utils import adjust_palette_hsv
+        adjusted = adjust_palette_hsv(self.original_palette, hue_shift_deg, sat_offset_pct, val_offset_pct)
+
+        # Emitir paleta ajustada y los valores del ajuste (para la vista previa de la imagen)
         self.palette_changed.emit(adjusted)
+        self.adjustment_changed.emit(hue_shift_deg, sat_offset_pct, val_offset_pct)
 
     def reset_adjustments(self):
         """Resetea sliders a cero y emite la paleta original."""